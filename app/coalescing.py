@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+
+T = TypeVar("T")
+
+
+@dataclass
+class _InFlight:
+    future: Future
+    completed_at: float | None = None
+
+
+class RequestCoalescer:
+    """Single-flight execution keyed by an arbitrary hashable key.
+
+    The first caller for a key (the leader) runs the work; concurrent callers with the
+    same key wait on the leader's future and receive the same result. Successful results
+    stay shareable for ``grace_seconds`` after completion; failures are never reused.
+    """
+
+    def __init__(self, *, grace_seconds: float = 3.0):
+        self.grace_seconds = grace_seconds
+        self._entries: dict[Hashable, _InFlight] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+
+    def run(self, key: Hashable, work: Callable[[], T]) -> tuple[T, bool]:
+        """Return ``(result, coalesced)``; ``coalesced`` is true when another call did the work."""
+        entry, is_leader = self._join(key)
+        if not is_leader:
+            return entry.future.result(), True
+
+        try:
+            result = work()
+        except BaseException as exc:
+            self._fail(key, entry, exc)
+            raise
+        self._succeed(entry, result)
+        return result, False
+
+    async def arun(self, key: Hashable, work: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """``run`` for coroutines: followers await the leader without blocking their loop.
+
+        Leaders and followers may be on different threads or event loops.
+        """
+        entry, is_leader = self._join(key)
+        if not is_leader:
+            return await asyncio.wrap_future(entry.future), True
+
+        try:
+            result = await work()
+        except BaseException as exc:
+            self._fail(key, entry, exc)
+            raise
+        self._succeed(entry, result)
+        return result, False
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            self._purge_expired(time.monotonic())
+            total = self.executed + self.coalesced
+            return {
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "coalesced_ratio": round(self.coalesced / total, 4) if total else 0.0,
+                "in_flight": sum(1 for entry in self._entries.values() if entry.completed_at is None),
+                "grace_seconds": self.grace_seconds,
+            }
+
+    def _join(self, key: Hashable) -> tuple[_InFlight, bool]:
+        with self._lock:
+            self._purge_expired(time.monotonic())
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.coalesced += 1
+                return entry, False
+            entry = _InFlight(future=Future())
+            # A running future cannot be cancelled, so one follower giving up never aborts the others.
+            entry.future.set_running_or_notify_cancel()
+            self._entries[key] = entry
+            self.executed += 1
+            return entry, True
+
+    def _succeed(self, entry: _InFlight, result: Any) -> None:
+        with self._lock:
+            entry.completed_at = time.monotonic()
+        entry.future.set_result(result)
+
+    def _fail(self, key: Hashable, entry: _InFlight, exc: BaseException) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+        if not isinstance(exc, Exception):
+            # A cancelled or interrupted leader must not cancel the followers' own tasks.
+            exc = RuntimeError("Coalesced request was cancelled before completing.")
+        entry.future.set_exception(exc)
+
+    def _purge_expired(self, now: float) -> None:
+        expired = [
+            key
+            for key, entry in self._entries.items()
+            if entry.completed_at is not None and now - entry.completed_at > self.grace_seconds
+        ]
+        for key in expired:
+            del self._entries[key]
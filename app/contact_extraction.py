@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import json
+import re
+import urllib.parse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Iterable
+
+from .entity_resolution import phone_key
+from .storage import Storage
+
+
+CONTACT_KINDS = ("phone", "email", "url", "domain", "mention", "hashtag")
+# Messages read and extracted per backfill task (a rowid range of the messages table).
+BACKFILL_CHUNK_ROWS = 5000
+MIN_PHONE_DIGITS = 9
+MAX_PHONE_DIGITS = 15
+MAX_VALUE_LENGTH = 500
+
+PHONE_REGEX = re.compile(r"(?<![\w+])(\+?\d[\d\- ().]{7,}\d)(?!\w)")
+DATE_LIKE_REGEX = re.compile(r"^\d{4}[-./]\d{1,2}[-./]\d{1,2}|^\d{1,2}[-./]\d{1,2}[-./]\d{2,4}")
+EMAIL_REGEX = re.compile(r"(?<![\w.+-])([A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,})")
+URL_REGEX = re.compile(r"((?:https?://|www\.)[^\s<>\"'`]+)", re.IGNORECASE)
+# Telegram usernames: 5-32 characters, starting with a letter. Emails are excluded by the lookbehind.
+MENTION_REGEX = re.compile(r"(?<![\w@.])@([A-Za-z][A-Za-z0-9_]{4,31})\b")
+HASHTAG_REGEX = re.compile(r"(?<![\w#&])#(\w*[^\W\d]\w*)")
+URL_TRAILING_PUNCTUATION = ".,;:!?)]}>'\"»…"
+
+ENTITY_KINDS = {
+    "MessageEntityUrl": "url",
+    "MessageEntityTextUrl": "url",
+    "MessageEntityEmail": "email",
+    "MessageEntityPhone": "phone",
+    "MessageEntityMention": "mention",
+    "MessageEntityHashtag": "hashtag",
+}
+
+
+def extract_contacts(text: str | None, entities_json: str | None = None) -> set[tuple[str, str]]:
+    """Normalized ``(kind, value)`` pairs found in a message text and its Telegram entities.
+
+    Every URL also yields its ``domain``. Entities add what the text alone does not show
+    (hidden ``MessageEntityTextUrl`` links, bare domains and phones Telegram detected).
+    """
+    found: set[tuple[str, str]] = set()
+    content = text or ""
+    if content:
+        for match in URL_REGEX.findall(content):
+            _add_url(found, match)
+        # URLs are blanked first so their paths and fragments are not read as mentions or hashtags.
+        remainder = URL_REGEX.sub(" ", content)
+        for match in EMAIL_REGEX.findall(remainder):
+            found.add(("email", match.lower()))
+        for match in MENTION_REGEX.findall(remainder):
+            found.add(("mention", match.lower()))
+        for match in HASHTAG_REGEX.findall(remainder):
+            found.add(("hashtag", match.lower()))
+        for match in PHONE_REGEX.findall(EMAIL_REGEX.sub(" ", remainder)):
+            _add_phone(found, match)
+
+    for entity in _load_entities(entities_json):
+        kind = ENTITY_KINDS.get(str(entity.get("type") or ""))
+        value = str(entity.get("url") or entity.get("text") or "").strip()
+        if kind is None or not value:
+            continue
+        if kind == "url":
+            _add_url(found, value)
+        elif kind == "phone":
+            _add_phone(found, value)
+        elif kind == "email" and EMAIL_REGEX.fullmatch(value):
+            found.add(("email", value.lower()))
+        elif kind == "mention" and MENTION_REGEX.fullmatch(value):
+            found.add(("mention", value[1:].lower()))
+        elif kind == "hashtag" and HASHTAG_REGEX.fullmatch(value):
+            found.add(("hashtag", value[1:].lower()))
+    return {(kind, value) for kind, value in found if len(value) <= MAX_VALUE_LENGTH}
+
+
+def normalize_contact(kind: str, value: str) -> str | None:
+    """The stored form of a user-supplied ``value``, so lookups match what extraction wrote."""
+    if kind not in CONTACT_KINDS:
+        raise ValueError(f"kind must be one of: {', '.join(CONTACT_KINDS)}.")
+    text = str(value or "").strip()
+    if kind == "phone":
+        return phone_key(text)
+    if kind == "domain":
+        return _host(text)
+    if kind == "url":
+        found: set[tuple[str, str]] = set()
+        _add_url(found, text)
+        return next((item for found_kind, item in found if found_kind == "url"), None)
+    if kind in {"mention", "hashtag"}:
+        text = text.lstrip("@#")
+    return text.lower() or None
+
+
+def contact_rows(messages: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """``message_contacts`` rows for stored message rows (target_id, message_id, date_utc, text, entities_json)."""
+    rows = []
+    for message in messages:
+        for kind, value in sorted(extract_contacts(message.get("text"), message.get("entities_json"))):
+            rows.append(
+                {
+                    "kind": kind,
+                    "value": value,
+                    "target_id": message["target_id"],
+                    "message_id": message["message_id"],
+                    "date_utc": message.get("date_utc"),
+                }
+            )
+    return rows
+
+
+def backfill_message_contacts(
+    storage: Storage,
+    *,
+    target_ids: list[int] | None = None,
+    workers: int = 4,
+    chunk_rows: int = BACKFILL_CHUNK_ROWS,
+) -> dict[str, int]:
+    """Re-extract contacts for stored messages on a process pool.
+
+    Worker processes read rowid ranges of ``messages`` through their own read-only
+    connection and return the extracted rows; this process is the only writer and
+    replaces each range's contacts in one transaction as results arrive.
+    """
+    if workers <= 0:
+        raise ValueError("workers must be greater than 0.")
+    if chunk_rows <= 0:
+        raise ValueError("chunk_rows must be greater than 0.")
+
+    bounds = storage.get_message_rowid_bounds()
+    stats = {"messages": 0, "contacts": 0, "chunks": 0}
+    if bounds is None:
+        return stats
+    first_rowid, last_rowid = bounds
+    tasks = [
+        (str(storage.db_path), start, min(start + chunk_rows - 1, last_rowid), target_ids)
+        for start in range(first_rowid, last_rowid + 1, chunk_rows)
+    ]
+
+    if workers == 1:
+        results: Iterable[tuple[list[tuple[int, int]], list[dict[str, Any]]]] = map(_extract_rowid_range, tasks)
+        _write_results(storage, results, stats)
+        return stats
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+        _write_results(storage, pool.map(_extract_rowid_range, tasks), stats)
+    return stats
+
+
+def _write_results(
+    storage: Storage,
+    results: Iterable[tuple[list[tuple[int, int]], list[dict[str, Any]]]],
+    stats: dict[str, int],
+) -> None:
+    for message_keys, rows in results:
+        storage.replace_message_contacts(message_keys, rows)
+        stats["messages"] += len(message_keys)
+        stats["contacts"] += len(rows)
+        stats["chunks"] += 1
+
+
+def _extract_rowid_range(
+    task: tuple[str, int, int, list[int] | None],
+) -> tuple[list[tuple[int, int]], list[dict[str, Any]]]:
+    db_path, start, end, target_ids = task
+    with Storage(Path(db_path), read_only=True) as storage:
+        messages = storage.get_messages_in_rowid_range(start, end, target_ids=target_ids)
+    return [(int(row["target_id"]), int(row["message_id"])) for row in messages], contact_rows(messages)
+
+
+def _load_entities(entities_json: str | None) -> list[dict[str, Any]]:
+    if not entities_json:
+        return []
+    try:
+        entities = json.loads(entities_json)
+    except (TypeError, ValueError):
+        return []
+    return [entity for entity in entities if isinstance(entity, dict)] if isinstance(entities, list) else []
+
+
+def _add_url(found: set[tuple[str, str]], raw: str) -> None:
+    url = raw.strip().rstrip(URL_TRAILING_PUNCTUATION)
+    if not url:
+        return
+    if "://" not in url:
+        url = f"http://{url}"
+    host = _host(url)
+    if host is None:
+        return
+    found.add(("url", url))
+    found.add(("domain", host))
+
+
+def _add_phone(found: set[tuple[str, str]], raw: str) -> None:
+    text = raw.strip()
+    if DATE_LIKE_REGEX.match(text):
+        return
+    digits = re.sub(r"\D", "", text)
+    if not MIN_PHONE_DIGITS <= len(digits) <= MAX_PHONE_DIGITS:
+        return
+    # The entity-resolution phone key: the same number with or without country code or spacing.
+    key = phone_key(text)
+    if key:
+        found.add(("phone", key))
+
+
+def _host(raw: str) -> str | None:
+    # Unlike entity blocking, platform hosts (t.me, instagram.com, ...) are worth indexing here.
+    text = str(raw or "").strip().lower()
+    if "://" not in text:
+        text = f"http://{text}"
+    try:
+        host = (urllib.parse.urlsplit(text).hostname or "").strip(".")
+    except ValueError:
+        return None
+    if host.startswith("www."):
+        host = host[4:]
+    if not host or "." not in host:
+        return None
+    return host
@@ -1,23 +1,31 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 from dataclasses import dataclass, replace
-from typing import Any
+from typing import Any, Callable
 
+from .coalescing import RequestCoalescer
+from .entity_resolution import resolve_records
+from .sources.async_http import run_sync
 from .sources.capabilities import (
     get_platform_capabilities,
     get_platform_capabilities_with_runtime,
     get_source_capabilities,
 )
-from .sources.google_maps_source import GoogleMapsSource
-from .sources.models import DiscoveryFilters, SourceRecord
-from .sources.reddit_source import RedditSource
+from .sources.models import DiscoveryFilters, ScanStats, SourceRecord
+from .sources.registry import SOURCE_REGISTRY, get_source_spec, source_slot
+from .sources.response_cache import is_cache_bypassed, response_cache_bypass
+from .storage import Storage
 from .utils import utc_now_iso
 
 
-SUPPORTED_DISCOVERY_SOURCES = {
-    "google_maps",
-    "reddit",
-}
+SUPPORTED_DISCOVERY_SOURCES = set(SOURCE_REGISTRY)
+
+ENRICHABLE_SOURCES = {name for name, spec in SOURCE_REGISTRY.items() if spec.capabilities.get("supports_enrich")}
+
+DEFAULT_SOURCE_TIMEOUT_SECONDS = 25.0
 
 
 @dataclass(frozen=True)
@@ -28,6 +36,7 @@ class DiscoverySummary:
     result_count: int
     status: str
     error_message: str | None
+    scan: dict[str, Any] | None = None
 
     def to_storage_row(self, filters: DiscoveryFilters) -> dict[str, Any]:
         return {
@@ -48,12 +57,37 @@ class DiscoverySummary:
         }
 
 
+@dataclass(frozen=True)
+class DiscoveryOutcome:
+    source: str
+    records: list[SourceRecord]
+    summary: DiscoverySummary
+    warnings: list[str]
+    effective_filters: DiscoveryFilters
+
+
 class DiscoveryService:
-    def __init__(self, logger):
+    def __init__(self, logger, coalescer: RequestCoalescer | None = None):
         self.logger = logger
+        self.coalescer = coalescer
 
     def run(
-        self, *, source: str, filters: DiscoveryFilters, credentials: dict[str, str] | None = None
+        self,
+        *,
+        source: str,
+        filters: DiscoveryFilters,
+        credentials: dict[str, str] | None = None,
+        use_cache: bool = True,
+    ) -> tuple[list[SourceRecord], DiscoverySummary, list[str], DiscoveryFilters]:
+        return run_sync(self.arun(source=source, filters=filters, credentials=credentials, use_cache=use_cache))
+
+    async def arun(
+        self,
+        *,
+        source: str,
+        filters: DiscoveryFilters,
+        credentials: dict[str, str] | None = None,
+        use_cache: bool = True,
     ) -> tuple[list[SourceRecord], DiscoverySummary, list[str], DiscoveryFilters]:
         started_at = utc_now_iso()
         records: list[SourceRecord] = []
@@ -61,10 +95,17 @@ class DiscoveryService:
         error_message = None
         warnings: list[str] = []
         effective_filters = filters
+        scan: ScanStats | None = None
 
         try:
             effective_filters, warnings = _normalize_filters(source=source, filters=filters)
-            records = _resolve_source_client(source, credentials=credentials).search(effective_filters)
+            with response_cache_bypass(not use_cache):
+                records, scan = await self._search(source, effective_filters, credentials)
+            if scan is not None:
+                self.logger.info(
+                    "Discovery scan efficiency",
+                    extra={"event": "discovery.scan", "source": source, **scan.to_api_dict()},
+                )
         except Exception as exc:
             status = "error"
             error_message = str(exc)
@@ -99,9 +140,152 @@ class DiscoveryService:
             result_count=len(records),
             status=status,
             error_message=error_message,
+            scan=scan.to_api_dict() if scan is not None else None,
         )
         return records, summary, warnings, effective_filters
 
+    def run_many(
+        self,
+        *,
+        sources: list[str],
+        filters: DiscoveryFilters,
+        credentials: dict[str, dict[str, str]] | None = None,
+        timeout_seconds: float = DEFAULT_SOURCE_TIMEOUT_SECONDS,
+        use_cache: bool = True,
+    ) -> list[DiscoveryOutcome]:
+        return run_sync(
+            self.arun_many(
+                sources=sources,
+                filters=filters,
+                credentials=credentials,
+                timeout_seconds=timeout_seconds,
+                use_cache=use_cache,
+            )
+        )
+
+    async def arun_many(
+        self,
+        *,
+        sources: list[str],
+        filters: DiscoveryFilters,
+        credentials: dict[str, dict[str, str]] | None = None,
+        timeout_seconds: float = DEFAULT_SOURCE_TIMEOUT_SECONDS,
+        use_cache: bool = True,
+    ) -> list[DiscoveryOutcome]:
+        """Query every source concurrently; a source that misses its deadline reports ``timeout``."""
+        unique_sources = list(dict.fromkeys(sources))
+        credential_map = credentials or {}
+        started_at = utc_now_iso()
+        results = await asyncio.gather(
+            *(
+                asyncio.wait_for(
+                    self.arun(
+                        source=source,
+                        filters=filters,
+                        credentials=credential_map.get(source),
+                        use_cache=use_cache,
+                    ),
+                    timeout=timeout_seconds,
+                )
+                for source in unique_sources
+            ),
+            return_exceptions=True,
+        )
+
+        outcomes: list[DiscoveryOutcome] = []
+        for source, result in zip(unique_sources, results):
+            if isinstance(result, BaseException):
+                if not isinstance(result, asyncio.TimeoutError):
+                    raise result
+                # The source's search was cancelled at the deadline; its requests are closed.
+                self.logger.error(
+                    "Discovery source timed out",
+                    extra={"event": "discovery.timeout", "source": source, "timeout_seconds": timeout_seconds},
+                )
+                records, warnings, effective_filters = [], [], filters
+                summary = DiscoverySummary(
+                    source=source,
+                    started_at=started_at,
+                    finished_at=utc_now_iso(),
+                    result_count=0,
+                    status="timeout",
+                    error_message=f"{source} did not respond within {timeout_seconds:g}s.",
+                )
+            else:
+                records, summary, warnings, effective_filters = result
+            outcomes.append(
+                DiscoveryOutcome(
+                    source=source,
+                    records=records,
+                    summary=summary,
+                    warnings=warnings,
+                    effective_filters=effective_filters,
+                )
+            )
+        return outcomes
+
+    async def _search(
+        self, source: str, filters: DiscoveryFilters, credentials: dict[str, str] | None
+    ) -> tuple[list[SourceRecord], ScanStats | None]:
+        async def work() -> tuple[list[SourceRecord], ScanStats | None]:
+            client = _resolve_source_client(source, credentials=credentials)
+            # Coalesced followers never reach this point, so they do not consume the source's slots.
+            async with source_slot(source):
+                records = await client.asearch(filters)
+            # Paginating sources report how many candidates they scanned for the records kept.
+            return records, getattr(client, "last_scan", None)
+
+        if self.coalescer is None:
+            return await work()
+
+        # Credentials are part of the key so one caller's quota is never spent on another's results;
+        # the cache bypass too, so a no_cache request never joins a leader that may answer from cache.
+        key = (source, filters, _credentials_fingerprint(credentials), is_cache_bypassed())
+        (records, scan), coalesced = await self.coalescer.arun(key, work)
+        if coalesced:
+            self.logger.info(
+                "Discovery request coalesced",
+                extra={"event": "discovery.coalesced", "source": source, "result_count": len(records)},
+            )
+        return list(records), scan
+
+
+def enrich_source_records(
+    *,
+    storage: Storage,
+    source: str,
+    limit: int,
+    credentials: dict[str, str] | None = None,
+    batch_size: int = 20,
+    on_progress: Callable[[dict[str, Any]], None] | None = None,
+) -> dict[str, Any]:
+    """Fetch deferred details for stored records that were discovered without them."""
+    if source not in ENRICHABLE_SOURCES:
+        raise ValueError(f"Enrichment is not supported for source: {source}")
+
+    from .sources.google_maps_source import apply_details
+
+    client = _resolve_source_client(source, credentials=credentials)
+    pending = storage.get_source_records_pending_details(source, limit)
+    stats: dict[str, Any] = {"source": source, "pending": len(pending), "enriched": 0, "failed": 0}
+
+    for start in range(0, len(pending), batch_size):
+        batch = pending[start : start + batch_size]
+        details_list = client.fetch_details_many([row["external_id"] for row in batch])
+        updates = []
+        for row, details in zip(batch, details_list):
+            if details is None:
+                stats["failed"] += 1
+                continue
+            updates.append({"external_id": row["external_id"], **apply_details(row["raw_json"], details)})
+        storage.update_source_record_details(source, updates)
+        # Details bring the phone and website: re-block the records so they can join other sources.
+        resolve_records(storage, [(source, update["external_id"]) for update in updates])
+        stats["enriched"] += len(updates)
+        if on_progress is not None:
+            on_progress(dict(stats))
+    return stats
+
 
 def get_ui_capabilities() -> dict[str, dict[str, Any]]:
     return get_platform_capabilities()
@@ -112,17 +296,8 @@ def get_ui_capabilities_with_runtime() -> dict[str, dict[str, Any]]:
 
 
 def _resolve_source_client(source: str, credentials: dict[str, str] | None = None):
-    credential_data = credentials or {}
-
-    if source == "google_maps":
-        return GoogleMapsSource(api_key=_get_credential(credential_data, "api_key"))
-    if source == "reddit":
-        return RedditSource(
-            user_agent=_get_credential(credential_data, "user_agent"),
-            client_id=_get_credential(credential_data, "client_id"),
-            client_secret=_get_credential(credential_data, "client_secret"),
-        )
-    raise ValueError(f"Unsupported source: {source}")
+    # Source modules load on first use so importing the web app stays cheap.
+    return get_source_spec(source).create(credentials)
 
 
 def _normalize_filters(source: str, filters: DiscoveryFilters) -> tuple[DiscoveryFilters, list[str]]:
@@ -130,9 +305,12 @@ def _normalize_filters(source: str, filters: DiscoveryFilters) -> tuple[Discover
     warnings: list[str] = []
     normalized = filters
 
-    if capabilities.get("requires_location") and not filters.location:
+    if capabilities.get("requires_location") and not filters.location and not filters.has_point():
         raise ValueError(f"{source} discovery requires a location.")
 
+    if filters.has_point() and not capabilities.get("supports_point_search"):
+        raise ValueError(f"{source} does not support area (lat/lon radius) searches.")
+
     if not capabilities.get("supports_rating_filter") and filters.min_rating > 0:
         normalized = replace(normalized, min_rating=0.0)
         warnings.append("min_rating ignored by this source and reset to 0.")
@@ -149,12 +327,16 @@ def _normalize_filters(source: str, filters: DiscoveryFilters) -> tuple[Discover
         normalized = replace(normalized, has_phone="any")
         warnings.append("has_phone filter ignored by this source and reset to any.")
 
+    if not capabilities.get("supports_enrich") and filters.enrich:
+        normalized = replace(normalized, enrich=False)
+        warnings.append("enrich ignored by this source and reset to false.")
+
     return normalized, warnings
 
 
-def _get_credential(credentials: dict[str, str], key: str) -> str | None:
-    raw = credentials.get(key)
-    if raw is None:
-        return None
-    value = str(raw).strip()
-    return value or None
+def _credentials_fingerprint(credentials: dict[str, str] | None) -> str:
+    if not credentials:
+        return ""
+    encoded = json.dumps(credentials, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import unicodedata
+import urllib.parse
+from dataclasses import asdict, dataclass
+from typing import Any, Iterable
+
+from .sources.osm_tiles import distance_m, geohash_bbox, geohash_encode
+from .storage import Storage
+from .utils import utc_now_iso
+
+
+# ~5 km cells; trigram keys are looked up in the record's cell and its 8 neighbours.
+BLOCK_CELL_PRECISION = 5
+MAX_BLOCK_SIZE = 200
+# Candidates found only through name trigrams must share this fraction of the record's trigrams.
+MIN_SHARED_TRIGRAM_RATIO = 0.4
+NAME_MATCH_SIMILARITY = 0.6
+DOMAIN_MATCH_SIMILARITY = 0.3
+NEAR_DISTANCE_M = 150.0
+# Branches of a chain share names, domains and call centers; never merge records this far apart.
+MAX_MATCH_DISTANCE_M = 1000.0
+PHONE_KEY_DIGITS = 9
+
+# Hosts that identify a platform, not a business.
+SHARED_DOMAINS = {
+    "business.site",
+    "facebook.com",
+    "g.page",
+    "goo.gl",
+    "google.com",
+    "instagram.com",
+    "linktr.ee",
+    "linkedin.com",
+    "maps.app.goo.gl",
+    "reddit.com",
+    "tiktok.com",
+    "tripadvisor.com",
+    "twitter.com",
+    "wa.me",
+    "x.com",
+    "yelp.com",
+    "youtube.com",
+}
+NAME_STOPWORDS = {
+    "the", "and", "of", "el", "la", "los", "las", "de", "del", "y",
+    "sl", "sa", "slu", "sas", "srl", "llc", "inc", "ltd", "gmbh", "co", "corp",
+}
+COORDINATES_IN_TEXT = re.compile(r"\((-?\d+(?:\.\d+)?),\s*(-?\d+(?:\.\d+)?)\)")
+
+
+@dataclass
+class EntityFeatures:
+    source: str
+    external_id: str
+    name_norm: str
+    phone_key: str | None
+    phone_e164: str | None
+    domain: str | None
+    lat: float | None
+    lon: float | None
+    location_norm: str | None
+    entity_id: int | None = None
+
+
+def normalize_phone(raw: str | None, default_country_code: str | None = None) -> str | None:
+    """E.164 (``+<digits>``) when the country code is known, else the bare national digits."""
+    if not raw:
+        return None
+    text = str(raw).strip()
+    digits = re.sub(r"\D", "", text)
+    if len(digits) < 7:
+        return None
+    if text.startswith("+"):
+        return f"+{digits}"
+    if digits.startswith("00"):
+        return f"+{digits[2:]}"
+    country_code = default_country_code if default_country_code is not None else _default_country_code()
+    if country_code:
+        return f"+{country_code}{digits.lstrip('0')}"
+    return digits
+
+
+def phone_key(raw: str | None) -> str | None:
+    """Last digits of the number: matches across formats with and without country code."""
+    digits = re.sub(r"\D", "", str(raw or ""))
+    if len(digits) < 7:
+        return None
+    return digits[-PHONE_KEY_DIGITS:]
+
+
+def normalize_domain(raw: str | None) -> str | None:
+    if not raw:
+        return None
+    text = str(raw).strip().lower()
+    if "://" not in text:
+        text = f"http://{text}"
+    host = (urllib.parse.urlsplit(text).hostname or "").strip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    if not host or "." not in host:
+        return None
+    if host in SHARED_DOMAINS or any(host.endswith(f".{shared}") for shared in SHARED_DOMAINS):
+        return None
+    return host
+
+
+def normalize_name(raw: str | None) -> str:
+    text = unicodedata.normalize("NFKD", str(raw or "")).encode("ascii", "ignore").decode("ascii").lower()
+    # Dots are dropped first so abbreviations like "S.L." become one token.
+    tokens = re.findall(r"[a-z0-9]+", text.replace(".", ""))
+    return " ".join(token for token in tokens if token not in NAME_STOPWORDS)
+
+
+def name_trigrams(name_norm: str) -> set[str]:
+    padded = f" {name_norm} "
+    return {padded[index : index + 3] for index in range(len(padded) - 2)} if name_norm else set()
+
+
+def trigram_similarity(left: str, right: str) -> float:
+    left_grams = name_trigrams(left)
+    right_grams = name_trigrams(right)
+    if not left_grams or not right_grams:
+        return 0.0
+    return len(left_grams & right_grams) / len(left_grams | right_grams)
+
+
+def extract_features(row: dict[str, Any]) -> EntityFeatures:
+    lat, lon = _coordinates(row)
+    location_norm = normalize_name(str(row.get("location") or "").split("(")[0]) or None
+    return EntityFeatures(
+        source=str(row["source"]),
+        external_id=str(row["external_id"]),
+        name_norm=normalize_name(row.get("name")),
+        phone_key=phone_key(row.get("phone")),
+        phone_e164=normalize_phone(row.get("phone")),
+        domain=normalize_domain(row.get("website")),
+        lat=lat,
+        lon=lon,
+        location_norm=location_norm,
+    )
+
+
+def own_block_keys(features: EntityFeatures) -> list[str]:
+    keys = []
+    if features.phone_key:
+        keys.append(f"phone:{features.phone_key}")
+    if features.domain:
+        keys.append(f"domain:{features.domain}")
+    cell = _cell(features)
+    if cell:
+        keys.extend(f"name:{cell}:{gram}" for gram in sorted(name_trigrams(features.name_norm)))
+    return keys
+
+
+def lookup_block_keys(features: EntityFeatures) -> list[str]:
+    keys = [key for key in own_block_keys(features) if not key.startswith("name:")]
+    grams = sorted(name_trigrams(features.name_norm))
+    for cell in _neighbour_cells(features):
+        keys.extend(f"name:{cell}:{gram}" for gram in grams)
+    return keys
+
+
+def is_match(left: EntityFeatures | dict[str, Any], right: EntityFeatures | dict[str, Any]) -> bool:
+    a = asdict(left) if isinstance(left, EntityFeatures) else left
+    b = asdict(right) if isinstance(right, EntityFeatures) else right
+    distance = None
+    if None not in (a["lat"], a["lon"], b["lat"], b["lon"]):
+        distance = distance_m(a["lat"], a["lon"], b["lat"], b["lon"])
+        if distance > MAX_MATCH_DISTANCE_M:
+            return False
+    if a["phone_key"] and a["phone_key"] == b["phone_key"]:
+        return True
+    similarity = trigram_similarity(a["name_norm"], b["name_norm"])
+    if a["domain"] and a["domain"] == b["domain"] and similarity >= DOMAIN_MATCH_SIMILARITY:
+        return True
+    if distance is not None:
+        near = distance <= NEAR_DISTANCE_M
+    else:
+        near = bool(a["location_norm"]) and a["location_norm"] == b["location_norm"]
+    return near and similarity >= NAME_MATCH_SIMILARITY
+
+
+def resolve_records(storage: Storage, ids: Iterable[tuple[str, str]]) -> dict[str, int]:
+    """Attach each stored ``source_records`` row to a ``business_entities`` cluster.
+
+    Candidates come only from shared block keys (phone, domain, name trigram within the
+    location cell and its neighbours). Matching records join one entity; when a record
+    links several entities they are merged. Clusters only grow: a record whose data
+    changes keeps its entity.
+    """
+    stats = {"records": 0, "new_entities": 0, "matched": 0, "merged_entities": 0}
+    for row in storage.get_source_records_by_ids(list(dict.fromkeys(ids))):
+        features = extract_features(row)
+        stats["records"] += 1
+        existing = storage.get_entity_member(features.source, features.external_id)
+        entity_ids = {int(existing["entity_id"])} if existing else set()
+
+        own = asdict(features)
+        own_grams = name_trigrams(features.name_norm)
+        min_shared = max(2, int(len(own_grams) * MIN_SHARED_TRIGRAM_RATIO))
+        candidates = storage.get_entity_candidates(
+            lookup_block_keys(features),
+            exclude=(features.source, features.external_id),
+            max_block_size=MAX_BLOCK_SIZE,
+        )
+        for candidate in candidates:
+            shared = str(candidate.pop("shared_keys") or "").split(" ")
+            strong = any(not key.startswith("name:") for key in shared)
+            if not strong and len(shared) < min_shared:
+                continue
+            if int(candidate["entity_id"]) not in entity_ids and is_match(own, candidate):
+                entity_ids.add(int(candidate["entity_id"]))
+
+        now_utc = utc_now_iso()
+        if entity_ids:
+            target = min(entity_ids)
+            merged = sorted(entity_ids - {target})
+            if not existing or len(entity_ids) > 1:
+                stats["matched"] += 1
+            stats["merged_entities"] += len(merged)
+        else:
+            target = storage.create_business_entity(now_utc)
+            merged = []
+            stats["new_entities"] += 1
+        features.entity_id = target
+        storage.save_entity_member(
+            asdict(features), own_block_keys(features), merge_entity_ids=merged, now_utc=now_utc
+        )
+    return stats
+
+
+def _default_country_code() -> str | None:
+    value = re.sub(r"\D", "", os.getenv("DEDUP_DEFAULT_COUNTRY_CODE", ""))
+    return value or None
+
+
+def _cell(features: EntityFeatures) -> str | None:
+    if features.lat is not None and features.lon is not None:
+        return geohash_encode(features.lat, features.lon, BLOCK_CELL_PRECISION)
+    if features.location_norm:
+        return f"loc-{features.location_norm.replace(' ', '-')}"
+    return None
+
+
+def _neighbour_cells(features: EntityFeatures) -> list[str]:
+    cell = _cell(features)
+    if cell is None or cell.startswith("loc-"):
+        return [cell] if cell else []
+    south, west, north, east = geohash_bbox(cell)
+    height = north - south
+    width = east - west
+    center_lat = (south + north) / 2
+    center_lon = (west + east) / 2
+    cells = []
+    for lat_step in (-1, 0, 1):
+        for lon_step in (-1, 0, 1):
+            lat = center_lat + lat_step * height
+            if not -90 < lat < 90:
+                continue
+            lon = (center_lon + lon_step * width + 180) % 360 - 180
+            cells.append(geohash_encode(lat, lon, BLOCK_CELL_PRECISION))
+    return list(dict.fromkeys(cells))
+
+
+def _coordinates(row: dict[str, Any]) -> tuple[float | None, float | None]:
+    match = COORDINATES_IN_TEXT.search(str(row.get("location") or ""))
+    if match:
+        return float(match.group(1)), float(match.group(2))
+    try:
+        raw = json.loads(row.get("raw_json") or "{}")
+    except (TypeError, ValueError):
+        return None, None
+    if not isinstance(raw, dict):
+        return None, None
+    # Google, Yelp, Foursquare, TomTom and Overpass shapes, in that order.
+    for container, lat_key, lon_key in (
+        (((raw.get("geometry") or {}).get("location")), "lat", "lng"),
+        (raw.get("coordinates"), "latitude", "longitude"),
+        (((raw.get("geocodes") or {}).get("main")), "latitude", "longitude"),
+        (raw.get("position"), "lat", "lon"),
+        (raw.get("center"), "lat", "lon"),
+        (raw, "lat", "lon"),
+    ):
+        if isinstance(container, dict) and container.get(lat_key) is not None and container.get(lon_key) is not None:
+            try:
+                return float(container[lat_key]), float(container[lon_key])
+            except (TypeError, ValueError):
+                continue
+    return None, None
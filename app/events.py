@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import itertools
+import queue
+import threading
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class Subscription:
+    channel: str
+    max_queue: int
+    queue: "queue.Queue[dict[str, Any]]" = field(init=False)
+    dropped: int = 0
+
+    def __post_init__(self) -> None:
+        self.queue = queue.Queue(maxsize=self.max_queue)
+
+    def get(self, timeout_seconds: float) -> dict[str, Any] | None:
+        try:
+            return self.queue.get(timeout=timeout_seconds)
+        except queue.Empty:
+            return None
+
+    def take_dropped(self) -> int:
+        dropped, self.dropped = self.dropped, 0
+        return dropped
+
+
+class EventBus:
+    """In-process fan-out of structured events to live subscribers.
+
+    ``publish`` never blocks the producer: each subscriber has a bounded queue and
+    events that do not fit are dropped (and counted) for that subscriber only.
+    """
+
+    def __init__(self, *, max_queue: int = 256):
+        self.max_queue = max_queue
+        self._subscriptions: dict[str, list[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._sequence = itertools.count(1)
+
+    def subscribe(self, channel: str) -> Subscription:
+        subscription = Subscription(channel=channel, max_queue=self.max_queue)
+        with self._lock:
+            self._subscriptions.setdefault(channel, []).append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel, [])
+            if subscription in subscriptions:
+                subscriptions.remove(subscription)
+            if not subscriptions:
+                self._subscriptions.pop(subscription.channel, None)
+
+    def publish(self, channel: str, event: str, payload: dict[str, Any]) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        if not subscriptions:
+            return
+
+        message = {"id": next(self._sequence), "event": event, "data": payload}
+        for subscription in subscriptions:
+            try:
+                subscription.queue.put_nowait(message)
+            except queue.Full:
+                subscription.dropped += 1
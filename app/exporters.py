@@ -1,42 +1,386 @@
 from __future__ import annotations
 
+import calendar
 import csv
+import hashlib
+import io
 import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, time, timezone
 from pathlib import Path
+from typing import Any, Iterable, Iterator, Mapping
 
-from .storage import Storage
+from .config import normalize_target
+from .sources.models import ALLOWED_BOOL_FILTERS
+from .storage import MESSAGE_COLUMNS, SOURCE_RECORD_EXPORT_COLUMNS, Storage
+from .utils import utc_now_iso
 
 
-def export_messages(storage: Storage, output_format: str, output_path: Path) -> int:
-    rows = storage.get_all_messages()
+ALLOWED_MEDIA_FILTERS = {"any", "yes", "no"}
+EXPORT_FORMATS = {"csv", "json", "ndjson"}
+SHARD_MODES = {"target", "target-month"}
+MANIFEST_FILENAME = "manifest.json"
+
+
+@dataclass(frozen=True)
+class MessageExportFilters:
+    target: str | None = None
+    date_from: str | None = None
+    date_to: str | None = None
+    has_media: str = "any"
+    columns: tuple[str, ...] = tuple(MESSAGE_COLUMNS)
+
+    @classmethod
+    def from_payload(cls, payload: Mapping[str, Any]) -> "MessageExportFilters":
+        target_raw = str(payload.get("target") or "").strip()
+        target = None
+        if target_raw:
+            target = target_raw if target_raw.lstrip("-").isdigit() else normalize_target(target_raw)
+
+        has_media = str(payload.get("has_media") or "any").strip().lower() or "any"
+        if has_media not in ALLOWED_MEDIA_FILTERS:
+            raise ValueError("has_media must be one of: any, yes, no.")
+
+        date_from = _parse_date_bound(payload.get("from"), field_name="from", end_of_day=False)
+        date_to = _parse_date_bound(payload.get("to"), field_name="to", end_of_day=True)
+        if date_from and date_to and date_from > date_to:
+            raise ValueError("'from' cannot be later than 'to'.")
+
+        return cls(
+            target=target,
+            date_from=date_from,
+            date_to=date_to,
+            has_media=has_media,
+            columns=_parse_columns(payload.get("columns")),
+        )
+
+
+@dataclass(frozen=True)
+class SourceRecordExportFilters:
+    source: str | None = None
+    niche: str | None = None
+    location: str | None = None
+    min_rating: float = 0.0
+    has_website: str = "any"
+    has_phone: str = "any"
+    include_raw: bool = False
+
+    @classmethod
+    def from_payload(cls, payload: Mapping[str, Any]) -> "SourceRecordExportFilters":
+        has_website = str(payload.get("has_website") or "any").strip().lower() or "any"
+        has_phone = str(payload.get("has_phone") or "any").strip().lower() or "any"
+        if has_website not in ALLOWED_BOOL_FILTERS:
+            raise ValueError("has_website must be one of: any, yes, no.")
+        if has_phone not in ALLOWED_BOOL_FILTERS:
+            raise ValueError("has_phone must be one of: any, yes, no.")
+
+        try:
+            min_rating = float(payload.get("min_rating") or 0)
+        except (TypeError, ValueError) as exc:
+            raise ValueError("min_rating must be a valid number.") from exc
+        if min_rating < 0 or min_rating > 5:
+            raise ValueError("min_rating must be between 0 and 5.")
+
+        niche = str(payload.get("niche") or "").strip()
+        include_raw = payload.get("include_raw")
+        return cls(
+            source=str(payload.get("source") or "").strip().lower() or None,
+            niche=niche if niche and niche != "all" else None,
+            location=str(payload.get("location") or "").strip() or None,
+            min_rating=min_rating,
+            has_website=has_website,
+            has_phone=has_phone,
+            include_raw=include_raw is True or str(include_raw or "").strip().lower() in {"1", "true", "yes"},
+        )
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        if self.include_raw:
+            return tuple(SOURCE_RECORD_EXPORT_COLUMNS)
+        return tuple(column for column in SOURCE_RECORD_EXPORT_COLUMNS if column != "raw_json")
+
+
+def export_messages(
+    storage: Storage,
+    output_format: str,
+    output_path: Path,
+    filters: MessageExportFilters | None = None,
+) -> int:
+    if output_format not in {"csv", "json"}:
+        raise ValueError(f"Unsupported export format: {output_format}")
+
+    export_filters = filters or MessageExportFilters()
+    rows = iter_filtered_messages(storage, export_filters)
     output_path.parent.mkdir(parents=True, exist_ok=True)
+    return _write_rows(output_path, output_format, rows, list(export_filters.columns))
+
+
+def export_source_records(
+    storage: Storage,
+    output_format: str,
+    output_path: Path,
+    filters: SourceRecordExportFilters | None = None,
+) -> int:
+    if output_format not in {"csv", "ndjson"}:
+        raise ValueError(f"Unsupported source record export format: {output_format}")
+
+    export_filters = filters or SourceRecordExportFilters()
+    rows = iter_filtered_source_records(storage, export_filters)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    return _write_rows(output_path, output_format, rows, list(export_filters.columns))
+
+
+def export_messages_sharded(
+    db_path: Path,
+    output_format: str,
+    output_dir: Path,
+    *,
+    shard_by: str,
+    filters: MessageExportFilters | None = None,
+    workers: int = 4,
+) -> dict[str, Any]:
+    if output_format not in {"csv", "json"}:
+        raise ValueError(f"Unsupported export format: {output_format}")
+    if shard_by not in SHARD_MODES:
+        raise ValueError(f"shard_by must be one of: {', '.join(sorted(SHARD_MODES))}.")
+    if workers <= 0:
+        raise ValueError("workers must be greater than 0.")
+
+    export_filters = filters or MessageExportFilters()
+    with Storage(db_path, read_only=True) as storage:
+        target_ids = _resolve_target_ids(storage, export_filters)
+        if target_ids is None:
+            target_ids = storage.get_message_target_ids()
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    # Contiguous target_id ranges keep each worker on its own slice of the (target_id, ...) indexes.
+    worker_count = max(1, min(workers, len(target_ids)))
+    chunk_size = -(-len(target_ids) // worker_count) if target_ids else 0
+    chunks = [target_ids[index : index + chunk_size] for index in range(0, len(target_ids), chunk_size or 1)]
+
+    with ThreadPoolExecutor(max_workers=worker_count, thread_name_prefix="export-shard") as pool:
+        results = pool.map(
+            lambda chunk: _export_shard_chunk(
+                db_path=db_path,
+                output_format=output_format,
+                output_dir=output_dir,
+                shard_by=shard_by,
+                filters=export_filters,
+                target_ids=chunk,
+            ),
+            chunks,
+        )
+        files = [entry for chunk_entries in results for entry in chunk_entries]
+
+    manifest = {
+        "created_at": utc_now_iso(),
+        "format": output_format,
+        "shard_by": shard_by,
+        "filters": {
+            "target": export_filters.target,
+            "from": export_filters.date_from,
+            "to": export_filters.date_to,
+            "has_media": export_filters.has_media,
+            "columns": list(export_filters.columns),
+        },
+        "total_rows": sum(entry["rows"] for entry in files),
+        "files": files,
+    }
+    (output_dir / MANIFEST_FILENAME).write_text(
+        json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8"
+    )
+    return manifest
+
+
+def iter_filtered_messages(storage: Storage, filters: MessageExportFilters) -> Iterable[dict[str, Any]]:
+    return storage.iter_messages(
+        columns=list(filters.columns),
+        target_ids=_resolve_target_ids(storage, filters),
+        date_from=filters.date_from,
+        date_to=filters.date_to,
+        has_media=filters.has_media,
+    )
+
+
+def iter_filtered_source_records(
+    storage: Storage, filters: SourceRecordExportFilters
+) -> Iterable[dict[str, Any]]:
+    return storage.iter_source_records(
+        columns=list(filters.columns),
+        source=filters.source,
+        niche=filters.niche,
+        location=filters.location,
+        min_rating=filters.min_rating,
+        has_website=filters.has_website,
+        has_phone=filters.has_phone,
+    )
+
+
+def _resolve_target_ids(storage: Storage, filters: MessageExportFilters) -> list[int] | None:
+    if not filters.target:
+        return None
+    if filters.target.lstrip("-").isdigit():
+        return [int(filters.target)]
+    return storage.find_target_ids(filters.target)
+
+
+def _export_shard_chunk(
+    *,
+    db_path: Path,
+    output_format: str,
+    output_dir: Path,
+    shard_by: str,
+    filters: MessageExportFilters,
+    target_ids: list[int],
+) -> list[dict[str, Any]]:
+    entries: list[dict[str, Any]] = []
+    with Storage(db_path, read_only=True) as storage:
+        for target_id in target_ids:
+            if shard_by == "target":
+                shards = [(None, filters.date_from, filters.date_to)]
+            else:
+                months = storage.get_message_months(
+                    target_id, date_from=filters.date_from, date_to=filters.date_to
+                )
+                shards = [(month, *_month_bounds(month, filters)) for month in months]
+
+            for month, date_from, date_to in shards:
+                suffix = f"_{month}" if month else ""
+                output_path = output_dir / f"messages_{target_id}{suffix}.{output_format}"
+                rows = storage.iter_messages(
+                    columns=list(filters.columns),
+                    target_ids=[target_id],
+                    date_from=date_from,
+                    date_to=date_to,
+                    has_media=filters.has_media,
+                )
+                count = _write_rows(output_path, output_format, rows, list(filters.columns))
+                if count == 0:
+                    output_path.unlink()
+                    continue
+                entries.append(
+                    {
+                        "file": output_path.name,
+                        "target_id": target_id,
+                        "month": month,
+                        "rows": count,
+                        "bytes": output_path.stat().st_size,
+                        "sha256": _sha256_file(output_path),
+                    }
+                )
+    return entries
+
+
+def _month_bounds(month: str, filters: MessageExportFilters) -> tuple[str, str]:
+    year, month_number = (int(part) for part in month.split("-"))
+    last_day = calendar.monthrange(year, month_number)[1]
+    start = datetime(year, month_number, 1, tzinfo=timezone.utc).isoformat()
+    end = datetime.combine(
+        datetime(year, month_number, last_day).date(), time.max, tzinfo=timezone.utc
+    ).isoformat()
+    if filters.date_from and filters.date_from > start:
+        start = filters.date_from
+    if filters.date_to and filters.date_to < end:
+        end = filters.date_to
+    return start, end
+
+
+def _sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def iter_export_chunks(
+    rows: Iterable[dict[str, Any]],
+    output_format: str,
+    columns: list[str],
+    *,
+    rows_per_chunk: int = 200,
+) -> Iterator[str]:
+    if output_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {output_format}")
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns) if output_format == "csv" else None
+    if writer is not None:
+        writer.writeheader()
+    elif output_format == "json":
+        buffer.write("[")
+
+    written = 0
+    for row in rows:
+        if writer is not None:
+            writer.writerow(row)
+        elif output_format == "ndjson":
+            buffer.write(json.dumps(row, ensure_ascii=False))
+            buffer.write("\n")
+        else:
+            buffer.write(",\n  " if written else "\n  ")
+            buffer.write(json.dumps(row, ensure_ascii=False))
+        written += 1
+        if written % rows_per_chunk == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
 
     if output_format == "json":
-        output_path.write_text(json.dumps(rows, ensure_ascii=False, indent=2), encoding="utf-8")
-        return len(rows)
-
-    if output_format == "csv":
-        fieldnames = [
-            "target_id",
-            "target_username",
-            "message_id",
-            "date_utc",
-            "sender_id",
-            "sender_username",
-            "text",
-            "entities_json",
-            "views",
-            "forwards",
-            "reply_to_msg_id",
-            "media_type",
-            "media_metadata_json",
-            "scraped_at",
-        ]
-        with output_path.open("w", newline="", encoding="utf-8") as handle:
-            writer = csv.DictWriter(handle, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(rows)
-        return len(rows)
-
-    raise ValueError(f"Unsupported export format: {output_format}")
+        buffer.write("\n]" if written else "]")
+    tail = buffer.getvalue()
+    if tail:
+        yield tail
+
+
+def _write_rows(output_path: Path, output_format: str, rows: Iterable[dict[str, Any]], columns: list[str]) -> int:
+    count = 0
+
+    def counted() -> Iterator[dict[str, Any]]:
+        nonlocal count
+        for row in rows:
+            count += 1
+            yield row
+
+    with output_path.open("w", newline="", encoding="utf-8") as handle:
+        for chunk in iter_export_chunks(counted(), output_format, columns):
+            handle.write(chunk)
+    return count
+
+
+def _parse_columns(raw: Any) -> tuple[str, ...]:
+    if raw is None or raw == "":
+        return tuple(MESSAGE_COLUMNS)
+
+    items = raw if isinstance(raw, (list, tuple)) else str(raw).split(",")
+    columns: list[str] = []
+    for item in items:
+        column = str(item).strip()
+        if column and column not in columns:
+            columns.append(column)
+
+    unknown = [column for column in columns if column not in MESSAGE_COLUMNS]
+    if unknown:
+        raise ValueError(
+            f"Unknown export columns: {', '.join(unknown)}. Allowed: {', '.join(MESSAGE_COLUMNS)}."
+        )
+    return tuple(columns) or tuple(MESSAGE_COLUMNS)
+
+
+def _parse_date_bound(raw: Any, *, field_name: str, end_of_day: bool) -> str | None:
+    text = str(raw or "").strip()
+    if not text:
+        return None
+
+    try:
+        parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError as exc:
+        raise ValueError(f"Invalid date for '{field_name}': {text!r}. Use YYYY-MM-DD or ISO 8601.") from exc
 
+    if len(text) == 10 and end_of_day:
+        parsed = datetime.combine(parsed.date(), time.max)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    # date_utc is stored as UTC isoformat text, so bounds compare lexicographically.
+    return parsed.astimezone(timezone.utc).isoformat()
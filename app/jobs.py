@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+from .events import EventBus
+from .storage import Storage
+from .utils import utc_now_iso
+
+
+TERMINAL_JOB_STATUSES = {"succeeded", "failed"}
+# A running job's worker touches ``updated_at`` this often; without it for ``stale_after_seconds`` the worker is gone.
+DEFAULT_HEARTBEAT_SECONDS = 30.0
+DEFAULT_STALE_AFTER_SECONDS = 300
+
+
+@dataclass
+class JobContext:
+    job_id: int
+    kind: str
+    params: dict[str, Any]
+    db_path: Path
+    event_bus: EventBus | None = None
+
+    def publish(self, event: str, payload: dict[str, Any]) -> None:
+        if self.event_bus is not None:
+            self.event_bus.publish(job_channel(self.job_id), event, payload)
+
+    def report_progress(self, progress: dict[str, Any]) -> None:
+        with Storage(self.db_path) as storage:
+            storage.update_job_progress(self.job_id, json.dumps(progress, ensure_ascii=False), utc_now_iso())
+
+
+JobHandler = Callable[[JobContext], dict[str, Any]]
+
+
+class JobQueue:
+    """SQLite-backed job queue executed by in-process worker threads.
+
+    Jobs for the same target key never run concurrently (a ``"*"`` scrape conflicts with
+    every other scrape), and claiming happens inside a write transaction so several web processes can
+    share one database. While a job runs, its worker refreshes the job's heartbeat on a
+    timer, so only jobs whose worker process died are expired, however long they run.
+    """
+
+    def __init__(
+        self,
+        *,
+        db_path: Path,
+        handlers: dict[str, JobHandler],
+        logger: logging.Logger,
+        workers: int = 1,
+        poll_interval_seconds: float = 2.0,
+        stale_after_seconds: int = DEFAULT_STALE_AFTER_SECONDS,
+        heartbeat_seconds: float = DEFAULT_HEARTBEAT_SECONDS,
+        event_bus: EventBus | None = None,
+    ):
+        self.db_path = Path(db_path)
+        self.handlers = handlers
+        self.logger = logger
+        self.workers = max(1, workers)
+        self.poll_interval_seconds = poll_interval_seconds
+        self.stale_after_seconds = stale_after_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        if self.heartbeat_seconds * 2 > self.stale_after_seconds:
+            raise ValueError("stale_after_seconds must be at least twice heartbeat_seconds.")
+        self.event_bus = event_bus
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def enqueue(self, kind: str, params: dict[str, Any], *, target_key: str = "*") -> tuple[dict[str, Any], bool]:
+        if kind not in self.handlers:
+            raise ValueError(f"Unsupported job kind: {kind}")
+
+        params_json = json.dumps(params, ensure_ascii=False, sort_keys=True)
+        with Storage(self.db_path) as storage:
+            storage.init_db()
+            existing = storage.find_active_job(kind=kind, target_key=target_key, params_json=params_json)
+            if existing is not None:
+                return serialize_job(existing), True
+            job_id = storage.insert_job(
+                kind=kind,
+                target_key=target_key,
+                params_json=params_json,
+                now_utc=utc_now_iso(),
+            )
+            job = storage.get_job(job_id)
+
+        self.logger.info(
+            "Job enqueued",
+            extra={"event": "job.enqueued", "job_id": job_id, "kind": kind, "target_key": target_key},
+        )
+        self.start()
+        self._wake.set()
+        return serialize_job(job or {}), False
+
+    def get(self, job_id: int) -> dict[str, Any] | None:
+        with Storage(self.db_path) as storage:
+            storage.init_db()
+            job = storage.get_job(job_id)
+        return serialize_job(job) if job else None
+
+    def start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            self._stop.clear()
+            for index in range(self.workers):
+                thread = threading.Thread(
+                    target=self._worker_loop,
+                    args=(f"{os.getpid()}-{index}-{uuid.uuid4().hex[:8]}",),
+                    name=f"job-worker-{index}",
+                    daemon=True,
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout_seconds: float = 5.0) -> None:
+        with self._lock:
+            self._stop.set()
+            self._wake.set()
+            for thread in self._threads:
+                thread.join(timeout=timeout_seconds)
+            self._threads = []
+
+    def _worker_loop(self, worker_id: str) -> None:
+        while not self._stop.is_set():
+            try:
+                job = self._claim(worker_id)
+            except Exception:
+                self.logger.exception("Job claim failed", extra={"event": "job.claim_error", "worker_id": worker_id})
+                job = None
+
+            if job is None:
+                self._wake.wait(self.poll_interval_seconds)
+                self._wake.clear()
+                continue
+            self._run(job, worker_id)
+            # A finished job may unblock a queued job for the same target in another worker.
+            self._wake.set()
+
+    def _claim(self, worker_id: str) -> dict[str, Any] | None:
+        stale_before = (
+            datetime.now(timezone.utc) - timedelta(seconds=self.stale_after_seconds)
+        ).isoformat()
+        with Storage(self.db_path) as storage:
+            return storage.claim_next_job(worker_id=worker_id, now_utc=utc_now_iso(), stale_before=stale_before)
+
+    def _run(self, job: dict[str, Any], worker_id: str) -> None:
+        job_id = int(job["id"])
+        context = JobContext(
+            job_id=job_id,
+            kind=str(job["kind"]),
+            params=json.loads(job["params_json"] or "{}"),
+            db_path=self.db_path,
+            event_bus=self.event_bus,
+        )
+        self.logger.info("Job started", extra={"event": "job.start", "job_id": job_id, "kind": context.kind})
+        context.publish("job.start", {"job_id": job_id, "kind": context.kind})
+
+        status = "succeeded"
+        result_json = None
+        error_message = None
+        finished = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat_loop,
+            args=(job_id, worker_id, finished),
+            name=f"job-heartbeat-{job_id}",
+            daemon=True,
+        )
+        heartbeat.start()
+        try:
+            result = self.handlers[context.kind](context)
+            result_json = json.dumps(result, ensure_ascii=False, default=str)
+        except Exception as exc:
+            status = "failed"
+            error_message = str(exc) or exc.__class__.__name__
+            self.logger.exception("Job failed", extra={"event": "job.error", "job_id": job_id, "kind": context.kind})
+        finally:
+            finished.set()
+            heartbeat.join()
+
+        with Storage(self.db_path) as storage:
+            recorded = storage.finish_job(
+                job_id,
+                worker_id=worker_id,
+                status=status,
+                now_utc=utc_now_iso(),
+                result_json=result_json,
+                error_message=error_message,
+            )
+        if not recorded:
+            # The job was expired (and possibly re-run elsewhere) while this worker was unresponsive.
+            self.logger.warning(
+                "Job result discarded",
+                extra={"event": "job.result_discarded", "job_id": job_id, "kind": context.kind, "status": status},
+            )
+            return
+        context.publish("job.finished", {"job_id": job_id, "status": status, "error_message": error_message})
+        self.logger.info(
+            "Job finished",
+            extra={"event": "job.complete", "job_id": job_id, "kind": context.kind, "status": status},
+        )
+
+    def _heartbeat_loop(self, job_id: int, worker_id: str, finished: threading.Event) -> None:
+        while not finished.wait(self.heartbeat_seconds):
+            try:
+                with Storage(self.db_path) as storage:
+                    alive = storage.touch_job(job_id, worker_id=worker_id, now_utc=utc_now_iso())
+            except Exception:
+                # A locked database skips one beat; the stale window spans several.
+                self.logger.warning(
+                    "Job heartbeat failed",
+                    extra={"event": "job.heartbeat_error", "job_id": job_id, "worker_id": worker_id},
+                    exc_info=True,
+                )
+                continue
+            if not alive:
+                return
+
+
+def job_channel(job_id: int) -> str:
+    return f"job:{job_id}"
+
+
+def serialize_job(row: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "id": row.get("id"),
+        "kind": row.get("kind"),
+        "target_key": row.get("target_key"),
+        "status": row.get("status"),
+        "params": _load_json(row.get("params_json")) or {},
+        "progress": _load_json(row.get("progress_json")) or {},
+        "result": _load_json(row.get("result_json")),
+        "error_message": row.get("error_message"),
+        "created_at": row.get("created_at"),
+        "started_at": row.get("started_at"),
+        "finished_at": row.get("finished_at"),
+        "updated_at": row.get("updated_at"),
+        "done": row.get("status") in TERMINAL_JOB_STATUSES,
+    }
+
+
+def _load_json(raw: str | None) -> Any:
+    if not raw:
+        return None
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return None
@@ -5,8 +5,19 @@ import asyncio
 import os
 from pathlib import Path
 
-from .config import load_app_config, load_telegram_settings
-from .exporters import export_messages
+from .config import (
+    load_app_config,
+    load_dotenv,
+    load_telegram_settings,
+    normalize_target,
+)
+from .exporters import (
+    MessageExportFilters,
+    SourceRecordExportFilters,
+    export_messages,
+    export_messages_sharded,
+    export_source_records,
+)
 from .storage import Storage
 from .utils import setup_logging
 
@@ -65,7 +76,122 @@ def _build_parser() -> argparse.ArgumentParser:
 
     export_parser = subparsers.add_parser("export", help="Export stored messages.")
     export_parser.add_argument("--format", required=True, choices=["csv", "json"])
-    export_parser.add_argument("--out", required=True, help="Output file path.")
+    export_parser.add_argument(
+        "--out",
+        required=True,
+        help="Output file path (output directory when --shard-by is used).",
+    )
+    export_parser.add_argument(
+        "--shard-by",
+        choices=["target", "target-month"],
+        help="Write one file per target (or per target and month) plus a manifest.json.",
+    )
+    export_parser.add_argument(
+        "--workers",
+        default=4,
+        type=int,
+        help="Parallel export workers when --shard-by is used (default: 4).",
+    )
+    export_parser.add_argument("--target", help="Export only one target (@username or numeric target_id).")
+    export_parser.add_argument(
+        "--from",
+        dest="date_from",
+        help="Only messages with date_utc >= this date (YYYY-MM-DD or ISO 8601, UTC if naive).",
+    )
+    export_parser.add_argument(
+        "--to",
+        dest="date_to",
+        help="Only messages with date_utc <= this date (a bare YYYY-MM-DD includes the whole day).",
+    )
+    export_parser.add_argument(
+        "--has-media",
+        default="any",
+        choices=["any", "yes", "no"],
+        help="Filter by presence of media (default: any).",
+    )
+    export_parser.add_argument(
+        "--columns",
+        help="Comma-separated message columns to export (default: all columns).",
+    )
+
+    records_parser = subparsers.add_parser(
+        "export-records",
+        help="Export stored discovery source_records (Google Maps, Reddit, ...).",
+    )
+    records_parser.add_argument("--format", required=True, choices=["csv", "ndjson"])
+    records_parser.add_argument("--out", required=True, help="Output file path.")
+    records_parser.add_argument("--source", help="Only records from this source (e.g. google_maps).")
+    records_parser.add_argument("--niche", help="Only records stored with this niche.")
+    records_parser.add_argument("--location", help="Only records whose location contains this text.")
+    records_parser.add_argument("--min-rating", default=0.0, type=float, help="Minimum rating (default: 0).")
+    records_parser.add_argument("--has-website", default="any", choices=["any", "yes", "no"])
+    records_parser.add_argument("--has-phone", default="any", choices=["any", "yes", "no"])
+    records_parser.add_argument(
+        "--include-raw",
+        action="store_true",
+        help="Include the raw_json payload column (omitted by default).",
+    )
+
+    enrich_parser = subparsers.add_parser(
+        "enrich-records",
+        help="Fetch deferred details (website/phone) for stored Google Maps source_records.",
+    )
+    enrich_parser.add_argument("--source", default="google_maps", choices=["google_maps"])
+    enrich_parser.add_argument("--limit", default=100, type=int, help="Maximum records to enrich (default: 100).")
+    enrich_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore cached upstream responses (fresh ones are still stored).",
+    )
+
+    resolve_parser = subparsers.add_parser(
+        "resolve-entities",
+        help="Group stored source_records into cross-source business_entities (backfill).",
+    )
+    resolve_parser.add_argument("--source", help="Only records from this source (default: all).")
+
+    sweep_parser = subparsers.add_parser(
+        "sweep",
+        help="Collect every result of a large area: search a grid of cells, splitting cells that hit the source cap.",
+    )
+    sweep_parser.add_argument(
+        "--source",
+        required=True,
+        choices=["google_maps", "yelp", "tomtom", "foursquare", "openstreetmap"],
+    )
+    sweep_parser.add_argument("--location", default="", help="Place whose bounding box is swept (e.g. 'Lima, Peru').")
+    sweep_parser.add_argument("--bbox", help="Explicit area instead of the location's box: south,west,north,east.")
+    sweep_parser.add_argument("--query", default="", help="Search text (e.g. dentist).")
+    sweep_parser.add_argument("--niche", default="all")
+    sweep_parser.add_argument("--has-website", default="any", choices=["any", "yes", "no"])
+    sweep_parser.add_argument("--has-phone", default="any", choices=["any", "yes", "no"])
+    sweep_parser.add_argument("--min-rating", default=0.0, type=float)
+    sweep_parser.add_argument("--only-verified", action="store_true")
+    sweep_parser.add_argument("--limit", default=100, type=int, help="Results requested per cell (default: 100).")
+    sweep_parser.add_argument("--cell-size-m", default=3000.0, type=float, help="Initial cell side (default: 3000).")
+    sweep_parser.add_argument("--max-depth", default=3, type=int, help="Times a full cell may be split (default: 3).")
+    sweep_parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Discard the checkpoints of this sweep instead of resuming it.",
+    )
+    sweep_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore cached upstream responses (fresh ones are still stored).",
+    )
+
+    contacts_parser = subparsers.add_parser(
+        "extract-contacts",
+        help="Re-extract phones, emails, URLs/domains, mentions and hashtags from stored messages (backfill).",
+    )
+    contacts_parser.add_argument("--target", help="Only messages of one target (@username, t.me URL or numeric target_id).")
+    contacts_parser.add_argument(
+        "--workers",
+        default=4,
+        type=int,
+        help="Extraction worker processes (default: 4).",
+    )
 
     subparsers.add_parser("stats", help="Show per-target stats and recent scrape runs.")
 
@@ -108,10 +234,160 @@ def main() -> int:
             return 0
 
         if args.command == "export":
-            count = export_messages(storage, args.format, Path(args.out))
+            filters = MessageExportFilters.from_payload(
+                {
+                    "target": args.target,
+                    "from": args.date_from,
+                    "to": args.date_to,
+                    "has_media": args.has_media,
+                    "columns": args.columns,
+                }
+            )
+            if args.shard_by:
+                manifest = export_messages_sharded(
+                    Path(args.db),
+                    args.format,
+                    Path(args.out),
+                    shard_by=args.shard_by,
+                    filters=filters,
+                    workers=args.workers,
+                )
+                print(
+                    f"Exported {manifest['total_rows']} messages into {len(manifest['files'])} files: "
+                    f"{Path(args.out).resolve()}"
+                )
+                return 0
+            count = export_messages(storage, args.format, Path(args.out), filters=filters)
             print(f"Exported {count} messages to: {Path(args.out).resolve()}")
             return 0
 
+        if args.command == "export-records":
+            record_filters = SourceRecordExportFilters.from_payload(
+                {
+                    "source": args.source,
+                    "niche": args.niche,
+                    "location": args.location,
+                    "min_rating": args.min_rating,
+                    "has_website": args.has_website,
+                    "has_phone": args.has_phone,
+                    "include_raw": bool(args.include_raw),
+                }
+            )
+            count = export_source_records(storage, args.format, Path(args.out), filters=record_filters)
+            print(f"Exported {count} source records to: {Path(args.out).resolve()}")
+            return 0
+
+        if args.command == "enrich-records":
+            from .discovery import enrich_source_records
+            from .sources.response_cache import (
+                configure_response_cache,
+                response_cache_bypass,
+                response_cache_from_env,
+            )
+
+            env_path = Path(args.env_file)
+            load_dotenv(env_path if env_path.exists() else None, override=False)
+            configure_response_cache(response_cache_from_env(Path(args.db)))
+            with response_cache_bypass(bool(args.no_cache)):
+                stats = enrich_source_records(storage=storage, source=args.source, limit=max(1, args.limit))
+            print(
+                f"Enriched {stats['enriched']}/{stats['pending']} {args.source} records "
+                f"(failed: {stats['failed']})."
+            )
+            return 0 if stats["failed"] == 0 else 2
+
+        if args.command == "resolve-entities":
+            from .entity_resolution import resolve_records
+
+            stats = resolve_records(storage, storage.get_source_record_ids(args.source))
+            summary = storage.get_entity_summary()
+            print(
+                f"Resolved {stats['records']} records: {stats['new_entities']} new entities, "
+                f"{stats['matched']} matched, {stats['merged_entities']} merged. "
+                f"Total: {summary['entities']} entities ({summary['multi_record_entities']} with several records)."
+            )
+            return 0
+
+        if args.command == "sweep":
+            from .discovery import DiscoveryService
+            from .sources.models import DiscoveryFilters
+            from .sources.response_cache import (
+                configure_response_cache,
+                response_cache_from_env,
+            )
+            from .sweep import run_sweep
+
+            env_path = Path(args.env_file)
+            load_dotenv(env_path if env_path.exists() else None, override=False)
+            configure_response_cache(response_cache_from_env(Path(args.db)))
+            filters = DiscoveryFilters.from_payload(
+                {
+                    "query": args.query,
+                    "niche": args.niche,
+                    "has_website": args.has_website,
+                    "has_phone": args.has_phone,
+                    "location": args.location,
+                    "min_rating": args.min_rating,
+                    "only_verified": bool(args.only_verified),
+                    "limit": args.limit,
+                }
+            )
+            bbox = None
+            if args.bbox:
+                try:
+                    south, west, north, east = (float(value) for value in args.bbox.split(","))
+                except ValueError as exc:
+                    raise ValueError("--bbox must be four numbers: south,west,north,east.") from exc
+                bbox = (south, west, north, east)
+
+            def print_progress(progress: dict) -> None:
+                print(
+                    f"cell {progress['cell_id']}: {progress['cell_results']} results | "
+                    f"cells {progress['cells_done']}/{progress['cells_total']} "
+                    f"(split {progress['cells_split']}, failed {progress['cells_failed']}) | "
+                    f"records {progress['records']}",
+                    flush=True,
+                )
+
+            stats = run_sweep(
+                storage,
+                DiscoveryService(logger),
+                source=args.source,
+                filters=filters,
+                cell_size_m=args.cell_size_m,
+                max_depth=args.max_depth,
+                bbox=bbox,
+                restart=bool(args.restart),
+                use_cache=not args.no_cache,
+                on_progress=print_progress,
+            )
+            print(
+                f"Sweep {stats['sweep_id']} {stats['status']}: {stats['records']} unique {args.source} records "
+                f"({stats['new_records']} new this run) from {stats['cells_done']} cells "
+                f"({stats['cells_resumed']} resumed, {stats['cells_split']} split, "
+                f"{stats['cells_capped']} still full at max depth, {stats['cells_failed']} failed)."
+            )
+            return 0 if stats["status"] == "completed" else 2
+
+        if args.command == "extract-contacts":
+            from .contact_extraction import backfill_message_contacts
+
+            target_ids = None
+            if args.target:
+                # Same target forms as export: numeric target_id, @username, username or t.me URL.
+                target = args.target.strip()
+                if target.lstrip("-").isdigit():
+                    target_ids = [int(target)]
+                else:
+                    target_ids = storage.find_target_ids(normalize_target(target))
+            stats = backfill_message_contacts(storage, target_ids=target_ids, workers=args.workers)
+            kinds = ", ".join(f"{kind}={total}" for kind, total in storage.get_message_contact_summary().items())
+            print(
+                f"Extracted {stats['contacts']} contacts from {stats['messages']} messages "
+                f"in {stats['chunks']} chunks. Stored: {kinds or 'none'}."
+            )
+            return 0
+
         if args.command == "stats":
             _print_stats(storage)
             return 0
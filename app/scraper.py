@@ -4,11 +4,12 @@ import asyncio
 import logging
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, Callable
 
 from telethon.errors import FloodWaitError, RPCError
 
 from .config import AppConfig, normalize_target
+from .contact_extraction import contact_rows
 from .storage import Storage
 from .telegram_client import TelegramClientManager, ResolvedTarget
 from .utils import (
@@ -60,11 +61,13 @@ class TelegramScraper:
         storage: Storage,
         app_config: AppConfig,
         logger: logging.Logger,
+        on_event: Callable[[str, dict[str, Any]], None] | None = None,
     ):
         self.client_manager = client_manager
         self.storage = storage
         self.app_config = app_config
         self.logger = logger
+        self.on_event = on_event
 
     async def run(
         self,
@@ -91,6 +94,7 @@ class TelegramScraper:
                 "Processing target",
                 extra={"event": "target.start", "target": target, "index": index, "total": len(selected_targets)},
             )
+            self._emit("target.start", target=target, index=index, total=len(selected_targets))
             try:
                 resolved = await self.client_manager.resolve_target(target)
                 self.storage.upsert_target(
@@ -121,6 +125,12 @@ class TelegramScraper:
                             "last_message_id": last_message_id,
                         },
                     )
+                    self._emit(
+                        "target.dry_run",
+                        target=target,
+                        target_id=resolved.target_id,
+                        last_message_id=last_message_id,
+                    )
                 else:
                     new_messages, highest_message_id, flood_waits = await self._scrape_target(
                         resolved=resolved,
@@ -146,13 +156,21 @@ class TelegramScraper:
                             "highest_message_id": highest_message_id,
                         },
                     )
-            except Exception:
+                    self._emit(
+                        "target.complete",
+                        target=target,
+                        target_id=resolved.target_id,
+                        new_messages=new_messages,
+                        highest_message_id=highest_message_id,
+                    )
+            except Exception as exc:
                 summary.targets_failed += 1
                 summary.error_count += 1
                 self.logger.exception(
                     "Target processing failed",
                     extra={"event": "target.error", "target": target},
                 )
+                self._emit("target.error", target=target, error=str(exc))
 
             if index < len(selected_targets):
                 await async_random_sleep(
@@ -163,6 +181,14 @@ class TelegramScraper:
         summary.finished_at = utc_now_iso()
         return summary
 
+    def _emit(self, event: str, **payload: Any) -> None:
+        if self.on_event is None:
+            return
+        try:
+            self.on_event(event, payload)
+        except Exception:
+            self.logger.exception("Scrape event callback failed", extra={"event": "scrape.callback_error"})
+
     def _select_targets(self, target_filter: str | None) -> list[str]:
         if not target_filter:
             return list(self.app_config.targets)
@@ -206,6 +232,9 @@ class TelegramScraper:
             if not batch:
                 break
 
+            inserted_before = new_messages
+            inserted_rows: list[dict[str, Any]] = []
+
             for message in batch:
                 message_id = int(getattr(message, "id", 0) or 0)
                 if message_id <= 0:
@@ -255,11 +284,29 @@ class TelegramScraper:
                 inserted = self.storage.insert_message(row)
                 if inserted:
                     new_messages += 1
+                    inserted_rows.append(row)
                     if message_id > highest_message_id:
                         highest_message_id = message_id
 
                 processed += 1
 
+            # One extraction pass and one transaction per batch; only new rows, so reruns add nothing.
+            contacts = 0
+            if inserted_rows:
+                contacts = self.storage.save_message_contacts(contact_rows(inserted_rows))
+                self.storage.bump_change_counter()
+
+            self._emit(
+                "batch.inserted",
+                target=resolved.target_input,
+                target_id=resolved.target_id,
+                batch_size=len(batch),
+                inserted=new_messages - inserted_before,
+                contacts=contacts,
+                new_messages=new_messages,
+                processed=processed,
+            )
+
             if backfill:
                 cursor_id = int(getattr(batch[-1], "id", cursor_id) or cursor_id)
             else:
@@ -329,6 +376,7 @@ class TelegramScraper:
                         "attempt": rpc_attempt + 1,
                     },
                 )
+                self._emit("telegram.flood_wait", sleep_seconds=wait_seconds, attempt=rpc_attempt + 1)
                 await asyncio.sleep(wait_seconds)
             except (RPCError, OSError):
                 rpc_attempt += 1
@@ -0,0 +1,428 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import http.client
+import io
+import json
+import socket
+import ssl
+import threading
+import time
+import urllib.error
+import urllib.parse
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Coroutine, TypeVar
+
+from ..utils import calculate_backoff_seconds
+from .http_utils import (
+    IDEMPOTENT_METHODS,
+    MAX_REDIRECTS,
+    REDIRECT_STATUSES,
+    RETRYABLE_STATUSES,
+    encode_url,
+    json_request_headers,
+    proxy_for,
+    proxy_headers,
+)
+from .response_cache import get_response_cache
+
+
+T = TypeVar("T")
+
+NO_BODY_STATUSES = {204, 304}
+
+
+@dataclass
+class _AsyncConnection:
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+    idle_since: float = 0.0
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+@dataclass
+class AsyncConnectionPool:
+    """Keep-alive HTTP/1.1 connections over ``asyncio`` streams, per (scheme, host, port).
+
+    The asyncio counterpart of :class:`~app.sources.http_utils.ConnectionPool`: same
+    redirects, errors (``urllib.error.HTTPError``/``URLError``, ``asyncio.TimeoutError``) and
+    idle limits and proxies, but a request waiting on the network only parks a coroutine.
+    Streams belong to one event loop, so each loop gets its own pool (:func:`get_async_pool`).
+    """
+
+    max_idle_per_host: int = 8
+    idle_timeout_seconds: float = 60.0
+    connections_opened: int = 0
+    requests_sent: int = 0
+    _idle: dict[tuple[str, str, int], list[_AsyncConnection]] = field(default_factory=dict)
+    _ssl_context: ssl.SSLContext | None = None
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        body: bytes | None = None,
+        headers: dict[str, str] | None = None,
+        timeout_seconds: float = 20,
+    ) -> bytes:
+        for _ in range(MAX_REDIRECTS + 1):
+            status, reason, response_headers, payload = await self._send(
+                method, url, body=body, headers=headers or {}, timeout_seconds=timeout_seconds
+            )
+            location = response_headers.get("Location")
+            if status in REDIRECT_STATUSES and location:
+                url = urllib.parse.urljoin(url, location)
+                if status == 303 or (status in {301, 302} and method == "POST"):
+                    method, body = "GET", None
+                continue
+            if status >= 400:
+                raise urllib.error.HTTPError(url, status, reason, response_headers, io.BytesIO(payload))
+            return payload
+        raise urllib.error.URLError(f"Too many redirects for {url}")
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "connections_opened": self.connections_opened,
+            "requests_sent": self.requests_sent,
+            "idle_connections": sum(len(items) for items in self._idle.values()),
+        }
+
+    def close(self) -> None:
+        idle, self._idle = self._idle, {}
+        for items in idle.values():
+            for connection in items:
+                connection.close()
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        *,
+        body: bytes | None,
+        headers: dict[str, str],
+        timeout_seconds: float,
+    ) -> tuple[int, str, http.client.HTTPMessage, bytes]:
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in {"http", "https"} or not parts.hostname:
+            raise urllib.error.URLError(f"Unsupported URL: {url}")
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+        proxy = proxy_for(parts.scheme, parts.hostname)
+        if proxy is not None and parts.scheme == "http":
+            target = urllib.parse.urlunsplit(parts._replace(fragment=""))
+            headers = {**headers, **proxy_headers(proxy)}
+        request_bytes = _serialize_request(method, target, key, body=body, headers=headers)
+
+        while True:
+            connection, reused = self._acquire(key)
+
+            async def exchange() -> tuple[int, str, http.client.HTTPMessage, bytes, bool]:
+                nonlocal connection
+                if connection is None:
+                    connection = await self._connect(key, proxy)
+                connection.writer.write(request_bytes)
+                await connection.writer.drain()
+                return await _read_response(connection.reader, method)
+
+            try:
+                # wait_for rather than asyncio.timeout(): the project supports Python 3.10.
+                status, reason, response_headers, payload, will_close = await asyncio.wait_for(
+                    exchange(), timeout_seconds
+                )
+            except asyncio.TimeoutError:
+                if connection is not None:
+                    connection.close()
+                raise
+            except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError) as exc:
+                if connection is not None:
+                    connection.close()
+                # A pooled socket may have been closed by the server while idle: retry once fresh,
+                # unless the server may already have acted on a non-idempotent request.
+                if reused and method in IDEMPOTENT_METHODS:
+                    continue
+                raise urllib.error.URLError(exc) from exc
+            except BaseException:
+                # Cancelled mid-exchange: the stream may hold half a response, never reuse it.
+                if connection is not None:
+                    connection.close()
+                raise
+
+            self.requests_sent += 1
+            if will_close:
+                connection.close()
+            else:
+                self._release(key, connection)
+            return status, reason, response_headers, payload
+
+    def _acquire(self, key: tuple[str, str, int]) -> tuple[_AsyncConnection | None, bool]:
+        """An idle connection for ``key``, or ``(None, False)`` when a new one must be opened."""
+        now = time.monotonic()
+        items = self._idle.get(key, [])
+        while items:
+            connection = items.pop()
+            if now - connection.idle_since <= self.idle_timeout_seconds and not connection.reader.at_eof():
+                return connection, True
+            connection.close()
+        return None, False
+
+    async def _connect(
+        self, key: tuple[str, str, int], proxy: urllib.parse.SplitResult | None
+    ) -> _AsyncConnection:
+        scheme, host, port = key
+        self.connections_opened += 1
+        if scheme == "https" and self._ssl_context is None:
+            self._ssl_context = ssl.create_default_context()
+        if proxy is None:
+            if scheme == "https":
+                reader, writer = await asyncio.open_connection(
+                    host, port, ssl=self._ssl_context, server_hostname=host
+                )
+            else:
+                reader, writer = await asyncio.open_connection(host, port)
+            return _AsyncConnection(reader=reader, writer=writer)
+
+        if scheme == "https":
+            # TLS is layered over the tunnel's socket (StreamWriter.start_tls needs Python 3.11).
+            tunnel = await _open_tunnel(host, port, proxy)
+            try:
+                reader, writer = await asyncio.open_connection(
+                    sock=tunnel, ssl=self._ssl_context, server_hostname=host
+                )
+            except BaseException:
+                tunnel.close()
+                raise
+        else:
+            reader, writer = await asyncio.open_connection(proxy.hostname, proxy.port or 80)
+        return _AsyncConnection(reader=reader, writer=writer)
+
+    def _release(self, key: tuple[str, str, int], connection: _AsyncConnection) -> None:
+        items = self._idle.setdefault(key, [])
+        if len(items) < self.max_idle_per_host:
+            connection.idle_since = time.monotonic()
+            items.append(connection)
+            return
+        connection.close()
+
+
+_POOLS: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncConnectionPool] = weakref.WeakKeyDictionary()
+_POOLS_LOCK = threading.Lock()
+
+
+def get_async_pool() -> AsyncConnectionPool:
+    """The running loop's pool; must be called from a coroutine."""
+    loop = asyncio.get_running_loop()
+    with _POOLS_LOCK:
+        pool = _POOLS.get(loop)
+        if pool is None:
+            pool = AsyncConnectionPool()
+            _POOLS[loop] = pool
+        return pool
+
+
+async def async_http_request(
+    method: str,
+    url: str,
+    *,
+    body: bytes | None = None,
+    headers: dict[str, str] | None = None,
+    timeout_seconds: float = 20,
+) -> bytes:
+    return await get_async_pool().request(method, url, body=body, headers=headers, timeout_seconds=timeout_seconds)
+
+
+async def async_http_get_json(
+    *,
+    url: str,
+    params: dict[str, Any] | None = None,
+    headers: dict[str, str] | None = None,
+    timeout_seconds: int = 20,
+    retries: int = 3,
+) -> Any:
+    """Asyncio version of ``http_get_json``: same response cache, retries and errors.
+
+    Cache lookups and writes are SQLite calls that can wait on another writer's lock,
+    so they run on a worker thread instead of stalling every request on the shared loop.
+    """
+    encoded_url = encode_url(url, params)
+    request_headers = json_request_headers(headers)
+
+    cache = get_response_cache()
+    if cache is not None and not cache.ttl_for(encoded_url):
+        cache = None
+    if cache is not None:
+        hit, cached = await asyncio.to_thread(cache.get, encoded_url)
+        if hit:
+            return cached
+
+    for attempt in range(1, retries + 1):
+        try:
+            payload = await async_http_request(
+                "GET", encoded_url, headers=request_headers, timeout_seconds=timeout_seconds
+            )
+            decoded = json.loads(payload.decode("utf-8"))
+            if cache is not None:
+                await asyncio.to_thread(cache.put, encoded_url, decoded)
+            return decoded
+        except urllib.error.HTTPError as exc:
+            status = getattr(exc, "code", 0)
+            if attempt >= retries or status not in RETRYABLE_STATUSES:
+                raise
+            await asyncio.sleep(calculate_backoff_seconds(attempt=attempt))
+        except (urllib.error.URLError, asyncio.TimeoutError):
+            if attempt >= retries:
+                raise
+            await asyncio.sleep(calculate_backoff_seconds(attempt=attempt))
+
+    return {}
+
+
+_IO_LOOP: asyncio.AbstractEventLoop | None = None
+_IO_LOOP_LOCK = threading.Lock()
+
+
+def run_sync(coroutine: Coroutine[Any, Any, T]) -> T:
+    """Run ``coroutine`` on the shared discovery I/O loop and block until it returns.
+
+    Backs the synchronous source and discovery APIs: every blocking caller shares one
+    loop thread (and its keep-alive pool) instead of sleeping on sockets itself. The
+    caller's context variables (e.g. a response-cache bypass) carry over to the loop.
+    """
+    loop = io_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coroutine.close()
+        raise RuntimeError("run_sync() called from the discovery I/O loop; await the coroutine instead.")
+    return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+
+def submit(coroutine: Coroutine[Any, Any, T]) -> concurrent.futures.Future[T]:
+    """Schedule ``coroutine`` on the shared discovery I/O loop without waiting for it."""
+    return asyncio.run_coroutine_threadsafe(coroutine, io_loop())
+
+
+def io_loop() -> asyncio.AbstractEventLoop:
+    """The shared discovery I/O loop, started on its own daemon thread on first use."""
+    global _IO_LOOP
+    with _IO_LOOP_LOCK:
+        if _IO_LOOP is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="discovery-io-loop", daemon=True)
+            thread.start()
+            _IO_LOOP = loop
+        return _IO_LOOP
+
+
+def _serialize_request(
+    method: str,
+    target: str,
+    key: tuple[str, str, int],
+    *,
+    body: bytes | None,
+    headers: dict[str, str],
+) -> bytes:
+    scheme, host, port = key
+    host_header = f"[{host}]" if ":" in host else host
+    if port != (443 if scheme == "https" else 80):
+        host_header = f"{host_header}:{port}"
+    # Same implicit headers http.client adds; explicit ones win.
+    merged = {"Host": host_header, "Accept-Encoding": "identity"}
+    if body is not None or method in {"POST", "PUT", "PATCH"}:
+        merged["Content-Length"] = str(len(body or b""))
+    lowered = {name.lower() for name in headers}
+    merged = {name: value for name, value in merged.items() if name.lower() not in lowered}
+    merged.update(headers)
+    lines = [f"{method} {target} HTTP/1.1", *(f"{name}: {value}" for name, value in merged.items())]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (body or b"")
+
+
+async def _open_tunnel(host: str, port: int, proxy: urllib.parse.SplitResult) -> socket.socket:
+    """A non-blocking socket to ``host:port`` through the proxy's ``CONNECT`` tunnel."""
+    loop = asyncio.get_running_loop()
+    infos = await loop.getaddrinfo(proxy.hostname, proxy.port or 80, type=socket.SOCK_STREAM)
+    if not infos:
+        raise OSError(f"Could not resolve proxy {proxy.hostname}")
+    family, kind, protocol, _, address = infos[0]
+    sock = socket.socket(family, kind, protocol)
+    sock.setblocking(False)
+    try:
+        await loop.sock_connect(sock, address)
+        authority = f"[{host}]:{port}" if ":" in host else f"{host}:{port}"
+        lines = [f"CONNECT {authority} HTTP/1.1", f"Host: {authority}"]
+        lines.extend(f"{name}: {value}" for name, value in proxy_headers(proxy).items())
+        await loop.sock_sendall(sock, ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        response = b""
+        while b"\r\n\r\n" not in response:
+            chunk = await loop.sock_recv(sock, 4096)
+            if not chunk or len(response) > 65536:
+                break
+            response += chunk
+        status_line = response.split(b"\r\n", 1)[0].decode("latin-1")
+        status_text = status_line.split(" ", 2)[1] if " " in status_line else ""
+        if status_text != "200":
+            raise OSError(f"Proxy CONNECT to {authority} failed: {status_line.strip() or 'no response'}")
+    except BaseException:
+        sock.close()
+        raise
+    return sock
+
+
+async def _read_response(
+    reader: asyncio.StreamReader, method: str
+) -> tuple[int, str, http.client.HTTPMessage, bytes, bool]:
+    """Parse one response: ``(status, reason, headers, body, will_close)``."""
+    while True:
+        status_line = (await reader.readline()).decode("latin-1")
+        if not status_line:
+            raise ConnectionResetError("Connection closed before the response.")
+        version, _, rest = status_line.strip().partition(" ")
+        status_text, _, reason = rest.partition(" ")
+        if not version.startswith("HTTP/") or not status_text.isdigit():
+            raise ValueError(f"Malformed status line: {status_line!r}")
+        status = int(status_text)
+        header_lines = []
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            header_lines.append(line)
+        headers = http.client.parse_headers(io.BytesIO(b"".join(header_lines) + b"\r\n"))
+        # Interim 1xx responses (100 Continue) precede the real one.
+        if status >= 200:
+            break
+
+    connection_tokens = {token.strip().lower() for token in (headers.get("Connection") or "").split(",")}
+    will_close = "close" in connection_tokens or (version == "HTTP/1.0" and "keep-alive" not in connection_tokens)
+
+    if method == "HEAD" or status in NO_BODY_STATUSES:
+        payload = b""
+    elif "chunked" in (headers.get("Transfer-Encoding") or "").lower():
+        payload = await _read_chunked(reader)
+    elif headers.get("Content-Length") is not None:
+        payload = await reader.readexactly(int(headers["Content-Length"]))
+    else:
+        payload = await reader.read()
+        will_close = True
+    return status, reason.strip(), headers, payload, will_close
+
+
+async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+    chunks = []
+    while True:
+        size_line = await reader.readline()
+        if not size_line:
+            raise asyncio.IncompleteReadError(b"".join(chunks), None)
+        size = int(size_line.split(b";", 1)[0].strip(), 16)
+        if size == 0:
+            # Optional trailers end with an empty line.
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            return b"".join(chunks)
+        chunks.append(await reader.readexactly(size))
+        await reader.readexactly(2)
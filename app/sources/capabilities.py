@@ -3,6 +3,8 @@ from __future__ import annotations
 import os
 from typing import Any
 
+from .registry import SOURCE_REGISTRY
+
 
 SOURCE_CAPABILITIES: dict[str, dict[str, Any]] = {
     "telegram": {
@@ -12,36 +14,16 @@ SOURCE_CAPABILITIES: dict[str, dict[str, Any]] = {
         "supports_verified_filter": False,
         "supports_has_website_filter": False,
         "supports_has_phone_filter": False,
+        "supports_enrich": False,
         "credential_required": False,
         "credential_param": None,
         "credential_env": None,
         "credential_label": None,
+        "supports_point_search": False,
+        "max_results_per_search": None,
     },
-    "google_maps": {
-        "supports_discovery_api": True,
-        "requires_location": False,
-        "supports_rating_filter": True,
-        "supports_verified_filter": True,
-        "supports_has_website_filter": True,
-        "supports_has_phone_filter": True,
-        "credential_required": True,
-        "credential_param": "api_key",
-        "credential_env": "GOOGLE_MAPS_API_KEY",
-        "credential_label": "Google Maps API Key",
-    },
-    "reddit": {
-        "supports_discovery_api": True,
-        "requires_location": False,
-        "supports_rating_filter": False,
-        "supports_verified_filter": True,
-        "supports_has_website_filter": True,
-        "supports_has_phone_filter": True,
-        "credential_required": False,
-        "credential_param": "user_agent",
-        "credential_env": "REDDIT_USER_AGENT",
-        "credential_label": "Reddit User-Agent",
-        "oauth_envs": ["REDDIT_CLIENT_ID", "REDDIT_CLIENT_SECRET"],
-    },
+    # Discovery connectors declare their capabilities in the source registry.
+    **{name: dict(spec.capabilities) for name, spec in SOURCE_REGISTRY.items()},
 }
 
 
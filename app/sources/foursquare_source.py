@@ -4,12 +4,13 @@ import json
 import os
 from typing import Any
 
+from .async_http import async_http_get_json, run_sync
 from .filter_utils import clean, location_text, passes_presence_filter, safe_float
-from .http_utils import http_get_json
-from .models import DiscoveryFilters, SourceRecord
+from .models import DiscoveryFilters, ScanStats, SourceRecord
 
 
 FOURSQUARE_SEARCH_URL = "https://api.foursquare.com/v3/places/search"
+FOURSQUARE_MAX_RADIUS_M = 100000
 
 
 class FoursquareSource:
@@ -17,17 +18,24 @@ class FoursquareSource:
         self.api_key = api_key or os.getenv("FOURSQUARE_API_KEY")
         if not self.api_key:
             raise ValueError("Missing FOURSQUARE_API_KEY in environment.")
+        self.last_scan: ScanStats | None = None
 
     def search(self, filters: DiscoveryFilters) -> list[SourceRecord]:
+        return run_sync(self.asearch(filters))
+
+    async def asearch(self, filters: DiscoveryFilters) -> list[SourceRecord]:
         query = filters.merged_query() or "business"
         params: dict[str, Any] = {
             "query": query,
             "limit": min(filters.limit, 50),
         }
-        if filters.location:
+        if filters.has_point():
+            params["ll"] = f"{filters.latitude},{filters.longitude}"
+            params["radius"] = int(min(filters.radius_m or FOURSQUARE_MAX_RADIUS_M, FOURSQUARE_MAX_RADIUS_M))
+        elif filters.location:
             params["near"] = filters.location
 
-        payload = http_get_json(
+        payload = await async_http_get_json(
             url=FOURSQUARE_SEARCH_URL,
             params=params,
             headers={
@@ -39,13 +47,22 @@ class FoursquareSource:
         results = payload.get("results") or []
 
         records: list[SourceRecord] = []
+        scanned = 0
         for item in results:
+            scanned += 1
             record = self._to_record(item=item, filters=filters)
             if record is None:
                 continue
             records.append(record)
             if len(records) >= filters.limit:
                 break
+        # Single request: a full page means Foursquare had more than it returned.
+        self.last_scan = ScanStats(
+            pages=1,
+            scanned=scanned,
+            accepted=len(records),
+            truncated=scanned < len(results) or len(results) >= params["limit"],
+        )
         return records
 
     def _to_record(self, *, item: dict[str, Any], filters: DiscoveryFilters) -> SourceRecord | None:
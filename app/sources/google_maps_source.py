@@ -1,30 +1,55 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import os
-import random
 import time
+from collections import deque
 from typing import Any
 
+from .async_http import async_http_get_json, run_sync
 from .filter_utils import passes_presence_filter, safe_int
-from .http_utils import http_get_json
-from .models import DiscoveryFilters, SourceRecord
+from .models import DiscoveryFilters, ScanStats, SourceRecord
+from .rate_limit import shared_rate_limiter
 
 
 TEXT_SEARCH_URL = "https://maps.googleapis.com/maps/api/place/textsearch/json"
 DETAILS_URL = "https://maps.googleapis.com/maps/api/place/details/json"
+# Google requires a short wait before next_page_token becomes valid.
+PAGE_TOKEN_DELAY_SECONDS = 2.0
+GOOGLE_MAX_RADIUS_M = 50000
 
 
 class GoogleMapsSource:
-    def __init__(self, api_key: str | None = None):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        *,
+        details_concurrency: int | None = None,
+        details_qps: float | None = None,
+    ):
         self.api_key = api_key or os.getenv("GOOGLE_MAPS_API_KEY")
         if not self.api_key:
             raise ValueError("Missing GOOGLE_MAPS_API_KEY in environment.")
+        self.details_concurrency = max(
+            1, details_concurrency or int(os.getenv("GOOGLE_MAPS_DETAILS_CONCURRENCY", "4"))
+        )
+        qps = details_qps if details_qps is not None else float(os.getenv("GOOGLE_MAPS_DETAILS_QPS", "5"))
+        # Shared per API key: concurrent searches draw from one details budget.
+        self.details_limiter = shared_rate_limiter(f"google_maps.details:{self.api_key}", qps)
+        self.last_scan: ScanStats | None = None
 
     def search(self, filters: DiscoveryFilters) -> list[SourceRecord]:
+        return run_sync(self.asearch(filters))
+
+    async def asearch(self, filters: DiscoveryFilters) -> list[SourceRecord]:
         query = filters.merged_query() or "business"
         results: list[SourceRecord] = []
         page_token: str | None = None
+        token_ready_at = 0.0
+        details_slots = asyncio.Semaphore(self.details_concurrency)
+        scan = ScanStats()
+        left_over = False
 
         while len(results) < filters.limit:
             params: dict[str, Any] = {
@@ -32,62 +57,117 @@ class GoogleMapsSource:
                 "query": query,
                 "language": "en",
             }
+            if filters.has_point():
+                params["location"] = f"{filters.latitude},{filters.longitude}"
+                params["radius"] = int(min(filters.radius_m or GOOGLE_MAX_RADIUS_M, GOOGLE_MAX_RADIUS_M))
             if page_token:
-                # Google requires a short wait before next_page_token becomes valid.
-                time.sleep(2)
+                # The token clock started when the previous page arrived; its details
+                # calls have been running meanwhile, so only the remainder is slept.
+                await asyncio.sleep(max(0.0, token_ready_at - time.monotonic()))
                 params["pagetoken"] = page_token
 
-            payload = http_get_json(url=TEXT_SEARCH_URL, params=params, retries=4)
+            payload = await async_http_get_json(url=TEXT_SEARCH_URL, params=params, retries=4)
             status = str(payload.get("status", "UNKNOWN"))
             if status not in {"OK", "ZERO_RESULTS"}:
                 if status == "INVALID_REQUEST" and page_token:
-                    time.sleep(2)
+                    token_ready_at = time.monotonic() + PAGE_TOKEN_DELAY_SECONDS
                     continue
                 raise ValueError(f"Google Maps API error: {status}")
 
-            for item in payload.get("results", []):
-                record = self._to_record(item=item, filters=filters)
-                if record is None:
-                    continue
-                results.append(record)
-                if len(results) >= filters.limit:
-                    break
-
             page_token = payload.get("next_page_token")
+            token_ready_at = time.monotonic() + PAGE_TOKEN_DELAY_SECONDS
+            scan.pages += 1
+            scan.scanned += len(payload.get("results", []))
+
+            # Cheap filters run on text-search data, so rejected places never cost a details call.
+            items = [
+                item
+                for item in payload.get("results", [])
+                if item.get("place_id") and self._passes_text_search_filters(item, filters)
+            ]
+            with_details = needs_details(filters)
+            # Paid details calls run ahead of consumption, but never more than the records still
+            # needed: when the limit is reached, no scheduled call is left unused.
+            window: deque[asyncio.Task] = deque()
+            scheduled = 0
+            try:
+                for index, item in enumerate(items):
+                    details = None
+                    if with_details:
+                        while scheduled < len(items) and len(window) < filters.limit - len(results):
+                            place_id = str(items[scheduled]["place_id"])
+                            window.append(asyncio.create_task(self._fetch_details(place_id, details_slots)))
+                            scheduled += 1
+                        details = await window.popleft()
+                    record = self._to_record(item=item, details=details, filters=filters)
+                    if record is None:
+                        continue
+                    results.append(record)
+                    if len(results) >= filters.limit:
+                        left_over = index + 1 < len(items)
+                        break
+            finally:
+                # Error or cancellation: drop details calls that have not finished yet.
+                _discard(list(window))
+
             if not page_token:
                 break
 
+        scan.accepted = len(results)
+        scan.truncated = left_over or bool(page_token)
+        self.last_scan = scan
         return results[: filters.limit]
 
-    def _to_record(self, *, item: dict[str, Any], filters: DiscoveryFilters) -> SourceRecord | None:
+    def fetch_details_many(self, place_ids: list[str]) -> list[dict[str, Any] | None]:
+        return run_sync(self.afetch_details_many(place_ids))
+
+    async def afetch_details_many(self, place_ids: list[str]) -> list[dict[str, Any] | None]:
+        """Details for each place id, in order, within the same concurrency and QPS budget as search.
+
+        A place whose call failed maps to ``None`` instead of aborting the batch.
+        """
+        details_slots = asyncio.Semaphore(self.details_concurrency)
+
+        async def fetch(place_id: str) -> dict[str, Any] | None:
+            try:
+                return await self._fetch_details(place_id, details_slots)
+            except Exception:
+                return None
+
+        return list(await asyncio.gather(*(fetch(place_id) for place_id in place_ids)))
+
+    def _passes_text_search_filters(self, item: dict[str, Any], filters: DiscoveryFilters) -> bool:
+        rating_raw = item.get("rating")
+        if rating_raw is not None and float(rating_raw) < filters.min_rating:
+            return False
+        if filters.only_verified and not _is_operational(item):
+            return False
+        return True
+
+    def _to_record(
+        self, *, item: dict[str, Any], details: dict[str, Any] | None, filters: DiscoveryFilters
+    ) -> SourceRecord | None:
         place_id = str(item.get("place_id") or "")
         if not place_id:
             return None
 
-        details = self._fetch_details(place_id)
-        website = details.get("website")
-        phone = details.get("formatted_phone_number")
+        # details is None when no filter or requested field needed them (see needs_details).
+        website = details.get("website") if details is not None else None
+        phone = details.get("formatted_phone_number") if details is not None else None
+        if details is not None:
+            if not passes_presence_filter(filters.has_website, website):
+                return None
+            if not passes_presence_filter(filters.has_phone, phone):
+                return None
 
         rating_raw = item.get("rating")
         rating = float(rating_raw) if rating_raw is not None else None
-        if rating is not None and rating < filters.min_rating:
-            return None
-
-        if not passes_presence_filter(filters.has_website, website):
-            return None
-        if not passes_presence_filter(filters.has_phone, phone):
-            return None
-
-        is_verified = str(item.get("business_status", "")).upper() == "OPERATIONAL"
-        if filters.only_verified and not is_verified:
-            return None
-
         raw = {"text_search": item, "details": details}
         return SourceRecord(
             source="google_maps",
             external_id=place_id,
             name=str(item.get("name") or "unknown"),
-            url=details.get("url"),
+            url=(details or {}).get("url") or place_url(place_id),
             description=str(item.get("types") or ""),
             website=website,
             phone=phone,
@@ -95,22 +175,60 @@ class GoogleMapsSource:
             review_count=safe_int(item.get("user_ratings_total")),
             location=str(item.get("formatted_address") or ""),
             niche=filters.niche,
-            is_verified=is_verified,
+            is_verified=_is_operational(item),
             raw_json=json.dumps(raw, ensure_ascii=False),
         )
 
-    def _fetch_details(self, place_id: str) -> dict[str, Any]:
-        time.sleep(random.uniform(0.1, 0.35))
-        payload = http_get_json(
-            url=DETAILS_URL,
-            params={
-                "key": self.api_key,
-                "place_id": place_id,
-                "fields": "url,website,formatted_phone_number,name",
-            },
-            retries=4,
-        )
+    async def _fetch_details(self, place_id: str, details_slots: asyncio.Semaphore) -> dict[str, Any]:
+        async with details_slots:
+            await self.details_limiter.aacquire()
+            payload = await async_http_get_json(
+                url=DETAILS_URL,
+                params={
+                    "key": self.api_key,
+                    "place_id": place_id,
+                    "fields": "url,website,formatted_phone_number,name",
+                },
+                retries=4,
+            )
         status = str(payload.get("status", "UNKNOWN"))
         if status not in {"OK", "ZERO_RESULTS"}:
             return {}
         return payload.get("result", {}) or {}
+
+
+def needs_details(filters: DiscoveryFilters) -> bool:
+    """Place Details is billed per call: only fetch it when a filter or the caller needs contacts."""
+    return filters.enrich or filters.has_website != "any" or filters.has_phone != "any"
+
+
+def place_url(place_id: str) -> str:
+    return f"https://www.google.com/maps/place/?q=place_id:{place_id}"
+
+
+def apply_details(raw_json: str | None, details: dict[str, Any]) -> dict[str, Any]:
+    """Storage fields for a stored record once its deferred details have been fetched."""
+    try:
+        raw = json.loads(raw_json or "{}")
+    except ValueError:
+        raw = {}
+    raw["details"] = details
+    return {
+        "url": details.get("url"),
+        "website": details.get("website"),
+        "phone": details.get("formatted_phone_number"),
+        "raw_json": json.dumps(raw, ensure_ascii=False),
+    }
+
+
+def _discard(tasks: list[asyncio.Task]) -> None:
+    for task in tasks:
+        if not task.done():
+            task.cancel()
+        elif not task.cancelled():
+            # Mark failures of unused tasks as retrieved so asyncio does not log them.
+            task.exception()
+
+
+def _is_operational(item: dict[str, Any]) -> bool:
+    return str(item.get("business_status", "")).upper() == "OPERATIONAL"
@@ -1,13 +1,198 @@
 from __future__ import annotations
 
+import base64
+import http.client
+import io
 import json
+import ssl
+import threading
 import time
 import urllib.error
 import urllib.parse
-import urllib.request
+from dataclasses import dataclass, field
 from typing import Any
 
 from ..utils import calculate_backoff_seconds
+from .response_cache import get_response_cache
+
+
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+MAX_REDIRECTS = 5
+# Methods safe to replay when a pooled keep-alive socket turns out to be dead.
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"}
+
+
+@dataclass
+class _IdleConnection:
+    connection: http.client.HTTPConnection
+    idle_since: float
+
+
+@dataclass
+class ConnectionPool:
+    """Keep-alive ``http.client`` connections shared per (scheme, host, port).
+
+    Connections are checked out exclusively, so the pool is safe to use from several
+    threads; at most ``max_idle_per_host`` idle sockets are kept per host. Like
+    ``urlopen``, requests go through ``HTTP(S)_PROXY`` unless ``NO_PROXY`` matches.
+    """
+
+    max_idle_per_host: int = 8
+    idle_timeout_seconds: float = 60.0
+    connections_opened: int = 0
+    requests_sent: int = 0
+    _idle: dict[tuple[str, str, int], list[_IdleConnection]] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+    # Loading the CA bundle takes ~30 ms, so it happens on the first https connection, not at import.
+    _ssl_context: ssl.SSLContext | None = None
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        body: bytes | None = None,
+        headers: dict[str, str] | None = None,
+        timeout_seconds: float = 20,
+    ) -> bytes:
+        """Send a request and return the body; errors mirror ``urllib.request.urlopen``."""
+        for _ in range(MAX_REDIRECTS + 1):
+            status, reason, response_headers, payload = self._send(
+                method, url, body=body, headers=headers or {}, timeout_seconds=timeout_seconds
+            )
+            location = response_headers.get("Location")
+            if status in REDIRECT_STATUSES and location:
+                url = urllib.parse.urljoin(url, location)
+                if status == 303 or (status in {301, 302} and method == "POST"):
+                    method, body = "GET", None
+                continue
+            if status >= 400:
+                raise urllib.error.HTTPError(url, status, reason, response_headers, io.BytesIO(payload))
+            return payload
+        raise urllib.error.URLError(f"Too many redirects for {url}")
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            idle = sum(len(items) for items in self._idle.values())
+        return {
+            "connections_opened": self.connections_opened,
+            "requests_sent": self.requests_sent,
+            "idle_connections": idle,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for items in idle.values():
+            for item in items:
+                item.connection.close()
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        *,
+        body: bytes | None,
+        headers: dict[str, str],
+        timeout_seconds: float,
+    ) -> tuple[int, str, http.client.HTTPMessage, bytes]:
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in {"http", "https"} or not parts.hostname:
+            raise urllib.error.URLError(f"Unsupported URL: {url}")
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+        proxy = proxy_for(parts.scheme, parts.hostname)
+        if proxy is not None and parts.scheme == "http":
+            # Plain HTTP through a proxy: absolute-form target on the proxy connection.
+            target = urllib.parse.urlunsplit(parts._replace(fragment=""))
+            headers = {**headers, **proxy_headers(proxy)}
+
+        while True:
+            connection, reused = self._acquire(key, timeout_seconds, proxy)
+            try:
+                connection.request(method, target, body=body, headers=headers)
+                response = connection.getresponse()
+                payload = response.read()
+            except TimeoutError:
+                connection.close()
+                raise
+            except (http.client.HTTPException, OSError) as exc:
+                connection.close()
+                # A pooled socket may have been closed by the server while idle: retry once fresh,
+                # unless the server may already have acted on a non-idempotent request.
+                if reused and method in IDEMPOTENT_METHODS:
+                    continue
+                raise urllib.error.URLError(exc) from exc
+
+            with self._lock:
+                self.requests_sent += 1
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(key, connection)
+            return response.status, response.reason, response.headers, payload
+
+    def _acquire(
+        self, key: tuple[str, str, int], timeout_seconds: float, proxy: urllib.parse.SplitResult | None
+    ) -> tuple[http.client.HTTPConnection, bool]:
+        now = time.monotonic()
+        with self._lock:
+            items = self._idle.get(key, [])
+            while items:
+                item = items.pop()
+                if now - item.idle_since <= self.idle_timeout_seconds:
+                    item.connection.timeout = timeout_seconds
+                    if item.connection.sock is not None:
+                        item.connection.sock.settimeout(timeout_seconds)
+                    return item.connection, True
+                item.connection.close()
+            self.connections_opened += 1
+            if key[0] == "https" and self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            ssl_context = self._ssl_context
+
+        scheme, host, port = key
+        if proxy is not None:
+            proxy_host, proxy_port = proxy.hostname, proxy.port or 80
+            if scheme == "https":
+                connection = http.client.HTTPSConnection(
+                    proxy_host, proxy_port, timeout=timeout_seconds, context=ssl_context
+                )
+                connection.set_tunnel(host, port, headers=proxy_headers(proxy))
+                return connection, False
+            return http.client.HTTPConnection(proxy_host, proxy_port, timeout=timeout_seconds), False
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=timeout_seconds, context=ssl_context), False
+        return http.client.HTTPConnection(host, port, timeout=timeout_seconds), False
+
+    def _release(self, key: tuple[str, str, int], connection: http.client.HTTPConnection) -> None:
+        with self._lock:
+            items = self._idle.setdefault(key, [])
+            if len(items) < self.max_idle_per_host:
+                items.append(_IdleConnection(connection=connection, idle_since=time.monotonic()))
+                return
+        connection.close()
+
+
+_POOL = ConnectionPool()
+
+
+def get_connection_pool() -> ConnectionPool:
+    return _POOL
+
+
+def http_request(
+    method: str,
+    url: str,
+    *,
+    body: bytes | None = None,
+    headers: dict[str, str] | None = None,
+    timeout_seconds: float = 20,
+) -> bytes:
+    return _POOL.request(method, url, body=body, headers=headers, timeout_seconds=timeout_seconds)
 
 
 def http_get_json(
@@ -18,28 +203,25 @@ def http_get_json(
     timeout_seconds: int = 20,
     retries: int = 3,
 ) -> Any:
-    encoded_url = url
-    if params:
-        query = urllib.parse.urlencode(params)
-        separator = "&" if "?" in url else "?"
-        encoded_url = f"{url}{separator}{query}"
+    encoded_url = encode_url(url, params)
+    request_headers = json_request_headers(headers)
 
-    request_headers = {
-        "Accept": "application/json",
-        "User-Agent": "proyectos-sass-scraper/1.0",
-    }
-    if headers:
-        request_headers.update(headers)
+    cache = get_response_cache()
+    if cache is not None:
+        hit, cached = cache.get(encoded_url)
+        if hit:
+            return cached
 
     for attempt in range(1, retries + 1):
         try:
-            request = urllib.request.Request(encoded_url, headers=request_headers, method="GET")
-            with urllib.request.urlopen(request, timeout=timeout_seconds) as response:
-                payload = response.read().decode("utf-8")
-                return json.loads(payload)
+            payload = http_request("GET", encoded_url, headers=request_headers, timeout_seconds=timeout_seconds)
+            decoded = json.loads(payload.decode("utf-8"))
+            if cache is not None:
+                cache.put(encoded_url, decoded)
+            return decoded
         except urllib.error.HTTPError as exc:
             status = getattr(exc, "code", 0)
-            is_retryable = status in {408, 429, 500, 502, 503, 504}
+            is_retryable = status in RETRYABLE_STATUSES
             if attempt >= retries or not is_retryable:
                 raise
             time.sleep(calculate_backoff_seconds(attempt=attempt))
@@ -49,3 +231,40 @@ def http_get_json(
             time.sleep(calculate_backoff_seconds(attempt=attempt))
 
     return {}
+
+
+def proxy_for(scheme: str, host: str) -> urllib.parse.SplitResult | None:
+    """The environment proxy ``urlopen`` would use for ``scheme://host``, or ``None``."""
+    # Deferred: urllib.request is only needed once a connection is opened, not at import.
+    import urllib.request
+
+    proxy = urllib.request.getproxies().get(scheme)
+    if not proxy or urllib.request.proxy_bypass(host):
+        return None
+    parts = urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+    return parts if parts.hostname else None
+
+
+def proxy_headers(proxy: urllib.parse.SplitResult) -> dict[str, str]:
+    """``Proxy-Authorization`` for credentials embedded in the proxy URL."""
+    if not proxy.username:
+        return {}
+    credentials = f"{urllib.parse.unquote(proxy.username)}:{urllib.parse.unquote(proxy.password or '')}"
+    return {"Proxy-Authorization": f"Basic {base64.b64encode(credentials.encode('utf-8')).decode('ascii')}"}
+
+
+def encode_url(url: str, params: dict[str, Any] | None) -> str:
+    if not params:
+        return url
+    separator = "&" if "?" in url else "?"
+    return f"{url}{separator}{urllib.parse.urlencode(params)}"
+
+
+def json_request_headers(headers: dict[str, str] | None) -> dict[str, str]:
+    request_headers = {
+        "Accept": "application/json",
+        "User-Agent": "proyectos-sass-scraper/1.0",
+    }
+    if headers:
+        request_headers.update(headers)
+    return request_headers
@@ -17,6 +17,11 @@ class DiscoveryFilters:
     min_rating: float
     only_verified: bool
     limit: int
+    enrich: bool = False
+    # A search circle set by area sweeps; sources that support it search here instead of geocoding location.
+    latitude: float | None = None
+    longitude: float | None = None
+    radius_m: float | None = None
 
     @classmethod
     def from_payload(cls, payload: dict[str, Any]) -> "DiscoveryFilters":
@@ -26,6 +31,7 @@ class DiscoveryFilters:
         has_phone = str(payload.get("has_phone", "any")).strip().lower() or "any"
         location = str(payload.get("location", "")).strip()
         only_verified = bool(payload.get("only_verified", False))
+        enrich = bool(payload.get("enrich", False))
 
         min_rating_raw = payload.get("min_rating", 0)
         try:
@@ -58,19 +64,24 @@ class DiscoveryFilters:
             min_rating=min_rating,
             only_verified=only_verified,
             limit=limit,
+            enrich=enrich,
         )
 
+    def has_point(self) -> bool:
+        return self.latitude is not None and self.longitude is not None
+
     def merged_query(self) -> str:
         parts = [self.query]
         if self.niche and self.niche != "all":
             parts.append(self.niche.replace("_", " "))
-        if self.location:
+        # With a search circle the place name would only pull results back to the city center.
+        if self.location and not self.has_point():
             parts.append(self.location)
         merged = " ".join(item.strip() for item in parts if item and item.strip())
         return merged.strip()
 
     def to_api_dict(self) -> dict[str, Any]:
-        return {
+        payload: dict[str, Any] = {
             "query": self.query,
             "niche": self.niche,
             "has_website": self.has_website,
@@ -79,6 +90,38 @@ class DiscoveryFilters:
             "min_rating": self.min_rating,
             "only_verified": self.only_verified,
             "limit": self.limit,
+            "enrich": self.enrich,
+        }
+        if self.has_point():
+            payload.update(latitude=self.latitude, longitude=self.longitude, radius_m=self.radius_m)
+        return payload
+
+
+@dataclass
+class ScanStats:
+    """Candidates a source looked at versus the records it kept.
+
+    ``truncated`` means upstream had candidates this search never looked at (limit or
+    paging ceiling reached), so a narrower search would find more.
+    """
+
+    pages: int = 0
+    scanned: int = 0
+    accepted: int = 0
+    truncated: bool = False
+
+    def scanned_per_accepted(self) -> float | None:
+        if not self.accepted:
+            return None
+        return round(self.scanned / self.accepted, 2)
+
+    def to_api_dict(self) -> dict[str, Any]:
+        return {
+            "pages": self.pages,
+            "scanned": self.scanned,
+            "accepted": self.accepted,
+            "scanned_per_accepted": self.scanned_per_accepted(),
+            "truncated": self.truncated,
         }
 
 
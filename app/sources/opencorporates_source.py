@@ -4,13 +4,15 @@ import json
 import os
 from typing import Any
 
+from .async_http import async_http_get_json, run_sync
 from .filter_utils import clean, passes_presence_filter
-from .http_utils import http_get_json
-from .models import DiscoveryFilters, SourceRecord
+from .models import DiscoveryFilters, ScanStats, SourceRecord
+from .paging import OverfetchController
 
 
 OPENCORPORATES_SEARCH_URL = "https://api.opencorporates.com/v0.4/companies/search"
 ACTIVE_STATES = {"active", "registered", "incorporated", "normal"}
+OPENCORPORATES_MAX_PAGE_SIZE = 100
 
 
 class OpenCorporatesSource:
@@ -18,28 +20,39 @@ class OpenCorporatesSource:
         self.api_token = api_token or os.getenv("OPENCORPORATES_API_TOKEN")
         if not self.api_token:
             raise ValueError("Missing OPENCORPORATES_API_TOKEN in environment.")
+        self.last_scan: ScanStats | None = None
 
     def search(self, filters: DiscoveryFilters) -> list[SourceRecord]:
+        return run_sync(self.asearch(filters))
+
+    async def asearch(self, filters: DiscoveryFilters) -> list[SourceRecord]:
         query = filters.merged_query() or "company"
-        params: dict[str, Any] = {
-            "q": query,
-            "per_page": min(filters.limit, 100),
-            "order": "score",
-        }
-        params["api_token"] = self.api_token
-
-        payload = http_get_json(url=OPENCORPORATES_SEARCH_URL, params=params, retries=4)
-        result_items = ((payload.get("results") or {}).get("companies")) or []
-
-        records: list[SourceRecord] = []
-        for item in result_items:
-            company = (item or {}).get("company") or {}
-            record = self._to_record(company=company, filters=filters)
-            if record is None:
-                continue
-            records.append(record)
-            if len(records) >= filters.limit:
-                break
+
+        async def fetch_page(offset: int, page_size: int) -> tuple[list[Any], bool]:
+            params: dict[str, Any] = {
+                "q": query,
+                "per_page": page_size,
+                # Page-numbered API: the controller keeps page_size fixed so offsets stay aligned.
+                "page": offset // page_size + 1,
+                "order": "score",
+            }
+            params["api_token"] = self.api_token
+            payload = await async_http_get_json(url=OPENCORPORATES_SEARCH_URL, params=params, retries=4)
+            results = payload.get("results") or {}
+            exhausted = int(results.get("page") or 0) >= int(results.get("total_pages") or 0)
+            return results.get("companies") or [], exhausted
+
+        controller = OverfetchController(
+            source="opencorporates",
+            filters=filters,
+            max_page_size=OPENCORPORATES_MAX_PAGE_SIZE,
+            fixed_page_size=True,
+        )
+        records = await controller.collect(
+            fetch_page,
+            lambda item: self._to_record(company=(item or {}).get("company") or {}, filters=filters),
+        )
+        self.last_scan = controller.scan
         return records
 
     def _to_record(self, *, company: dict[str, Any], filters: DiscoveryFilters) -> SourceRecord | None:
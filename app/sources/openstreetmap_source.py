@@ -1,57 +1,104 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 import re
-import time
 import urllib.error
 import urllib.parse
-import urllib.request
 from typing import Any
 
 from ..utils import calculate_backoff_seconds
+from .async_http import async_http_get_json, async_http_request, run_sync
 from .filter_utils import clean, passes_presence_filter
-from .http_utils import http_get_json
-from .models import DiscoveryFilters, SourceRecord
+from .models import DiscoveryFilters, ScanStats, SourceRecord
+from .osm_tiles import (
+    OverpassTileCache,
+    covering_tiles,
+    distance_m,
+    element_position,
+    geohash_bbox,
+    geohash_encode,
+    get_tile_cache,
+)
+from .response_cache import is_cache_bypassed
 
 
 NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
 OVERPASS_URL = "https://overpass-api.de/api/interpreter"
+SEARCH_RADIUS_M = 6000
+POI_KEYS = ("shop", "amenity", "office")
+# Tag pairs read by _to_record; Overpass matches either key with a key regex.
+WEBSITE_TAGS = ("website", "contact:website")
+PHONE_TAGS = ("phone", "contact:phone")
+VERIFIED_TAGS = ("wikidata", "brand:wikidata")
+MAX_OVERPASS_OUT = 1000
+# Server-side [timeout:N] of the multi-tile and single-circle queries; the HTTP timeout
+# adds a margin so the client never gives up before Overpass would have answered.
+OVERPASS_TILES_TIMEOUT_SECONDS = 60
+OVERPASS_QUERY_TIMEOUT_SECONDS = 25
+OVERPASS_HTTP_MARGIN_SECONDS = 5
+
+# Tile fetches in flight per (loop, geohashes). They outlive a cancelled caller (a cold
+# fetch can exceed the multi-source deadline), so later searches find the tiles stored.
+_TILE_FETCHES: dict[tuple[asyncio.AbstractEventLoop, tuple[str, ...]], asyncio.Task] = {}
 
 
 class OpenStreetMapSource:
-    def __init__(self, user_agent: str | None = None):
+    def __init__(self, user_agent: str | None = None, tile_cache: OverpassTileCache | None = None):
         self.user_agent = user_agent or os.getenv(
             "OSM_USER_AGENT", "proyectos-sass-scraper/1.0 (contact: local-admin)"
         )
+        self.tile_cache = tile_cache if tile_cache is not None else get_tile_cache()
+        self.last_scan: ScanStats | None = None
 
     def search(self, filters: DiscoveryFilters) -> list[SourceRecord]:
-        if not filters.location:
+        return run_sync(self.asearch(filters))
+
+    async def asearch(self, filters: DiscoveryFilters) -> list[SourceRecord]:
+        if not filters.location and not filters.has_point():
             raise ValueError("OpenStreetMap discovery requires a location.")
 
-        lat, lon = self._resolve_location(filters.location)
-        query = self._build_overpass_query(filters=filters, lat=lat, lon=lon)
+        if filters.has_point():
+            lat, lon = float(filters.latitude), float(filters.longitude)
+            radius = float(filters.radius_m or SEARCH_RADIUS_M)
+        else:
+            lat, lon = await self._resolve_location(filters.location)
+            radius = SEARCH_RADIUS_M
         try:
-            payload = self._run_overpass_query(query=query)
+            if self.tile_cache is not None:
+                elements = await self._tiled_elements(
+                    self.tile_cache, filters=filters, lat=lat, lon=lon, radius=radius
+                )
+            else:
+                query = self._build_overpass_query(filters=filters, lat=lat, lon=lon, radius=radius)
+                payload = await self._run_overpass_query(query=query, timeout_seconds=OVERPASS_QUERY_TIMEOUT_SECONDS)
+                elements = payload.get("elements", [])
         except urllib.error.HTTPError as exc:
-            if exc.code != 400:
+            if exc.code != 400 or filters.has_point():
                 raise
-            return self._search_with_nominatim(filters)
+            return await self._search_with_nominatim(filters)
 
         results: list[SourceRecord] = []
-        for element in payload.get("elements", []):
+        scanned = 0
+        for element in elements:
+            scanned += 1
             record = self._to_record(element=element, filters=filters)
             if record is None:
                 continue
             results.append(record)
             if len(results) >= filters.limit:
                 break
-        if not results:
-            return self._search_with_nominatim(filters)
+        self.last_scan = ScanStats(
+            pages=1, scanned=scanned, accepted=len(results), truncated=scanned < len(elements)
+        )
+        # A search circle (area sweep cell) may simply be empty; the place-name fallback would leave it.
+        if not results and not filters.has_point():
+            return await self._search_with_nominatim(filters)
         return results
 
-    def _resolve_location(self, location: str) -> tuple[float, float]:
-        payload = http_get_json(
+    async def _resolve_location(self, location: str) -> tuple[float, float]:
+        payload = await async_http_get_json(
             url=NOMINATIM_URL,
             params={"q": location, "format": "jsonv2", "limit": 1},
             headers={"User-Agent": self.user_agent},
@@ -65,7 +112,91 @@ class OpenStreetMapSource:
         lon = float(first.get("lon"))
         return lat, lon
 
-    def _run_overpass_query(self, *, query: str) -> dict[str, Any]:
+    async def _tiled_elements(
+        self,
+        tile_cache: OverpassTileCache,
+        *,
+        filters: DiscoveryFilters,
+        lat: float,
+        lon: float,
+        radius: float = SEARCH_RADIUS_M,
+    ) -> list[dict[str, Any]]:
+        """Elements inside the search radius from cached geohash tiles, nearest first.
+
+        Missing tiles are fetched in one Overpass query with every named POI and stored,
+        so other niches and overlapping areas reuse them; the name filter runs locally.
+        """
+        geohashes = covering_tiles(lat, lon, radius)
+        # Tile reads and writes hit SQLite; keep them off the shared discovery I/O loop.
+        tiles = {} if is_cache_bypassed() else await asyncio.to_thread(tile_cache.get_many, geohashes)
+        missing = [geohash for geohash in geohashes if geohash not in tiles]
+        if missing:
+            tiles.update(await asyncio.shield(self._tile_fetch(tile_cache, missing)))
+
+        pattern = _name_pattern(filters)
+        located: list[tuple[float, dict[str, Any]]] = []
+        for geohash in geohashes:
+            for element in tiles.get(geohash, []):
+                position = element_position(element)
+                if position is None:
+                    continue
+                distance = distance_m(lat, lon, position[0], position[1])
+                if distance > radius:
+                    continue
+                name = str((element.get("tags") or {}).get("name") or "")
+                if pattern is not None and not pattern.search(name):
+                    continue
+                located.append((distance, element))
+        located.sort(key=lambda item: item[0])
+        return [element for _, element in located]
+
+    def _tile_fetch(self, tile_cache: OverpassTileCache, missing: list[str]) -> asyncio.Task:
+        """The task fetching and storing ``missing`` tiles; concurrent searches share it."""
+        key = (asyncio.get_running_loop(), tuple(missing))
+        task = _TILE_FETCHES.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_and_store_tiles(tile_cache, missing))
+            _TILE_FETCHES[key] = task
+            task.add_done_callback(lambda done: _forget_tile_fetch(key, done))
+        return task
+
+    async def _fetch_and_store_tiles(
+        self, tile_cache: OverpassTileCache, missing: list[str]
+    ) -> dict[str, list[dict[str, Any]]]:
+        fetched = await self._fetch_tiles(missing)
+        await asyncio.to_thread(tile_cache.put_many, fetched)
+        return fetched
+
+    async def _fetch_tiles(self, geohashes: list[str]) -> dict[str, list[dict[str, Any]]]:
+        statements = []
+        for geohash in geohashes:
+            south, west, north, east = geohash_bbox(geohash)
+            bbox = f"{south},{west},{north},{east}"
+            for key in POI_KEYS:
+                statements.append(f'node({bbox})["name"]["{key}"];')
+                statements.append(f'way({bbox})["name"]["{key}"];')
+        query = f"[out:json][timeout:{OVERPASS_TILES_TIMEOUT_SECONDS}];({''.join(statements)});out tags center;"
+
+        tiles: dict[str, list[dict[str, Any]]] = {geohash: [] for geohash in geohashes}
+        precision = len(geohashes[0])
+        payload = await self._run_overpass_query(query=query, timeout_seconds=OVERPASS_TILES_TIMEOUT_SECONDS)
+        for element in payload.get("elements", []):
+            position = element_position(element)
+            if position is None:
+                continue
+            # Ways crossing a tile edge are kept only in the tile holding their center.
+            geohash = geohash_encode(position[0], position[1], precision)
+            if geohash in tiles:
+                tiles[geohash].append(element)
+        return tiles
+
+    async def _run_overpass_query(self, *, query: str, timeout_seconds: int) -> dict[str, Any]:
+        """POST ``query`` (whose QL ``[timeout:...]`` is ``timeout_seconds``) with retries.
+
+        Overpass reports a query that ran out of time or memory as HTTP 200 with a
+        ``remark: runtime error ...`` and partial elements; that is retried, then raised,
+        never returned (partial tiles would be cached as authoritative).
+        """
         data = urllib.parse.urlencode({"data": query}).encode("utf-8")
         headers = {
             "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
@@ -75,24 +206,34 @@ class OpenStreetMapSource:
 
         for attempt in range(1, 4):
             try:
-                request = urllib.request.Request(OVERPASS_URL, data=data, headers=headers, method="POST")
-                with urllib.request.urlopen(request, timeout=40) as response:
-                    payload = response.read().decode("utf-8")
-                    return json.loads(payload)
+                payload = await async_http_request(
+                    "POST",
+                    OVERPASS_URL,
+                    body=data,
+                    headers=headers,
+                    timeout_seconds=timeout_seconds + OVERPASS_HTTP_MARGIN_SECONDS,
+                )
+                decoded = json.loads(payload.decode("utf-8"))
+                remark = str(decoded.get("remark") or "") if isinstance(decoded, dict) else ""
+                if "runtime error" not in remark.lower():
+                    return decoded
+                if attempt >= 3:
+                    raise ValueError(f"Overpass query failed: {remark}")
+                await asyncio.sleep(calculate_backoff_seconds(attempt=attempt))
             except urllib.error.HTTPError as exc:
                 if attempt >= 3:
                     raise
                 if exc.code not in {429, 500, 502, 503, 504}:
                     raise
-                time.sleep(calculate_backoff_seconds(attempt=attempt))
-            except (urllib.error.URLError, TimeoutError):
+                await asyncio.sleep(calculate_backoff_seconds(attempt=attempt))
+            except (urllib.error.URLError, asyncio.TimeoutError):
                 if attempt >= 3:
                     raise
-                time.sleep(calculate_backoff_seconds(attempt=attempt))
+                await asyncio.sleep(calculate_backoff_seconds(attempt=attempt))
         return {}
 
-    def _search_with_nominatim(self, filters: DiscoveryFilters) -> list[SourceRecord]:
-        payload = http_get_json(
+    async def _search_with_nominatim(self, filters: DiscoveryFilters) -> list[SourceRecord]:
+        payload = await async_http_get_json(
             url=NOMINATIM_URL,
             params={
                 "q": filters.merged_query() or filters.location or "business",
@@ -117,27 +258,22 @@ class OpenStreetMapSource:
                 break
         return results
 
-    def _build_overpass_query(self, *, filters: DiscoveryFilters, lat: float, lon: float) -> str:
-        radius = 6000
-        keywords = []
-        if filters.query:
-            keywords.append(filters.query)
-        if filters.niche and filters.niche != "all":
-            keywords.append(filters.niche.replace("_", " "))
-        regex = "|".join(re.escape(item) for item in keywords if item.strip())
+    def _build_overpass_query(
+        self, *, filters: DiscoveryFilters, lat: float, lon: float, radius: float = SEARCH_RADIUS_M
+    ) -> str:
+        regex = _name_regex(filters)
 
         name_filter = f'["name"~"(?i){regex}"]' if regex else ""
+        # Presence/verified filters run server-side so the output cap is not spent on rejects.
+        tag_filters = name_filter + _tag_filters(filters)
+        statements = "".join(
+            f'{element}(around:{radius},{lat},{lon})["name"]{tag_filters}["{key}"];'
+            for key in POI_KEYS
+            for element in ("node", "way")
+        )
         return (
-            '[out:json][timeout:25];'
-            "("
-            f'node(around:{radius},{lat},{lon})["name"]{name_filter}["shop"];'
-            f'way(around:{radius},{lat},{lon})["name"]{name_filter}["shop"];'
-            f'node(around:{radius},{lat},{lon})["name"]{name_filter}["amenity"];'
-            f'way(around:{radius},{lat},{lon})["name"]{name_filter}["amenity"];'
-            f'node(around:{radius},{lat},{lon})["name"]{name_filter}["office"];'
-            f'way(around:{radius},{lat},{lon})["name"]{name_filter}["office"];'
-            ");"
-            "out tags center 200;"
+            f"[out:json][timeout:{OVERPASS_QUERY_TIMEOUT_SECONDS}];({statements});"
+            f"out tags center {_overpass_out_count(filters.limit)};"
         )
 
     def _to_record(self, *, element: dict[str, Any], filters: DiscoveryFilters) -> SourceRecord | None:
@@ -228,3 +364,47 @@ class OpenStreetMapSource:
             is_verified=is_verified,
             raw_json=json.dumps(item, ensure_ascii=False),
         )
+
+
+def _name_regex(filters: DiscoveryFilters) -> str:
+    keywords = []
+    if filters.query:
+        keywords.append(filters.query)
+    if filters.niche and filters.niche != "all":
+        keywords.append(filters.niche.replace("_", " "))
+    return "|".join(re.escape(item) for item in keywords if item.strip())
+
+
+def _forget_tile_fetch(key: tuple[asyncio.AbstractEventLoop, tuple[str, ...]], task: asyncio.Task) -> None:
+    _TILE_FETCHES.pop(key, None)
+    if not task.cancelled():
+        # Retrieved here so a fetch whose callers all gave up is not logged as unhandled.
+        task.exception()
+
+
+def _name_pattern(filters: DiscoveryFilters) -> re.Pattern[str] | None:
+    regex = _name_regex(filters)
+    return re.compile(regex, re.IGNORECASE) if regex else None
+
+
+def _tag_filters(filters: DiscoveryFilters) -> str:
+    clauses = [
+        _presence_clause(filters.has_website, WEBSITE_TAGS),
+        _presence_clause(filters.has_phone, PHONE_TAGS),
+        _presence_clause("yes" if filters.only_verified else "any", VERIFIED_TAGS),
+    ]
+    return "".join(clauses)
+
+
+def _presence_clause(mode: str, keys: tuple[str, ...]) -> str:
+    if mode == "yes":
+        alternatives = "|".join(re.escape(key) for key in keys)
+        return f'[~"^({alternatives})$"~"."]'
+    if mode == "no":
+        return "".join(f'[!"{key}"]' for key in keys)
+    return ""
+
+
+def _overpass_out_count(limit: int) -> int:
+    # Small headroom for elements _to_record still rejects (blank tag values, missing ids).
+    return min(max(limit + 10, int(limit * 1.2)), MAX_OVERPASS_OUT)
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from ..storage import Storage
+
+
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+# Precision 5 cells are ~4.9 km x 4.9 km at the equator: a 6 km search radius spans 9-16 tiles.
+TILE_PRECISION = 5
+EARTH_RADIUS_M = 6_371_000.0
+
+
+def geohash_encode(lat: float, lon: float, precision: int = TILE_PRECISION) -> str:
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars: list[str] = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        value_range, value = (lon_range, lon) if even else (lat_range, lat)
+        middle = (value_range[0] + value_range[1]) / 2
+        if value >= middle:
+            bits = (bits << 1) | 1
+            value_range[0] = middle
+        else:
+            bits <<= 1
+            value_range[1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+
+def geohash_bbox(geohash: str) -> tuple[float, float, float, float]:
+    """``(south, west, north, east)`` of a geohash cell."""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        index = GEOHASH_ALPHABET.index(char)
+        for shift in range(4, -1, -1):
+            value_range = lon_range if even else lat_range
+            middle = (value_range[0] + value_range[1]) / 2
+            if (index >> shift) & 1:
+                value_range[0] = middle
+            else:
+                value_range[1] = middle
+            even = not even
+    return lat_range[0], lon_range[0], lat_range[1], lon_range[1]
+
+
+def distance_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+def covering_tiles(lat: float, lon: float, radius_m: float, precision: int = TILE_PRECISION) -> list[str]:
+    """Geohash cells intersecting the circle, nearest first."""
+    south, west, north, east = geohash_bbox(geohash_encode(lat, lon, precision))
+    cell_height = north - south
+    cell_width = east - west
+    lat_delta = math.degrees(radius_m / EARTH_RADIUS_M)
+    lon_delta = lat_delta / max(math.cos(math.radians(lat)), 1e-6)
+
+    tiles: dict[str, float] = {}
+    row_start = math.floor((lat - lat_delta + 90) / cell_height)
+    row_end = math.floor((lat + lat_delta + 90) / cell_height)
+    col_start = math.floor((lon - lon_delta + 180) / cell_width)
+    col_end = math.floor((lon + lon_delta + 180) / cell_width)
+    for row in range(row_start, row_end + 1):
+        cell_lat = -90 + (row + 0.5) * cell_height
+        if not -90 < cell_lat < 90:
+            continue
+        for col in range(col_start, col_end + 1):
+            cell_lon = -180 + ((col + 0.5) * cell_width) % 360
+            geohash = geohash_encode(cell_lat, cell_lon, precision)
+            gap = _distance_to_cell_m(lat, lon, geohash_bbox(geohash))
+            if gap <= radius_m:
+                tiles[geohash] = gap
+    return sorted(tiles, key=lambda item: tiles[item])
+
+
+def element_position(element: dict[str, Any]) -> tuple[float, float] | None:
+    center = element.get("center") or {}
+    lat = element.get("lat", center.get("lat"))
+    lon = element.get("lon", center.get("lon"))
+    if lat is None or lon is None:
+        return None
+    return float(lat), float(lon)
+
+
+def _distance_to_cell_m(lat: float, lon: float, bbox: tuple[float, float, float, float]) -> float:
+    south, west, north, east = bbox
+    nearest_lat = min(max(lat, south), north)
+    nearest_lon = min(max(lon, west), east)
+    return distance_m(lat, lon, nearest_lat, nearest_lon)
+
+
+class OverpassTileCache:
+    """Overpass POIs stored per geohash tile (``osm_tiles`` table) with a TTL."""
+
+    def __init__(self, *, db_path: Path, ttl_seconds: int):
+        self.db_path = Path(db_path)
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._counters = {"tile_hits": 0, "tile_misses": 0, "tiles_stored": 0, "errors": 0}
+        with Storage(self.db_path) as storage:
+            storage.init_db()
+
+    def get_many(self, geohashes: list[str]) -> dict[str, list[dict[str, Any]]]:
+        try:
+            with Storage(self.db_path) as storage:
+                rows = storage.get_osm_tiles(geohashes, _iso(datetime.now(timezone.utc)))
+        except sqlite3.Error:
+            self._count("errors")
+            rows = {}
+        self._count("tile_hits", len(rows))
+        self._count("tile_misses", len(geohashes) - len(rows))
+        return {geohash: json.loads(raw) for geohash, raw in rows.items()}
+
+    def put_many(self, tiles: dict[str, list[dict[str, Any]]]) -> None:
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "geohash": geohash,
+                "elements_json": json.dumps(elements, ensure_ascii=False),
+                "element_count": len(elements),
+                "fetched_at": _iso(now),
+                "expires_at": _iso(now + timedelta(seconds=self.ttl_seconds)),
+            }
+            for geohash, elements in tiles.items()
+        ]
+        try:
+            with Storage(self.db_path) as storage:
+                storage.put_osm_tiles(rows, _iso(now))
+        except sqlite3.Error:
+            self._count("errors")
+            return
+        self._count("tiles_stored", len(rows))
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters["tile_hits"] + counters["tile_misses"]
+        counters["tile_hit_ratio"] = round(counters["tile_hits"] / lookups, 4) if lookups else 0.0
+        counters["ttl_seconds"] = self.ttl_seconds
+        return counters
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += amount
+
+
+_TILE_CACHE: OverpassTileCache | None = None
+
+
+def tile_cache_from_env(db_path: Path) -> OverpassTileCache | None:
+    """Tile cache in the main database; shares the ``DISCOVERY_HTTP_CACHE`` switch."""
+    if os.getenv("DISCOVERY_HTTP_CACHE", "1").strip().lower() in {"0", "false", "no", "off"}:
+        return None
+    return OverpassTileCache(
+        db_path=db_path,
+        ttl_seconds=int(float(os.getenv("OSM_TILE_CACHE_TTL_HOURS", "168")) * 3600),
+    )
+
+
+def configure_tile_cache(cache: OverpassTileCache | None) -> None:
+    global _TILE_CACHE
+    _TILE_CACHE = cache
+
+
+def get_tile_cache() -> OverpassTileCache | None:
+    return _TILE_CACHE
+
+
+def _iso(value: datetime) -> str:
+    return value.isoformat()
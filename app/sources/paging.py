@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import math
+import os
+import threading
+from typing import Any, Awaitable, Callable
+
+from .models import DiscoveryFilters, ScanStats, SourceRecord
+
+
+# Pseudo-candidates given to the prior when blending it with the current search's pages.
+PRIOR_WEIGHT = 20.0
+# Smoothing of the per-(source, filter set) acceptance rate carried across searches.
+HISTORY_ALPHA = 0.3
+DEFAULT_FILTERED_RATE = 0.5
+MIN_ACCEPTANCE_RATE = 0.05
+# Extra fraction requested on top of the estimate, to absorb variance between pages.
+OVERFETCH_HEADROOM = 1.2
+
+_HISTORY: dict[tuple[str, tuple], float] = {}
+_HISTORY_LOCK = threading.Lock()
+
+
+def filter_signature(filters: DiscoveryFilters) -> tuple:
+    """Filters that reject candidates after the upstream call; equal signatures share a rate."""
+    return (filters.has_website, filters.has_phone, filters.only_verified, math.floor(filters.min_rating * 2) / 2)
+
+
+def default_max_requests() -> int:
+    return max(1, int(os.getenv("DISCOVERY_OVERFETCH_MAX_REQUESTS", "4")))
+
+
+class OverfetchController:
+    """Sizes successive upstream pages so locally filtered searches still fill ``limit``.
+
+    The expected acceptance rate starts from what earlier searches with the same source
+    and filter signature observed, and is refined with every page of the current search.
+    Paging stops at the limit, when upstream runs dry, or at the request/offset ceiling.
+    Offset sources run dry on a short page; cursor sources (``short_page_ends=False``),
+    whose pages can be short mid-listing, only when ``fetch_page`` reports it.
+    """
+
+    def __init__(
+        self,
+        *,
+        source: str,
+        filters: DiscoveryFilters,
+        max_page_size: int,
+        max_requests: int | None = None,
+        max_offset: int | None = None,
+        fixed_page_size: bool = False,
+        short_page_ends: bool = True,
+    ):
+        self.source = source
+        self.limit = filters.limit
+        self.max_page_size = max_page_size
+        self.max_requests = max_requests if max_requests is not None else default_max_requests()
+        self.max_offset = max_offset
+        self.fixed_page_size = fixed_page_size
+        self.short_page_ends = short_page_ends
+        self.offset = 0
+        self.scan = ScanStats()
+        self._signature = filter_signature(filters)
+        self._prior_rate = self._load_prior(filters)
+        self._page_size: int | None = None
+        self._exhausted = False
+        self._left_over = False
+
+    def acceptance_rate(self) -> float:
+        rate = (self._prior_rate * PRIOR_WEIGHT + self.scan.accepted) / (PRIOR_WEIGHT + self.scan.scanned)
+        return max(rate, MIN_ACCEPTANCE_RATE)
+
+    def next_page_size(self) -> int | None:
+        """Size of the next request, or ``None`` when paging should stop."""
+        remaining = self.limit - self.scan.accepted
+        if remaining <= 0 or self._exhausted or self.scan.pages >= self.max_requests:
+            return None
+        if self.fixed_page_size and self._page_size is not None:
+            size = self._page_size
+        else:
+            size = math.ceil(remaining / self.acceptance_rate() * OVERFETCH_HEADROOM)
+            size = min(max(size, remaining, 1), self.max_page_size)
+        if self.max_offset is not None:
+            size = min(size, self.max_offset - self.offset)
+            if size <= 0:
+                return None
+        self._page_size = size
+        return size
+
+    async def collect(
+        self,
+        fetch_page: Callable[[int, int], Awaitable[tuple[list[Any], bool]]],
+        to_record: Callable[[Any], SourceRecord | None],
+    ) -> list[SourceRecord]:
+        """Page through ``await fetch_page(offset, size) -> (items, exhausted)`` until paging stops.
+
+        Records repeated across pages (upstream ordering can shift) are kept once.
+        """
+        records: list[SourceRecord] = []
+        seen_ids: set[str] = set()
+        while (page_size := self.next_page_size()) is not None:
+            items, exhausted = await fetch_page(self.offset, page_size)
+            scanned = 0
+            accepted = 0
+            for item in items:
+                if len(records) >= self.limit:
+                    self._left_over = True
+                    break
+                scanned += 1
+                record = to_record(item)
+                if record is None or record.external_id in seen_ids:
+                    continue
+                seen_ids.add(record.external_id)
+                records.append(record)
+                accepted += 1
+            self.record_page(
+                requested=page_size, returned=len(items), scanned=scanned, accepted=accepted, exhausted=exhausted
+            )
+        self.finish()
+        return records
+
+    def record_page(
+        self, *, requested: int, returned: int, scanned: int, accepted: int, exhausted: bool = False
+    ) -> None:
+        """Account for one fetched page; ``exhausted`` (or a short page, for offset sources) ends paging."""
+        self.scan.pages += 1
+        self.scan.scanned += scanned
+        self.scan.accepted += accepted
+        self.offset += returned
+        if exhausted or (self.short_page_ends and returned < requested):
+            self._exhausted = True
+
+    def finish(self) -> ScanStats:
+        """Fold this search's observed rate into the history and return its scan stats."""
+        self.scan.truncated = self._left_over or not self._exhausted
+        if self.scan.scanned:
+            observed = self.scan.accepted / self.scan.scanned
+            key = (self.source, self._signature)
+            with _HISTORY_LOCK:
+                previous = _HISTORY.get(key)
+                if previous is not None:
+                    observed = HISTORY_ALPHA * observed + (1 - HISTORY_ALPHA) * previous
+                _HISTORY[key] = observed
+        return self.scan
+
+    def _load_prior(self, filters: DiscoveryFilters) -> float:
+        with _HISTORY_LOCK:
+            known = _HISTORY.get((self.source, self._signature))
+        if known is not None:
+            return known
+        unfiltered = filters.has_website == "any" and filters.has_phone == "any"
+        unfiltered = unfiltered and not filters.only_verified and filters.min_rating <= 0
+        return 1.0 if unfiltered else DEFAULT_FILTERED_RATE
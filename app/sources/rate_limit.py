@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+
+class RateLimiter:
+    """Thread-safe request spacing: ``acquire`` blocks until the next slot at ``qps``.
+
+    ``qps <= 0`` disables limiting.
+    """
+
+    def __init__(self, qps: float):
+        self.qps = qps
+        self._interval = 1.0 / qps if qps > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Wait for a slot and return the seconds spent waiting."""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def aacquire(self) -> float:
+        """``acquire`` for coroutines: waits without blocking the event loop."""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def _reserve(self) -> float:
+        """Claim the next slot; returns how long until it starts."""
+        if not self._interval:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        return max(slot - now, 0.0)
+
+
+_SHARED_LIMITERS: dict[str, RateLimiter] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def shared_rate_limiter(key: str, qps: float) -> RateLimiter:
+    """Process-wide limiter per key, so concurrent searches share one upstream budget."""
+    with _SHARED_LOCK:
+        limiter = _SHARED_LIMITERS.get(key)
+        if limiter is None or limiter.qps != qps:
+            limiter = RateLimiter(qps)
+            _SHARED_LIMITERS[key] = limiter
+        return limiter
@@ -1,19 +1,23 @@
 from __future__ import annotations
 
+import asyncio
 import base64
+import hashlib
 import json
 import os
 import re
+import threading
 import time
 import urllib.error
 import urllib.parse
-import urllib.request
-from typing import Any
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable
 
 from ..utils import calculate_backoff_seconds
+from .async_http import async_http_get_json, async_http_request, run_sync
 from .filter_utils import passes_presence_filter, safe_int
-from .http_utils import http_get_json
-from .models import DiscoveryFilters, SourceRecord
+from .models import DiscoveryFilters, ScanStats, SourceRecord
+from .paging import OverfetchController
 
 
 REDDIT_SEARCH_URL = "https://www.reddit.com/search.json"
@@ -21,6 +25,72 @@ REDDIT_OAUTH_SEARCH_URL = "https://oauth.reddit.com/search"
 REDDIT_OAUTH_TOKEN_URL = "https://www.reddit.com/api/v1/access_token"
 PHONE_REGEX = re.compile(r"(\+?\d[\d\-\s().]{7,}\d)")
 URL_REGEX = re.compile(r"(https?://[^\s]+)")
+REDDIT_MAX_PAGE_SIZE = 100
+# Tokens are refreshed this long before Reddit's expires_in so in-flight searches never carry a stale one.
+TOKEN_REFRESH_MARGIN_SECONDS = 60.0
+
+
+class OAuthTokenCache:
+    """Process-wide client-credentials tokens keyed by client id and secret.
+
+    A missing or expiring token is fetched by one caller per key; concurrent callers
+    (from any thread or event loop) await that fetch instead of requesting their own.
+    """
+
+    def __init__(self) -> None:
+        self._tokens: dict[str, tuple[str, float]] = {}
+        self._fetching: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    async def get(self, key: str, fetch: Callable[[], Awaitable[tuple[str, float]]]) -> str:
+        cached = self._valid(key)
+        if cached is not None:
+            return cached
+        with self._lock:
+            pending = self._fetching.get(key)
+            is_leader = pending is None
+            if pending is None:
+                pending = Future()
+                # Running futures cannot be cancelled by a follower that gives up waiting.
+                pending.set_running_or_notify_cancel()
+                self._fetching[key] = pending
+        if not is_leader:
+            return await asyncio.wrap_future(pending)
+
+        try:
+            # Another leader may have stored a token between the first check and taking the lead.
+            token = self._valid(key)
+            if token is None:
+                token, expires_in = await fetch()
+                lifetime = max(0.0, expires_in - TOKEN_REFRESH_MARGIN_SECONDS)
+                with self._lock:
+                    self._tokens[key] = (token, time.monotonic() + lifetime)
+        except BaseException as exc:
+            with self._lock:
+                self._fetching.pop(key, None)
+            pending.set_exception(exc if isinstance(exc, Exception) else RuntimeError("Token fetch was cancelled."))
+            raise
+        with self._lock:
+            self._fetching.pop(key, None)
+        pending.set_result(token)
+        return token
+
+    def invalidate(self, key: str, token: str) -> None:
+        """Drop ``token`` unless another caller already replaced it."""
+        with self._lock:
+            current = self._tokens.get(key)
+            if current is not None and current[0] == token:
+                del self._tokens[key]
+
+    def _valid(self, key: str) -> str | None:
+        with self._lock:
+            current = self._tokens.get(key)
+        if current is None or current[1] <= time.monotonic():
+            return None
+        return current[0]
+
+
+_TOKEN_CACHE = OAuthTokenCache()
 
 
 class RedditSource:
@@ -35,24 +105,38 @@ class RedditSource:
         )
         self.client_id = client_id or os.getenv("REDDIT_CLIENT_ID")
         self.client_secret = client_secret or os.getenv("REDDIT_CLIENT_SECRET")
+        self.max_pages = max(1, int(os.getenv("REDDIT_MAX_PAGES", "5")))
+        self.last_scan: ScanStats | None = None
 
     def search(self, filters: DiscoveryFilters) -> list[SourceRecord]:
+        return run_sync(self.asearch(filters))
+
+    async def asearch(self, filters: DiscoveryFilters) -> list[SourceRecord]:
         query = filters.merged_query() or filters.query or "business"
-        payload = self._fetch_payload(query=query, limit=min(filters.limit, 100))
-        children = (((payload.get("data") or {}).get("children")) or [])
-
-        records: list[SourceRecord] = []
-        for child in children:
-            data = (child or {}).get("data") or {}
-            record = self._to_record(data=data, filters=filters)
-            if record is None:
-                continue
-            records.append(record)
-            if len(records) >= filters.limit:
-                break
+        cursor: dict[str, str | None] = {"after": None}
+
+        async def fetch_page(offset: int, page_size: int) -> tuple[list[Any], bool]:
+            # Cursor-paginated: the offset is implied by the after token of the previous page.
+            payload = await self._fetch_payload(query=query, limit=page_size, after=cursor["after"])
+            listing = payload.get("data") or {}
+            cursor["after"] = listing.get("after")
+            return listing.get("children") or [], not cursor["after"]
+
+        controller = OverfetchController(
+            source="reddit",
+            filters=filters,
+            max_page_size=REDDIT_MAX_PAGE_SIZE,
+            max_requests=self.max_pages,
+            short_page_ends=False,
+        )
+        records = await controller.collect(
+            fetch_page,
+            lambda child: self._to_record(data=(child or {}).get("data") or {}, filters=filters),
+        )
+        self.last_scan = controller.scan
         return records
 
-    def _fetch_payload(self, *, query: str, limit: int) -> dict[str, Any]:
+    async def _fetch_payload(self, *, query: str, limit: int, after: str | None = None) -> dict[str, Any]:
         base_params = {
             "q": query,
             "limit": limit,
@@ -61,20 +145,23 @@ class RedditSource:
             "raw_json": 1,
             "type": "link",
         }
+        if after:
+            base_params["after"] = after
         if self._has_oauth_credentials():
-            oauth_token = self._fetch_oauth_token()
-            return http_get_json(
-                url=REDDIT_OAUTH_SEARCH_URL,
-                params=base_params,
-                headers={
-                    "User-Agent": self.user_agent,
-                    "Authorization": f"bearer {oauth_token}",
-                },
-                retries=4,
-            )
+            cache_key = self._token_cache_key()
+            oauth_token = await _TOKEN_CACHE.get(cache_key, self._fetch_oauth_token)
+            try:
+                return await self._fetch_oauth_search(params=base_params, oauth_token=oauth_token)
+            except urllib.error.HTTPError as exc:
+                if getattr(exc, "code", 0) != 401:
+                    raise
+            # Revoked or expired early: refresh once and retry.
+            _TOKEN_CACHE.invalidate(cache_key, oauth_token)
+            oauth_token = await _TOKEN_CACHE.get(cache_key, self._fetch_oauth_token)
+            return await self._fetch_oauth_search(params=base_params, oauth_token=oauth_token)
 
         try:
-            return http_get_json(
+            return await async_http_get_json(
                 url=REDDIT_SEARCH_URL,
                 params=base_params,
                 headers={"User-Agent": self.user_agent},
@@ -88,36 +175,57 @@ class RedditSource:
                 ) from exc
             raise
 
+    async def _fetch_oauth_search(self, *, params: dict[str, Any], oauth_token: str) -> dict[str, Any]:
+        return await async_http_get_json(
+            url=REDDIT_OAUTH_SEARCH_URL,
+            params=params,
+            headers={
+                "User-Agent": self.user_agent,
+                "Authorization": f"bearer {oauth_token}",
+            },
+            retries=4,
+        )
+
     def _has_oauth_credentials(self) -> bool:
         return bool((self.client_id or "").strip() and (self.client_secret or "").strip())
 
-    def _fetch_oauth_token(self) -> str:
+    def _token_cache_key(self) -> str:
+        secret_digest = hashlib.sha256(str(self.client_secret).encode("utf-8")).hexdigest()[:16]
+        return f"{self.client_id}:{secret_digest}"
+
+    async def _fetch_oauth_token(self) -> tuple[str, float]:
+        """Request a new client-credentials token; returns ``(token, expires_in seconds)``."""
         if not self._has_oauth_credentials():
             raise ValueError("Missing Reddit OAuth credentials.")
 
         auth_value = f"{self.client_id}:{self.client_secret}".encode("utf-8")
         basic_token = base64.b64encode(auth_value).decode("ascii")
         encoded_body = urllib.parse.urlencode({"grant_type": "client_credentials"}).encode("utf-8")
-        request = urllib.request.Request(
-            REDDIT_OAUTH_TOKEN_URL,
-            data=encoded_body,
-            method="POST",
-            headers={
-                "Accept": "application/json",
-                "Authorization": f"Basic {basic_token}",
-                "Content-Type": "application/x-www-form-urlencoded",
-                "User-Agent": self.user_agent,
-            },
-        )
+        headers = {
+            "Accept": "application/json",
+            "Authorization": f"Basic {basic_token}",
+            "Content-Type": "application/x-www-form-urlencoded",
+            "User-Agent": self.user_agent,
+        }
 
         for attempt in range(1, 5):
             try:
-                with urllib.request.urlopen(request, timeout=20) as response:
-                    payload = json.loads(response.read().decode("utf-8"))
+                response = await async_http_request(
+                    "POST",
+                    REDDIT_OAUTH_TOKEN_URL,
+                    body=encoded_body,
+                    headers=headers,
+                    timeout_seconds=20,
+                )
+                payload = json.loads(response.decode("utf-8"))
                 access_token = str(payload.get("access_token") or "").strip()
                 if not access_token:
                     raise ValueError("Reddit OAuth token response missing access_token.")
-                return access_token
+                try:
+                    expires_in = float(payload.get("expires_in") or 3600)
+                except (TypeError, ValueError):
+                    expires_in = 3600.0
+                return access_token, expires_in
             except urllib.error.HTTPError as exc:
                 status = getattr(exc, "code", 0)
                 if status in {401, 403}:
@@ -127,11 +235,11 @@ class RedditSource:
                 retryable = status in {408, 429, 500, 502, 503, 504}
                 if attempt >= 4 or not retryable:
                     raise ValueError(f"Reddit OAuth token request failed with status {status}.") from exc
-                time.sleep(calculate_backoff_seconds(attempt=attempt))
-            except (urllib.error.URLError, TimeoutError) as exc:
+                await asyncio.sleep(calculate_backoff_seconds(attempt=attempt))
+            except (urllib.error.URLError, asyncio.TimeoutError) as exc:
                 if attempt >= 4:
                     raise ValueError("Reddit OAuth token request failed due network error.") from exc
-                time.sleep(calculate_backoff_seconds(attempt=attempt))
+                await asyncio.sleep(calculate_backoff_seconds(attempt=attempt))
 
     def _to_record(self, *, data: dict[str, Any], filters: DiscoveryFilters) -> SourceRecord | None:
         reddit_id = str(data.get("id") or "")
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import threading
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator
+
+from .rate_limit import shared_rate_limiter
+
+
+def _capabilities(
+    *,
+    requires_location: bool = False,
+    rating: bool = False,
+    verified: bool = True,
+    enrich: bool = False,
+    credential_required: bool = True,
+    credential_param: str | None = None,
+    credential_env: str | None = None,
+    credential_label: str | None = None,
+    max_results_per_search: int | None = None,
+    **extra: Any,
+) -> dict[str, Any]:
+    return {
+        "supports_discovery_api": True,
+        "requires_location": requires_location,
+        "supports_rating_filter": rating,
+        "supports_verified_filter": verified,
+        "supports_has_website_filter": True,
+        "supports_has_phone_filter": True,
+        "supports_enrich": enrich,
+        "credential_required": credential_required,
+        "credential_param": credential_param,
+        "credential_env": credential_env,
+        "credential_label": credential_label,
+        # Set for sources that can search a lat/lon circle, so area sweeps can split cells that hit it.
+        "supports_point_search": max_results_per_search is not None,
+        "max_results_per_search": max_results_per_search,
+        **extra,
+    }
+
+
+@dataclass(frozen=True)
+class SourceSpec:
+    """A discovery connector: where it lives, what it supports and how hard it may be driven.
+
+    ``module`` is imported on first use. ``credentials`` are the constructor keyword
+    arguments filled from the request's credential map. ``max_concurrency`` caps
+    simultaneous searches per process and ``qps`` spaces search starts.
+    """
+
+    name: str
+    module: str
+    class_name: str
+    credentials: tuple[str, ...]
+    capabilities: dict[str, Any] = field(hash=False)
+    max_concurrency: int = 4
+    qps: float = 5.0
+
+    def load(self) -> type:
+        module = importlib.import_module(f"{__package__}.{self.module}")
+        return getattr(module, self.class_name)
+
+    def create(self, credentials: dict[str, str] | None = None) -> Any:
+        credential_data = credentials or {}
+        kwargs = {name: _get_credential(credential_data, name) for name in self.credentials}
+        return self.load()(**kwargs)
+
+
+SOURCE_REGISTRY: dict[str, SourceSpec] = {
+    spec.name: spec
+    for spec in (
+        SourceSpec(
+            name="google_maps",
+            module="google_maps_source",
+            class_name="GoogleMapsSource",
+            credentials=("api_key",),
+            capabilities=_capabilities(
+                rating=True,
+                enrich=True,
+                credential_param="api_key",
+                credential_env="GOOGLE_MAPS_API_KEY",
+                credential_label="Google Maps API Key",
+                max_results_per_search=60,
+            ),
+        ),
+        SourceSpec(
+            name="reddit",
+            module="reddit_source",
+            class_name="RedditSource",
+            credentials=("user_agent", "client_id", "client_secret"),
+            capabilities=_capabilities(
+                credential_required=False,
+                credential_param="user_agent",
+                credential_env="REDDIT_USER_AGENT",
+                credential_label="Reddit User-Agent",
+                oauth_envs=["REDDIT_CLIENT_ID", "REDDIT_CLIENT_SECRET"],
+            ),
+            max_concurrency=2,
+            qps=1.0,
+        ),
+        SourceSpec(
+            name="yelp",
+            module="yelp_source",
+            class_name="YelpSource",
+            credentials=("api_key",),
+            capabilities=_capabilities(
+                requires_location=True,
+                rating=True,
+                credential_param="api_key",
+                credential_env="YELP_API_KEY",
+                credential_label="Yelp API Key",
+                max_results_per_search=240,
+            ),
+        ),
+        SourceSpec(
+            name="tomtom",
+            module="tomtom_source",
+            class_name="TomTomSource",
+            credentials=("api_key",),
+            capabilities=_capabilities(
+                credential_param="api_key",
+                credential_env="TOMTOM_API_KEY",
+                credential_label="TomTom API Key",
+                max_results_per_search=2000,
+            ),
+        ),
+        SourceSpec(
+            name="foursquare",
+            module="foursquare_source",
+            class_name="FoursquareSource",
+            credentials=("api_key",),
+            capabilities=_capabilities(
+                rating=True,
+                credential_param="api_key",
+                credential_env="FOURSQUARE_API_KEY",
+                credential_label="Foursquare API Key",
+                max_results_per_search=50,
+            ),
+        ),
+        SourceSpec(
+            name="opencorporates",
+            module="opencorporates_source",
+            class_name="OpenCorporatesSource",
+            credentials=("api_token",),
+            capabilities=_capabilities(
+                credential_param="api_token",
+                credential_env="OPENCORPORATES_API_TOKEN",
+                credential_label="OpenCorporates API Token",
+            ),
+            max_concurrency=2,
+            qps=1.0,
+        ),
+        SourceSpec(
+            name="openstreetmap",
+            module="openstreetmap_source",
+            class_name="OpenStreetMapSource",
+            credentials=("user_agent",),
+            capabilities=_capabilities(
+                requires_location=True,
+                credential_required=False,
+                credential_param="user_agent",
+                credential_env="OSM_USER_AGENT",
+                credential_label="OpenStreetMap User-Agent",
+                max_results_per_search=1000,
+            ),
+            # Nominatim's usage policy allows one request per second.
+            max_concurrency=1,
+            qps=0.5,
+        ),
+    )
+}
+
+
+def get_source_spec(source: str) -> SourceSpec:
+    spec = SOURCE_REGISTRY.get(source)
+    if spec is None:
+        raise ValueError(f"Unsupported source: {source}")
+    return spec
+
+
+# One FIFO asyncio semaphore per source, owned by the discovery I/O loop; coroutines on
+# other loops acquire it through that loop so the limit stays process-wide.
+_SLOTS: dict[str, asyncio.Semaphore] = {}
+_IN_FLIGHT: dict[str, int] = {}
+_SLOTS_LOCK = threading.Lock()
+
+
+@asynccontextmanager
+async def source_slot(source: str) -> AsyncIterator[None]:
+    """Hold one of the source's concurrency slots (first come, first served) and wait for its QPS spacing."""
+    from .async_http import io_loop
+
+    spec = get_source_spec(source)
+    semaphore = _slot_semaphore(spec)
+    loop = io_loop()
+    on_io_loop = asyncio.get_running_loop() is loop
+    if on_io_loop:
+        await semaphore.acquire()
+    else:
+        await _acquire_from_other_loop(semaphore, loop)
+    _count_in_flight(source, 1)
+    try:
+        await shared_rate_limiter(f"discovery.source:{source}", spec.qps).aacquire()
+        yield
+    finally:
+        _count_in_flight(source, -1)
+        if on_io_loop:
+            semaphore.release()
+        else:
+            loop.call_soon_threadsafe(semaphore.release)
+
+
+def source_limits_stats() -> dict[str, dict[str, Any]]:
+    with _SLOTS_LOCK:
+        return {
+            name: {
+                "max_concurrency": spec.max_concurrency,
+                "qps": spec.qps,
+                "in_flight": _IN_FLIGHT.get(name, 0),
+            }
+            for name, spec in SOURCE_REGISTRY.items()
+        }
+
+
+def _slot_semaphore(spec: SourceSpec) -> asyncio.Semaphore:
+    with _SLOTS_LOCK:
+        semaphore = _SLOTS.get(spec.name)
+        if semaphore is None:
+            semaphore = asyncio.BoundedSemaphore(max(1, spec.max_concurrency))
+            _SLOTS[spec.name] = semaphore
+        return semaphore
+
+
+async def _acquire_from_other_loop(semaphore: asyncio.Semaphore, loop: asyncio.AbstractEventLoop) -> None:
+    pending = asyncio.run_coroutine_threadsafe(semaphore.acquire(), loop)
+    try:
+        await asyncio.wrap_future(pending)
+    except asyncio.CancelledError:
+        # The acquire may already have succeeded on the I/O loop; hand that slot back.
+        pending.add_done_callback(
+            lambda done: loop.call_soon_threadsafe(semaphore.release)
+            if not done.cancelled() and done.exception() is None
+            else None
+        )
+        raise
+
+
+def _count_in_flight(source: str, delta: int) -> None:
+    with _SLOTS_LOCK:
+        _IN_FLIGHT[source] = _IN_FLIGHT.get(source, 0) + delta
+
+
+def _get_credential(credentials: dict[str, str], key: str) -> str | None:
+    raw = credentials.get(key)
+    if raw is None:
+        return None
+    value = str(raw).strip()
+    return value or None
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import contextvars
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import urllib.parse
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+from ..storage import Storage
+
+
+# (host, path prefix, ttl seconds). First match wins; unmatched URLs are not cached.
+# Google text search is excluded on purpose: cached pages would carry expired next_page_tokens.
+CACHE_TTL_RULES: list[tuple[str, str, int]] = [
+    ("nominatim.openstreetmap.org", "/search", 30 * 24 * 3600),
+    ("maps.googleapis.com", "/maps/api/place/details/", 7 * 24 * 3600),
+    ("www.reddit.com", "/search", 15 * 60),
+    ("oauth.reddit.com", "/search", 15 * 60),
+    ("api.opencorporates.com", "/", 7 * 24 * 3600),
+]
+
+# Query parameters that carry credentials: never part of the cache key or the stored URL.
+CREDENTIAL_PARAMS = {"key", "api_key", "apikey", "token", "api_token", "access_token", "client_secret"}
+
+# Upstream error statuses reported inside a 200 response body (Google style).
+UNCACHEABLE_STATUSES = {"OVER_QUERY_LIMIT", "REQUEST_DENIED", "INVALID_REQUEST", "UNKNOWN_ERROR"}
+
+_BYPASS: contextvars.ContextVar[bool] = contextvars.ContextVar("response_cache_bypass", default=False)
+
+
+class ResponseCache:
+    """TTL + LRU cache of upstream JSON responses, stored in the ``http_cache`` table."""
+
+    def __init__(self, *, db_path: Path, max_entries: int = 5000):
+        self.db_path = Path(db_path)
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "bypassed": 0, "errors": 0}
+        with Storage(self.db_path) as storage:
+            storage.init_db()
+
+    def ttl_for(self, url: str) -> int:
+        parts = urllib.parse.urlsplit(url)
+        host = (parts.hostname or "").lower()
+        for rule_host, path_prefix, ttl_seconds in CACHE_TTL_RULES:
+            if host == rule_host and parts.path.startswith(path_prefix):
+                return ttl_seconds
+        return 0
+
+    def get(self, url: str) -> tuple[bool, Any]:
+        if not self.ttl_for(url):
+            return False, None
+        if _BYPASS.get():
+            self._count("bypassed")
+            return False, None
+        try:
+            with Storage(self.db_path) as storage:
+                raw = storage.get_http_cache(cache_key(url), _iso(datetime.now(timezone.utc)))
+        except sqlite3.Error:
+            self._count("errors")
+            return False, None
+        if raw is None:
+            self._count("misses")
+            return False, None
+        self._count("hits")
+        return True, json.loads(raw)
+
+    def put(self, url: str, payload: Any) -> None:
+        ttl_seconds = self.ttl_for(url)
+        if not ttl_seconds or not _is_cacheable(payload):
+            return
+        now = datetime.now(timezone.utc)
+        try:
+            with Storage(self.db_path) as storage:
+                evicted = storage.put_http_cache(
+                    cache_key=cache_key(url),
+                    url=strip_credentials(url),
+                    payload_json=json.dumps(payload, ensure_ascii=False),
+                    expires_at=_iso(now + timedelta(seconds=ttl_seconds)),
+                    now_utc=_iso(now),
+                    max_entries=self.max_entries,
+                )
+        except sqlite3.Error:
+            self._count("errors")
+            return
+        self._count("stores")
+        self._count("evictions", evicted)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_ratio"] = round(counters["hits"] / lookups, 4) if lookups else 0.0
+        counters["max_entries"] = self.max_entries
+        try:
+            with Storage(self.db_path) as storage:
+                counters.update(storage.get_http_cache_summary())
+        except sqlite3.Error:
+            pass
+        return counters
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += amount
+
+
+_CACHE: ResponseCache | None = None
+
+
+def response_cache_from_env(db_path: Path) -> ResponseCache | None:
+    """Cache in the main database, unless ``DISCOVERY_HTTP_CACHE=0`` disables it."""
+    if os.getenv("DISCOVERY_HTTP_CACHE", "1").strip().lower() in {"0", "false", "no", "off"}:
+        return None
+    return ResponseCache(
+        db_path=db_path,
+        max_entries=int(os.getenv("DISCOVERY_HTTP_CACHE_MAX_ENTRIES", "5000")),
+    )
+
+
+def configure_response_cache(cache: ResponseCache | None) -> None:
+    global _CACHE
+    _CACHE = cache
+
+
+def get_response_cache() -> ResponseCache | None:
+    return _CACHE
+
+
+@contextmanager
+def response_cache_bypass(enabled: bool = True) -> Iterator[None]:
+    """Skip cache reads (responses are still stored) for calls made in this context.
+
+    Worker threads do not inherit context: submit with ``contextvars.copy_context().run``.
+    """
+    token = _BYPASS.set(enabled)
+    try:
+        yield
+    finally:
+        _BYPASS.reset(token)
+
+
+def is_cache_bypassed() -> bool:
+    return _BYPASS.get()
+
+
+def strip_credentials(url: str) -> str:
+    parts = urllib.parse.urlsplit(url)
+    query = sorted(
+        (key, value)
+        for key, value in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in CREDENTIAL_PARAMS
+    )
+    return urllib.parse.urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", urllib.parse.urlencode(query), "")
+    )
+
+
+def cache_key(url: str) -> str:
+    return hashlib.sha256(strip_credentials(url).encode("utf-8")).hexdigest()
+
+
+def _is_cacheable(payload: Any) -> bool:
+    if isinstance(payload, dict):
+        status = payload.get("status")
+        if isinstance(status, str) and status.upper() in UNCACHEABLE_STATUSES:
+            return False
+    return True
+
+
+def _iso(value: datetime) -> str:
+    return value.isoformat()
@@ -5,12 +5,16 @@ import os
 import urllib.parse
 from typing import Any
 
+from .async_http import async_http_get_json, run_sync
 from .filter_utils import clean, passes_presence_filter
-from .http_utils import http_get_json
-from .models import DiscoveryFilters, SourceRecord
+from .models import DiscoveryFilters, ScanStats, SourceRecord
+from .paging import OverfetchController
 
 
 TOMTOM_SEARCH_URL = "https://api.tomtom.com/search/2/search/{query}.json"
+TOMTOM_MAX_PAGE_SIZE = 100
+# TomTom accepts ofs up to 1900 with limit up to 100.
+TOMTOM_MAX_RESULTS = 2000
 
 
 class TomTomSource:
@@ -18,30 +22,41 @@ class TomTomSource:
         self.api_key = api_key or os.getenv("TOMTOM_API_KEY")
         if not self.api_key:
             raise ValueError("Missing TOMTOM_API_KEY in environment.")
+        self.last_scan: ScanStats | None = None
 
     def search(self, filters: DiscoveryFilters) -> list[SourceRecord]:
+        return run_sync(self.asearch(filters))
+
+    async def asearch(self, filters: DiscoveryFilters) -> list[SourceRecord]:
         query = filters.merged_query() or "business"
         encoded_query = urllib.parse.quote(query, safe="")
         url = TOMTOM_SEARCH_URL.format(query=encoded_query)
-        payload = http_get_json(
-            url=url,
-            params={
-                "key": self.api_key,
-                "limit": min(filters.limit, 100),
-                "idxSet": "POI",
-                "typeahead": "false",
-            },
-            retries=4,
+        area: dict[str, Any] = {}
+        if filters.has_point():
+            area = {"lat": filters.latitude, "lon": filters.longitude}
+            if filters.radius_m:
+                area["radius"] = int(filters.radius_m)
+
+        async def fetch_page(offset: int, page_size: int) -> tuple[list[Any], bool]:
+            payload = await async_http_get_json(
+                url=url,
+                params={
+                    "key": self.api_key,
+                    "limit": page_size,
+                    "ofs": offset,
+                    "idxSet": "POI",
+                    "typeahead": "false",
+                    **area,
+                },
+                retries=4,
+            )
+            return payload.get("results") or [], False
+
+        controller = OverfetchController(
+            source="tomtom", filters=filters, max_page_size=TOMTOM_MAX_PAGE_SIZE, max_offset=TOMTOM_MAX_RESULTS
         )
-        results = payload.get("results") or []
-        records: list[SourceRecord] = []
-        for item in results:
-            record = self._to_record(item=item, filters=filters)
-            if record is None:
-                continue
-            records.append(record)
-            if len(records) >= filters.limit:
-                break
+        records = await controller.collect(fetch_page, lambda item: self._to_record(item=item, filters=filters))
+        self.last_scan = controller.scan
         return records
 
     def _to_record(self, *, item: dict[str, Any], filters: DiscoveryFilters) -> SourceRecord | None:
@@ -4,12 +4,17 @@ import json
 import os
 from typing import Any
 
+from .async_http import async_http_get_json, run_sync
 from .filter_utils import clean, passes_presence_filter, safe_float, safe_int
-from .http_utils import http_get_json
-from .models import DiscoveryFilters, SourceRecord
+from .models import DiscoveryFilters, ScanStats, SourceRecord
+from .paging import OverfetchController
 
 
 YELP_SEARCH_URL = "https://api.yelp.com/v3/businesses/search"
+YELP_MAX_PAGE_SIZE = 50
+# Yelp rejects searches where offset + limit exceeds this.
+YELP_MAX_RESULTS = 240
+YELP_MAX_RADIUS_M = 40000
 
 
 class YelpSource:
@@ -17,33 +22,45 @@ class YelpSource:
         self.api_key = api_key or os.getenv("YELP_API_KEY")
         if not self.api_key:
             raise ValueError("Missing YELP_API_KEY in environment.")
+        self.last_scan: ScanStats | None = None
 
     def search(self, filters: DiscoveryFilters) -> list[SourceRecord]:
-        if not filters.location:
+        return run_sync(self.asearch(filters))
+
+    async def asearch(self, filters: DiscoveryFilters) -> list[SourceRecord]:
+        if not filters.location and not filters.has_point():
             raise ValueError("Yelp discovery requires a location.")
 
         query = filters.query or (filters.niche.replace("_", " ") if filters.niche != "all" else "business")
-        payload = http_get_json(
-            url=YELP_SEARCH_URL,
-            params={
-                "term": query,
-                "location": filters.location,
-                "limit": min(filters.limit, 50),
-                "sort_by": "best_match",
-            },
-            headers={"Authorization": f"Bearer {self.api_key}"},
-            retries=4,
+
+        area: dict[str, Any] = {"location": filters.location}
+        if filters.has_point():
+            area = {
+                "latitude": filters.latitude,
+                "longitude": filters.longitude,
+                "radius": int(min(filters.radius_m or YELP_MAX_RADIUS_M, YELP_MAX_RADIUS_M)),
+            }
+
+        async def fetch_page(offset: int, page_size: int) -> tuple[list[Any], bool]:
+            payload = await async_http_get_json(
+                url=YELP_SEARCH_URL,
+                params={
+                    "term": query,
+                    **area,
+                    "limit": page_size,
+                    "offset": offset,
+                    "sort_by": "best_match",
+                },
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                retries=4,
+            )
+            return payload.get("businesses") or [], False
+
+        controller = OverfetchController(
+            source="yelp", filters=filters, max_page_size=YELP_MAX_PAGE_SIZE, max_offset=YELP_MAX_RESULTS
         )
-        results = payload.get("businesses") or []
-
-        records: list[SourceRecord] = []
-        for item in results:
-            record = self._to_record(item=item, filters=filters)
-            if record is None:
-                continue
-            records.append(record)
-            if len(records) >= filters.limit:
-                break
+        records = await controller.collect(fetch_page, lambda item: self._to_record(item=item, filters=filters))
+        self.last_scan = controller.scan
         return records
 
     def _to_record(self, *, item: dict[str, Any], filters: DiscoveryFilters) -> SourceRecord | None:
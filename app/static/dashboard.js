@@ -43,6 +43,7 @@
       sourceRatingLabel: "Rating minimo",
       ratingAny: "Cualquiera",
       sourceVerifiedLabel: "Solo perfiles verificados",
+      sourceEnrichLabel: "Incluir datos de contacto (web/telefono)",
       applyFiltersBtn: "Aplicar filtros",
       resetFiltersBtn: "Reiniciar",
       credentialInputLabel: "Credencial del modulo",
@@ -92,7 +93,12 @@
       exportTitle: "Exportar mensajes",
       formatLabel: "Formato",
       downloadBtn: "Descargar export",
-      exportHint: "Exporta la tabla completa de mensajes desde SQLite.",
+      exportTargetLabel: "Target (opcional)",
+      exportFromLabel: "Desde (UTC)",
+      exportToLabel: "Hasta (UTC)",
+      exportMediaLabel: "Con multimedia",
+      exportGzipLabel: "Comprimir transferencia (gzip)",
+      exportHint: "Exporta mensajes desde SQLite, con filtro opcional por target, fechas y multimedia.",
       manualTitle: "Manual rapido",
       manualStep1: "Configura tus credenciales en `.env`.",
       manualStep2: "Define `targets` en `config.json`.",
@@ -108,6 +114,12 @@
       summaryTargetsFailedLabel: "Targets fallidos",
       summaryNewMessagesLabel: "Mensajes nuevos",
       summaryFloodWaitsLabel: "Flood waits",
+      jobTitle: "Job de scrape",
+      jobStatusLabel: "Estado",
+      jobProgressLabel: "Progreso",
+      jobDeduplicatedHint: "Ya hay un scrape identico en cola o en ejecucion; se muestra ese job.",
+      jobCurrentTargetLabel: "Target actual",
+      jobLiveHint: "Progreso en vivo via Server-Sent Events.",
       dryInput: "Input",
       dryTargetId: "Target ID",
       dryResolved: "Resuelto",
@@ -202,6 +214,7 @@
       sourceRatingLabel: "Minimum rating",
       ratingAny: "Any",
       sourceVerifiedLabel: "Only verified profiles",
+      sourceEnrichLabel: "Include contact details (website/phone)",
       applyFiltersBtn: "Apply filters",
       resetFiltersBtn: "Reset",
       credentialInputLabel: "Module credential",
@@ -250,7 +263,12 @@
       exportTitle: "Export messages",
       formatLabel: "Format",
       downloadBtn: "Download export",
-      exportHint: "Exports the full messages table from SQLite.",
+      exportTargetLabel: "Target (optional)",
+      exportFromLabel: "From (UTC)",
+      exportToLabel: "To (UTC)",
+      exportMediaLabel: "Has media",
+      exportGzipLabel: "Compress transfer (gzip)",
+      exportHint: "Exports messages from SQLite, optionally filtered by target, date range and media.",
       manualTitle: "Quick manual",
       manualStep1: "Set your credentials in `.env`.",
       manualStep2: "Define `targets` in `config.json`.",
@@ -266,6 +284,12 @@
       summaryTargetsFailedLabel: "Targets failed",
       summaryNewMessagesLabel: "New messages",
       summaryFloodWaitsLabel: "Flood waits",
+      jobTitle: "Scrape job",
+      jobStatusLabel: "Status",
+      jobProgressLabel: "Progress",
+      jobDeduplicatedHint: "An identical scrape is already queued or running; showing that job.",
+      jobCurrentTargetLabel: "Current target",
+      jobLiveHint: "Live progress via Server-Sent Events.",
       dryInput: "Input",
       dryTargetId: "Target ID",
       dryResolved: "Resolved",
@@ -323,6 +347,11 @@
     telegram: { labelKey: "navTelegram", hintKey: "sourceHintTelegram" },
     google_maps: { labelKey: "navGoogleMaps", hintKey: "sourceHintGoogleMaps" },
     reddit: { labelKey: "navReddit", hintKey: "sourceHintReddit" },
+    openstreetmap: { labelKey: "navOpenStreetMap", hintKey: "sourceHintOpenStreetMap" },
+    foursquare: { labelKey: "navFoursquare", hintKey: "sourceHintFoursquare" },
+    yelp: { labelKey: "navYelp", hintKey: "sourceHintYelp" },
+    tomtom: { labelKey: "navTomTom", hintKey: "sourceHintTomTom" },
+    opencorporates: { labelKey: "navOpenCorporates", hintKey: "sourceHintOpenCorporates" },
   };
 
   const defaultTheme = "light";
@@ -334,6 +363,7 @@
     supports_verified_filter: true,
     supports_has_website_filter: true,
     supports_has_phone_filter: true,
+    supports_enrich: false,
     credential_required: false,
     credential_param: null,
     credential_env: null,
@@ -345,6 +375,7 @@
     google_maps: {
       ...baseCapability,
       supports_discovery_api: true,
+      supports_enrich: true,
       credential_required: true,
       credential_param: "api_key",
       credential_env: "GOOGLE_MAPS_API_KEY",
@@ -380,6 +411,7 @@
   const locationInput = document.getElementById("sourceLocation");
   const minRatingSelect = document.getElementById("minRating");
   const verifiedCheckbox = document.getElementById("onlyVerified");
+  const enrichCheckbox = document.getElementById("enrichDetails");
 
   const sourceFilterForm = document.getElementById("sourceFilterForm");
   const resetFiltersBtn = document.getElementById("resetFiltersBtn");
@@ -502,6 +534,7 @@
     setFieldEnabled(verifiedCheckbox, verifiedEnabled);
     setFieldEnabled(hasWebsiteSelect, websiteEnabled);
     setFieldEnabled(hasPhoneSelect, phoneEnabled);
+    setFieldEnabled(enrichCheckbox, Boolean(capabilities.supports_enrich));
 
     if (!ratingEnabled && minRatingSelect) {
       minRatingSelect.value = "0";
@@ -515,6 +548,9 @@
     if (!phoneEnabled && hasPhoneSelect) {
       hasPhoneSelect.value = "any";
     }
+    if (!capabilities.supports_enrich && enrichCheckbox) {
+      enrichCheckbox.checked = false;
+    }
 
     if (locationInput) {
       locationInput.required = !isTelegram && Boolean(capabilities.requires_location);
@@ -644,6 +680,7 @@
     const location = document.getElementById("sourceLocation")?.value.trim() || "";
     const minRatingRaw = document.getElementById("minRating")?.value || "0";
     const onlyVerified = Boolean(document.getElementById("onlyVerified")?.checked);
+    const enrich = Boolean(document.getElementById("enrichDetails")?.checked);
 
     const nicheLabel =
       document.querySelector(`#sourceNiche option[value="${nicheRaw}"]`)?.textContent?.trim() || nicheRaw;
@@ -673,6 +710,7 @@
       has_phone: hasPhoneRaw,
       min_rating: minRatingRaw,
       only_verified: onlyVerified,
+      enrich,
       limit: 20,
       credentials,
     };
@@ -882,12 +920,89 @@
     });
   }
 
+  const watchScrapeJob = () => {
+    const jobCard = document.getElementById("scrapeJob");
+    if (!jobCard || jobCard.dataset.jobDone === "true" || !window.EventSource) return;
+    const jobId = jobCard.dataset.jobId;
+    const statusEl = document.getElementById("scrapeJobStatus");
+    const progressEl = document.getElementById("scrapeJobProgress");
+    const messagesEl = document.getElementById("scrapeJobMessages");
+    const targetEl = document.getElementById("scrapeJobTarget");
+    const floodEl = document.getElementById("scrapeJobFloodWaits");
+    const logEl = document.getElementById("scrapeJobLog");
+    const state = { done: 0, total: 0, committed: 0, pending: 0, floodWaits: 0 };
+
+    const render = () => {
+      if (progressEl) progressEl.textContent = `${state.done}/${state.total}`;
+      if (messagesEl) messagesEl.textContent = String(state.committed + state.pending);
+      if (floodEl) floodEl.textContent = String(state.floodWaits);
+    };
+    const appendLog = (line) => {
+      if (!logEl) return;
+      const item = document.createElement("li");
+      item.textContent = line;
+      logEl.prepend(item);
+      while (logEl.children.length > 20) logEl.lastElementChild.remove();
+    };
+
+    const source = new EventSource(`/api/jobs/${jobId}/events`);
+    const on = (name, handler) =>
+      source.addEventListener(name, (event) => handler(JSON.parse(event.data || "null") || {}));
+
+    on("job", (job) => {
+      const progress = job.progress || {};
+      if (statusEl && job.status) statusEl.textContent = job.status;
+      state.done = progress.targets_done || 0;
+      state.total = progress.targets_total || 0;
+      state.committed = progress.messages_new || 0;
+      state.pending = 0;
+      render();
+      if (job.done) {
+        source.close();
+        window.location.assign(`/?job=${jobId}`);
+      }
+    });
+    on("job.start", () => {
+      if (statusEl) statusEl.textContent = "running";
+    });
+    on("target.start", (data) => {
+      state.total = data.total || state.total;
+      state.pending = 0;
+      if (targetEl) targetEl.textContent = data.target || "";
+      render();
+      appendLog(`${data.index}/${data.total} ${data.target}`);
+    });
+    on("batch.inserted", (data) => {
+      state.pending = data.new_messages || 0;
+      render();
+      appendLog(`${data.target}: +${data.inserted} (${data.processed})`);
+    });
+    on("telegram.flood_wait", (data) => {
+      state.floodWaits += 1;
+      render();
+      appendLog(`FloodWait ${Math.round(data.sleep_seconds || 0)}s`);
+    });
+    ["target.complete", "target.dry_run", "target.error"].forEach((name) =>
+      on(name, (data) => {
+        state.done += 1;
+        state.committed += data.new_messages || 0;
+        state.pending = 0;
+        render();
+        appendLog(data.error ? `${data.target}: ${data.error}` : `${data.target}: ok`);
+      })
+    );
+    on("job.finished", (data) => {
+      if (statusEl) statusEl.textContent = data.status;
+    });
+  };
+
   const initialize = async () => {
     await loadCapabilities();
     applyTheme(initialTheme);
     setPlatform(initialPlatform);
     applyLanguage(initialLanguage);
     renderResults([]);
+    watchScrapeJob();
   };
 
   initialize();
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import sqlite3
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 
 MESSAGE_COLUMNS = [
@@ -38,12 +38,37 @@ SOURCE_RECORD_COLUMNS = [
     "raw_json",
 ]
 
+SOURCE_RECORD_EXPORT_COLUMNS = [*SOURCE_RECORD_COLUMNS, "first_seen_at", "last_seen_at"]
+
+JOB_COLUMNS = [
+    "id",
+    "kind",
+    "target_key",
+    "params_json",
+    "status",
+    "progress_json",
+    "result_json",
+    "error_message",
+    "worker_id",
+    "created_at",
+    "started_at",
+    "finished_at",
+    "updated_at",
+]
+
+# Tables whose writes invalidate dashboard/stats responses (see get_change_token). ``messages`` is
+# not here: a per-row trigger would run on the scraper's hot path, so it bumps once per batch instead.
+CHANGE_TRACKED_TABLES = ["targets", "scrape_runs", "discovery_runs"]
+
 
 class Storage:
-    def __init__(self, db_path: Path):
+    def __init__(self, db_path: Path, *, read_only: bool = False):
         self.db_path = Path(db_path)
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(self.db_path)
+        if read_only:
+            self.conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True)
+        else:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self.conn = sqlite3.connect(self.db_path)
         self.conn.row_factory = sqlite3.Row
         self.conn.execute("PRAGMA foreign_keys = ON;")
 
@@ -147,9 +172,500 @@ class Storage:
                 status TEXT NOT NULL,
                 error_message TEXT
             );
+
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                target_key TEXT NOT NULL,
+                params_json TEXT NOT NULL,
+                status TEXT NOT NULL,
+                progress_json TEXT,
+                result_json TEXT,
+                error_message TEXT,
+                worker_id TEXT,
+                created_at TEXT NOT NULL,
+                started_at TEXT,
+                finished_at TEXT,
+                updated_at TEXT NOT NULL
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_jobs_status
+                ON jobs(status, target_key);
+
+            CREATE TABLE IF NOT EXISTS http_cache (
+                cache_key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                payload_json TEXT NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                created_at TEXT NOT NULL,
+                expires_at TEXT NOT NULL,
+                last_access_at TEXT NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_http_cache_access
+                ON http_cache(last_access_at);
+
+            CREATE TABLE IF NOT EXISTS osm_tiles (
+                geohash TEXT PRIMARY KEY,
+                elements_json TEXT NOT NULL,
+                element_count INTEGER NOT NULL,
+                fetched_at TEXT NOT NULL,
+                expires_at TEXT NOT NULL
+            );
+
+            CREATE TABLE IF NOT EXISTS business_entities (
+                entity_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT,
+                phone TEXT,
+                domain TEXT,
+                location TEXT,
+                record_count INTEGER NOT NULL DEFAULT 0,
+                sources TEXT,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            );
+
+            CREATE TABLE IF NOT EXISTS entity_members (
+                source TEXT NOT NULL,
+                external_id TEXT NOT NULL,
+                entity_id INTEGER NOT NULL,
+                name_norm TEXT NOT NULL,
+                phone_key TEXT,
+                phone_e164 TEXT,
+                domain TEXT,
+                lat REAL,
+                lon REAL,
+                location_norm TEXT,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (source, external_id)
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_entity_members_entity
+                ON entity_members(entity_id);
+
+            CREATE TABLE IF NOT EXISTS entity_block_keys (
+                block_key TEXT NOT NULL,
+                source TEXT NOT NULL,
+                external_id TEXT NOT NULL,
+                PRIMARY KEY (block_key, source, external_id)
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_entity_block_keys_record
+                ON entity_block_keys(source, external_id);
+
+            CREATE TABLE IF NOT EXISTS message_contacts (
+                kind TEXT NOT NULL,
+                value TEXT NOT NULL,
+                target_id INTEGER NOT NULL,
+                message_id INTEGER NOT NULL,
+                date_utc TEXT,
+                PRIMARY KEY (kind, value, target_id, message_id)
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_message_contacts_message
+                ON message_contacts(target_id, message_id);
+
+            CREATE TABLE IF NOT EXISTS sweep_runs (
+                sweep_id TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                location TEXT,
+                filters_json TEXT NOT NULL,
+                south REAL NOT NULL,
+                west REAL NOT NULL,
+                north REAL NOT NULL,
+                east REAL NOT NULL,
+                cell_size_m REAL NOT NULL,
+                max_depth INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                error_message TEXT,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            );
+
+            CREATE TABLE IF NOT EXISTS sweep_cells (
+                sweep_id TEXT NOT NULL,
+                cell_id TEXT NOT NULL,
+                depth INTEGER NOT NULL,
+                south REAL NOT NULL,
+                west REAL NOT NULL,
+                north REAL NOT NULL,
+                east REAL NOT NULL,
+                status TEXT NOT NULL,
+                result_count INTEGER NOT NULL DEFAULT 0,
+                new_count INTEGER NOT NULL DEFAULT 0,
+                finished_at TEXT NOT NULL,
+                PRIMARY KEY (sweep_id, cell_id)
+            );
+
+            CREATE TABLE IF NOT EXISTS sweep_records (
+                sweep_id TEXT NOT NULL,
+                external_id TEXT NOT NULL,
+                PRIMARY KEY (sweep_id, external_id)
+            );
+
+            CREATE TABLE IF NOT EXISTS change_counter (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                epoch TEXT NOT NULL,
+                value INTEGER NOT NULL
+            );
+
+            INSERT OR IGNORE INTO change_counter (id, epoch, value)
+            VALUES (1, lower(hex(randomblob(8))), 0);
+            """
+        )
+        self.conn.executescript(
+            "\n".join(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_{operation.lower()}_change
+                AFTER {operation} ON {table}
+                BEGIN
+                    UPDATE change_counter SET value = value + 1 WHERE id = 1;
+                END;
+                """
+                for table in CHANGE_TRACKED_TABLES
+                for operation in ("INSERT", "UPDATE", "DELETE")
+            )
+            + "".join(
+                f"DROP TRIGGER IF EXISTS trg_messages_{operation}_change;"
+                for operation in ("insert", "update", "delete")
+            )
+        )
+        self.conn.commit()
+
+    def get_http_cache(self, cache_key: str, now_utc: str) -> str | None:
+        row = self.conn.execute(
+            "SELECT payload_json FROM http_cache WHERE cache_key = ? AND expires_at > ?",
+            (cache_key, now_utc),
+        ).fetchone()
+        if row is None:
+            return None
+        self.conn.execute(
+            "UPDATE http_cache SET last_access_at = ?, hits = hits + 1 WHERE cache_key = ?",
+            (now_utc, cache_key),
+        )
+        self.conn.commit()
+        return str(row["payload_json"])
+
+    def put_http_cache(
+        self,
+        *,
+        cache_key: str,
+        url: str,
+        payload_json: str,
+        expires_at: str,
+        now_utc: str,
+        max_entries: int,
+    ) -> int:
+        """Store a response and evict expired, then least recently used, entries; returns evictions."""
+        self.conn.execute(
+            """
+            INSERT INTO http_cache (
+                cache_key, url, payload_json, size_bytes, created_at, expires_at, last_access_at, hits
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, 0)
+            ON CONFLICT(cache_key) DO UPDATE SET
+                url=excluded.url,
+                payload_json=excluded.payload_json,
+                size_bytes=excluded.size_bytes,
+                created_at=excluded.created_at,
+                expires_at=excluded.expires_at,
+                last_access_at=excluded.last_access_at
+            """,
+            (cache_key, url, payload_json, len(payload_json.encode("utf-8")), now_utc, expires_at, now_utc),
+        )
+        evicted = self.conn.execute("DELETE FROM http_cache WHERE expires_at <= ?", (now_utc,)).rowcount
+        overflow = int(self.conn.execute("SELECT COUNT(*) FROM http_cache").fetchone()[0]) - max_entries
+        if overflow > 0:
+            evicted += self.conn.execute(
+                """
+                DELETE FROM http_cache
+                WHERE cache_key IN (
+                    SELECT cache_key FROM http_cache ORDER BY last_access_at ASC LIMIT ?
+                )
+                """,
+                (overflow,),
+            ).rowcount
+        self.conn.commit()
+        return evicted
+
+    def get_http_cache_summary(self) -> dict[str, Any]:
+        row = self.conn.execute(
+            "SELECT COUNT(*) AS entries, COALESCE(SUM(size_bytes), 0) AS size_bytes FROM http_cache"
+        ).fetchone()
+        return dict(row)
+
+    def get_osm_tiles(self, geohashes: list[str], now_utc: str) -> dict[str, str]:
+        if not geohashes:
+            return {}
+        placeholders = ",".join("?" for _ in geohashes)
+        rows = self.conn.execute(
+            f"""
+            SELECT geohash, elements_json
+            FROM osm_tiles
+            WHERE geohash IN ({placeholders}) AND expires_at > ?
+            """,
+            [*geohashes, now_utc],
+        ).fetchall()
+        return {str(row["geohash"]): str(row["elements_json"]) for row in rows}
+
+    def put_osm_tiles(self, rows: list[dict[str, Any]], now_utc: str) -> None:
+        """Upsert fetched tiles and drop expired ones."""
+        self.conn.executemany(
+            """
+            INSERT INTO osm_tiles (geohash, elements_json, element_count, fetched_at, expires_at)
+            VALUES (:geohash, :elements_json, :element_count, :fetched_at, :expires_at)
+            ON CONFLICT(geohash) DO UPDATE SET
+                elements_json=excluded.elements_json,
+                element_count=excluded.element_count,
+                fetched_at=excluded.fetched_at,
+                expires_at=excluded.expires_at
+            """,
+            rows,
+        )
+        self.conn.execute("DELETE FROM osm_tiles WHERE expires_at <= ?", (now_utc,))
+        self.conn.commit()
+
+    def get_entity_member(self, source: str, external_id: str) -> dict[str, Any] | None:
+        row = self.conn.execute(
+            """
+            SELECT source, external_id, entity_id, name_norm, phone_key, phone_e164, domain, lat, lon, location_norm
+            FROM entity_members
+            WHERE source = ? AND external_id = ?
+            """,
+            (source, external_id),
+        ).fetchone()
+        return dict(row) if row else None
+
+    def get_entity_candidates(
+        self,
+        block_keys: list[str],
+        *,
+        exclude: tuple[str, str],
+        max_block_size: int,
+    ) -> list[dict[str, Any]]:
+        """Members sharing at least one block key, with the keys they share.
+
+        Blocks larger than ``max_block_size`` (very common trigrams, shared call-center
+        numbers) are skipped: they cost many comparisons and rarely decide a match.
+        """
+        if not block_keys:
+            return []
+        placeholders = ",".join("?" for _ in block_keys)
+        rows = self.conn.execute(
+            f"""
+            WITH usable AS (
+                SELECT block_key
+                FROM entity_block_keys
+                WHERE block_key IN ({placeholders})
+                GROUP BY block_key
+                HAVING COUNT(*) <= ?
+            )
+            SELECT m.source, m.external_id, m.entity_id, m.name_norm, m.phone_key, m.phone_e164,
+                   m.domain, m.lat, m.lon, m.location_norm, GROUP_CONCAT(k.block_key, ' ') AS shared_keys
+            FROM entity_block_keys k
+            JOIN usable u ON u.block_key = k.block_key
+            JOIN entity_members m ON m.source = k.source AND m.external_id = k.external_id
+            WHERE NOT (k.source = ? AND k.external_id = ?)
+            GROUP BY m.source, m.external_id
+            """,
+            [*block_keys, max_block_size, exclude[0], exclude[1]],
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def create_business_entity(self, now_utc: str) -> int:
+        cursor = self.conn.execute(
+            "INSERT INTO business_entities (record_count, created_at, updated_at) VALUES (0, ?, ?)",
+            (now_utc, now_utc),
+        )
+        self.conn.commit()
+        return int(cursor.lastrowid)
+
+    def save_entity_member(
+        self,
+        member: dict[str, Any],
+        block_keys: list[str],
+        *,
+        merge_entity_ids: list[int],
+        now_utc: str,
+    ) -> None:
+        """Store a member and its block keys, fold ``merge_entity_ids`` into its entity and refresh it."""
+        entity_id = member["entity_id"]
+        self.conn.execute(
+            "DELETE FROM entity_block_keys WHERE source = ? AND external_id = ?",
+            (member["source"], member["external_id"]),
+        )
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO entity_block_keys (block_key, source, external_id) VALUES (?, ?, ?)",
+            [(key, member["source"], member["external_id"]) for key in block_keys],
+        )
+        self.conn.execute(
+            """
+            INSERT INTO entity_members (
+                source, external_id, entity_id, name_norm, phone_key, phone_e164,
+                domain, lat, lon, location_norm, updated_at
+            )
+            VALUES (
+                :source, :external_id, :entity_id, :name_norm, :phone_key, :phone_e164,
+                :domain, :lat, :lon, :location_norm, :updated_at
+            )
+            ON CONFLICT(source, external_id) DO UPDATE SET
+                entity_id=excluded.entity_id,
+                name_norm=excluded.name_norm,
+                phone_key=excluded.phone_key,
+                phone_e164=excluded.phone_e164,
+                domain=excluded.domain,
+                lat=excluded.lat,
+                lon=excluded.lon,
+                location_norm=excluded.location_norm,
+                updated_at=excluded.updated_at
+            """,
+            {**member, "updated_at": now_utc},
+        )
+        for merged_id in merge_entity_ids:
+            self.conn.execute("UPDATE entity_members SET entity_id = ? WHERE entity_id = ?", (entity_id, merged_id))
+            self.conn.execute("DELETE FROM business_entities WHERE entity_id = ?", (merged_id,))
+        self.conn.execute(
+            """
+            UPDATE business_entities SET
+                record_count = (SELECT COUNT(*) FROM entity_members WHERE entity_id = :entity_id),
+                sources = (SELECT GROUP_CONCAT(DISTINCT source) FROM entity_members WHERE entity_id = :entity_id),
+                name = (
+                    SELECT r.name
+                    FROM entity_members m
+                    JOIN source_records r ON r.source = m.source AND r.external_id = m.external_id
+                    WHERE m.entity_id = :entity_id
+                    ORDER BY r.first_seen_at, r.source
+                    LIMIT 1
+                ),
+                phone = (
+                    SELECT phone_e164 FROM entity_members
+                    WHERE entity_id = :entity_id AND phone_e164 IS NOT NULL
+                    LIMIT 1
+                ),
+                domain = (
+                    SELECT domain FROM entity_members
+                    WHERE entity_id = :entity_id AND domain IS NOT NULL
+                    LIMIT 1
+                ),
+                location = (
+                    SELECT r.location
+                    FROM entity_members m
+                    JOIN source_records r ON r.source = m.source AND r.external_id = m.external_id
+                    WHERE m.entity_id = :entity_id AND r.location IS NOT NULL
+                    ORDER BY r.first_seen_at
+                    LIMIT 1
+                ),
+                updated_at = :now_utc
+            WHERE entity_id = :entity_id
+            """,
+            {"entity_id": entity_id, "now_utc": now_utc},
+        )
+        self.conn.commit()
+
+    def get_entity_summary(self) -> dict[str, Any]:
+        row = self.conn.execute(
+            """
+            SELECT
+                (SELECT COUNT(*) FROM business_entities) AS entities,
+                (SELECT COUNT(*) FROM entity_members) AS records,
+                (SELECT COUNT(*) FROM business_entities WHERE record_count > 1) AS multi_record_entities
+            """
+        ).fetchone()
+        return dict(row)
+
+    def get_sweep_run(self, sweep_id: str) -> dict[str, Any] | None:
+        row = self.conn.execute(
+            """
+            SELECT sweep_id, source, location, filters_json, south, west, north, east,
+                   cell_size_m, max_depth, status, error_message, created_at, updated_at
+            FROM sweep_runs
+            WHERE sweep_id = ?
+            """,
+            (sweep_id,),
+        ).fetchone()
+        return dict(row) if row else None
+
+    def save_sweep_run(self, row: dict[str, Any], now_utc: str) -> None:
+        self.conn.execute(
+            """
+            INSERT INTO sweep_runs (
+                sweep_id, source, location, filters_json, south, west, north, east,
+                cell_size_m, max_depth, status, error_message, created_at, updated_at
+            )
+            VALUES (
+                :sweep_id, :source, :location, :filters_json, :south, :west, :north, :east,
+                :cell_size_m, :max_depth, :status, :error_message, :now_utc, :now_utc
+            )
+            ON CONFLICT(sweep_id) DO UPDATE SET
+                status=excluded.status,
+                error_message=excluded.error_message,
+                updated_at=excluded.updated_at
+            """,
+            {"error_message": None, **row, "now_utc": now_utc},
+        )
+        self.conn.commit()
+
+    def delete_sweep(self, sweep_id: str) -> None:
+        for table in ("sweep_records", "sweep_cells", "sweep_runs"):
+            self.conn.execute(f"DELETE FROM {table} WHERE sweep_id = ?", (sweep_id,))
+        self.conn.commit()
+
+    def get_sweep_cells(self, sweep_id: str) -> dict[str, dict[str, Any]]:
+        rows = self.conn.execute(
+            """
+            SELECT cell_id, depth, south, west, north, east, status, result_count, new_count, finished_at
+            FROM sweep_cells
+            WHERE sweep_id = ?
+            """,
+            (sweep_id,),
+        ).fetchall()
+        return {str(row["cell_id"]): dict(row) for row in rows}
+
+    def save_sweep_cell(self, sweep_id: str, cell: dict[str, Any], external_ids: list[str], now_utc: str) -> int:
+        """Checkpoint a finished cell and its records in one transaction; returns the records new to the sweep."""
+        cursor = self.conn.executemany(
+            "INSERT OR IGNORE INTO sweep_records (sweep_id, external_id) VALUES (?, ?)",
+            [(sweep_id, external_id) for external_id in external_ids],
+        )
+        new_count = max(cursor.rowcount, 0)
+        self.conn.execute(
             """
+            INSERT OR REPLACE INTO sweep_cells (
+                sweep_id, cell_id, depth, south, west, north, east, status, result_count, new_count, finished_at
+            )
+            VALUES (
+                :sweep_id, :cell_id, :depth, :south, :west, :north, :east, :status, :result_count, :new_count, :now_utc
+            )
+            """,
+            {**cell, "sweep_id": sweep_id, "new_count": new_count, "now_utc": now_utc},
         )
         self.conn.commit()
+        return new_count
+
+    def count_sweep_records(self, sweep_id: str) -> int:
+        row = self.conn.execute(
+            "SELECT COUNT(*) AS total FROM sweep_records WHERE sweep_id = ?", (sweep_id,)
+        ).fetchone()
+        return int(row["total"]) if row else 0
+
+    def get_change_token(self) -> str | None:
+        """Return ``<epoch>-<counter>``; it changes whenever a tracked table is written.
+
+        ``None`` means the database has not been initialised yet.
+        """
+        try:
+            row = self.conn.execute("SELECT epoch, value FROM change_counter WHERE id = 1").fetchone()
+        except sqlite3.OperationalError:
+            return None
+        if row is None:
+            return None
+        return f"{row['epoch']}-{row['value']}"
+
+    def bump_change_counter(self) -> None:
+        """Invalidate the change token once for a batch of untracked writes (inserted messages)."""
+        self.conn.execute("UPDATE change_counter SET value = value + 1 WHERE id = 1")
+        self.conn.commit()
 
     def upsert_target(
         self,
@@ -223,6 +739,80 @@ class Storage:
         self.conn.commit()
         return cursor.rowcount > 0
 
+    def save_message_contacts(self, rows: list[dict[str, Any]]) -> int:
+        cursor = self.conn.executemany(
+            """
+            INSERT OR IGNORE INTO message_contacts (kind, value, target_id, message_id, date_utc)
+            VALUES (:kind, :value, :target_id, :message_id, :date_utc)
+            """,
+            rows,
+        )
+        self.conn.commit()
+        return max(cursor.rowcount, 0)
+
+    def replace_message_contacts(self, message_keys: list[tuple[int, int]], rows: list[dict[str, Any]]) -> None:
+        """Swap the contacts of ``message_keys`` (target_id, message_id) for ``rows`` in one transaction."""
+        self.conn.executemany(
+            "DELETE FROM message_contacts WHERE target_id = ? AND message_id = ?",
+            message_keys,
+        )
+        self.conn.executemany(
+            """
+            INSERT OR IGNORE INTO message_contacts (kind, value, target_id, message_id, date_utc)
+            VALUES (:kind, :value, :target_id, :message_id, :date_utc)
+            """,
+            rows,
+        )
+        self.conn.commit()
+
+    def find_contact_targets(self, kind: str, value: str) -> list[dict[str, Any]]:
+        """Targets that posted ``value``; served from the message_contacts primary key."""
+        rows = self.conn.execute(
+            """
+            SELECT c.target_id, t.target_username, t.title, COUNT(*) AS messages,
+                   MIN(c.date_utc) AS first_seen, MAX(c.date_utc) AS last_seen
+            FROM message_contacts c
+            LEFT JOIN targets t ON t.target_id = c.target_id
+            WHERE c.kind = ? AND c.value = ?
+            GROUP BY c.target_id
+            ORDER BY messages DESC, c.target_id ASC
+            """,
+            (kind, value),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_message_contact_summary(self) -> dict[str, int]:
+        rows = self.conn.execute(
+            "SELECT kind, COUNT(*) AS total FROM message_contacts GROUP BY kind ORDER BY kind ASC"
+        ).fetchall()
+        return {str(row["kind"]): int(row["total"]) for row in rows}
+
+    def get_message_rowid_bounds(self) -> tuple[int, int] | None:
+        row = self.conn.execute("SELECT MIN(rowid) AS first, MAX(rowid) AS last FROM messages").fetchone()
+        if row is None or row["first"] is None:
+            return None
+        return int(row["first"]), int(row["last"])
+
+    def get_messages_in_rowid_range(
+        self, first_rowid: int, last_rowid: int, *, target_ids: list[int] | None = None
+    ) -> list[dict[str, Any]]:
+        clauses = ["rowid BETWEEN ? AND ?"]
+        params: list[Any] = [first_rowid, last_rowid]
+        if target_ids is not None:
+            if not target_ids:
+                return []
+            clauses.append(f"target_id IN ({', '.join('?' for _ in target_ids)})")
+            params.extend(target_ids)
+        rows = self.conn.execute(
+            f"""
+            SELECT target_id, message_id, date_utc, text, entities_json
+            FROM messages
+            WHERE {' AND '.join(clauses)}
+            """,
+            params,
+        ).fetchall()
+        return [dict(row) for row in rows]
+
     def get_all_messages(self) -> list[dict[str, Any]]:
         rows = self.conn.execute(
             """
@@ -235,6 +825,101 @@ class Storage:
         ).fetchall()
         return [dict(row) for row in rows]
 
+    def find_target_ids(self, target: str) -> list[int]:
+        username = target.lstrip("@")
+        rows = self.conn.execute(
+            """
+            SELECT target_id
+            FROM targets
+            WHERE target_input = ? OR target_username = ? COLLATE NOCASE
+            ORDER BY target_id ASC
+            """,
+            (f"@{username}", username),
+        ).fetchall()
+        return [int(row["target_id"]) for row in rows]
+
+    def get_message_target_ids(self) -> list[int]:
+        rows = self.conn.execute(
+            "SELECT DISTINCT target_id FROM messages ORDER BY target_id ASC"
+        ).fetchall()
+        return [int(row["target_id"]) for row in rows]
+
+    def get_message_months(
+        self,
+        target_id: int,
+        *,
+        date_from: str | None = None,
+        date_to: str | None = None,
+    ) -> list[str]:
+        clauses = ["target_id = ?"]
+        params: list[Any] = [target_id]
+        if date_from:
+            clauses.append("date_utc >= ?")
+            params.append(date_from)
+        if date_to:
+            clauses.append("date_utc <= ?")
+            params.append(date_to)
+        rows = self.conn.execute(
+            f"""
+            SELECT DISTINCT substr(date_utc, 1, 7) AS month
+            FROM messages
+            WHERE {' AND '.join(clauses)}
+            ORDER BY month ASC
+            """,
+            params,
+        ).fetchall()
+        return [str(row["month"]) for row in rows if row["month"]]
+
+    def iter_messages(
+        self,
+        *,
+        columns: list[str] | None = None,
+        target_ids: list[int] | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        has_media: str = "any",
+        batch_size: int = 1000,
+    ) -> Iterator[dict[str, Any]]:
+        selected = list(columns or MESSAGE_COLUMNS)
+        unknown = [column for column in selected if column not in MESSAGE_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown message columns: {', '.join(unknown)}")
+
+        clauses: list[str] = []
+        params: list[Any] = []
+        if target_ids is not None:
+            if not target_ids:
+                return
+            clauses.append(f"target_id IN ({', '.join('?' for _ in target_ids)})")
+            params.extend(target_ids)
+        if date_from:
+            clauses.append("date_utc >= ?")
+            params.append(date_from)
+        if date_to:
+            clauses.append("date_utc <= ?")
+            params.append(date_to)
+        if has_media == "yes":
+            clauses.append("media_type IS NOT NULL")
+        elif has_media == "no":
+            clauses.append("media_type IS NULL")
+
+        # Ordering by the idx_messages_target_date key lets SQLite answer date ranges from that index.
+        if date_from or date_to:
+            order_by = "target_id ASC, date_utc ASC, message_id ASC"
+        else:
+            order_by = "target_id ASC, message_id ASC"
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        cursor = self.conn.execute(
+            f"SELECT {', '.join(selected)} FROM messages {where} ORDER BY {order_by}",
+            params,
+        )
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield dict(row)
+
     def get_target_stats(self) -> list[dict[str, Any]]:
         rows = self.conn.execute(
             """
@@ -314,6 +999,14 @@ class Storage:
             payload.extend([now_utc, now_utc])
             values.append(tuple(payload))
 
+        # A lazy rediscovery (raw_json.details null) of a record whose paid details were already
+        # fetched keeps those details and the Maps URL they carried, so it is not enriched twice.
+        keeps_details = """(
+                json_valid(excluded.raw_json)
+                AND json_valid(source_records.raw_json)
+                AND json_type(excluded.raw_json, '$.details') = 'null'
+                AND json_type(source_records.raw_json, '$.details') = 'object'
+            )"""
         cursor = self.conn.executemany(
             f"""
             INSERT INTO source_records (
@@ -324,16 +1017,22 @@ class Storage:
             VALUES ({placeholders}, ?, ?)
             ON CONFLICT(source, external_id) DO UPDATE SET
                 name=excluded.name,
-                url=excluded.url,
+                url=CASE WHEN {keeps_details} THEN source_records.url ELSE excluded.url END,
                 description=excluded.description,
-                website=excluded.website,
-                phone=excluded.phone,
+                website=COALESCE(excluded.website, source_records.website),
+                phone=COALESCE(excluded.phone, source_records.phone),
                 rating=excluded.rating,
                 review_count=excluded.review_count,
                 location=excluded.location,
                 niche=excluded.niche,
                 is_verified=excluded.is_verified,
-                raw_json=excluded.raw_json,
+                raw_json=CASE
+                    WHEN {keeps_details}
+                    THEN json_set(
+                        excluded.raw_json, '$.details', json(json_extract(source_records.raw_json, '$.details'))
+                    )
+                    ELSE excluded.raw_json
+                END,
                 last_seen_at=excluded.last_seen_at
             """,
             values,
@@ -370,6 +1069,125 @@ class Storage:
             ).fetchall()
         return [dict(row) for row in rows]
 
+    def iter_source_records(
+        self,
+        *,
+        columns: list[str] | None = None,
+        source: str | None = None,
+        niche: str | None = None,
+        location: str | None = None,
+        min_rating: float = 0.0,
+        has_website: str = "any",
+        has_phone: str = "any",
+        batch_size: int = 1000,
+    ) -> Iterator[dict[str, Any]]:
+        selected = list(columns or SOURCE_RECORD_EXPORT_COLUMNS)
+        unknown = [column for column in selected if column not in SOURCE_RECORD_EXPORT_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown source record columns: {', '.join(unknown)}")
+
+        clauses: list[str] = []
+        params: list[Any] = []
+        if source:
+            clauses.append("source = ?")
+            params.append(source)
+        if niche:
+            clauses.append("niche = ?")
+            params.append(niche)
+        if location:
+            clauses.append("location LIKE ? ESCAPE '\\'")
+            escaped = location.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%{escaped}%")
+        if min_rating > 0:
+            clauses.append("rating >= ?")
+            params.append(min_rating)
+        for column, mode in (("website", has_website), ("phone", has_phone)):
+            if mode == "yes":
+                clauses.append(f"COALESCE(TRIM({column}), '') != ''")
+            elif mode == "no":
+                clauses.append(f"COALESCE(TRIM({column}), '') = ''")
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        cursor = self.conn.execute(
+            f"SELECT {', '.join(selected)} FROM source_records {where} ORDER BY source ASC, external_id ASC",
+            params,
+        )
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield dict(row)
+
+    def get_source_records_by_ids(self, ids: list[tuple[str, str]]) -> list[dict[str, Any]]:
+        rows: list[dict[str, Any]] = []
+        # Chunked to stay under SQLite's bound-parameter limit.
+        for start in range(0, len(ids), 400):
+            chunk = ids[start : start + 400]
+            placeholders = " OR ".join("(source = ? AND external_id = ?)" for _ in chunk)
+            params = [value for pair in chunk for value in pair]
+            rows.extend(
+                dict(row)
+                for row in self.conn.execute(
+                    f"""
+                    SELECT source, external_id, name, website, phone, location, raw_json
+                    FROM source_records
+                    WHERE {placeholders}
+                    """,
+                    params,
+                ).fetchall()
+            )
+        return rows
+
+    def get_source_record_ids(self, source: str | None = None) -> list[tuple[str, str]]:
+        if source:
+            rows = self.conn.execute(
+                "SELECT source, external_id FROM source_records WHERE source = ? ORDER BY first_seen_at, external_id",
+                (source,),
+            ).fetchall()
+        else:
+            rows = self.conn.execute(
+                "SELECT source, external_id FROM source_records ORDER BY first_seen_at, source, external_id"
+            ).fetchall()
+        return [(str(row["source"]), str(row["external_id"])) for row in rows]
+
+    def get_source_records_pending_details(self, source: str, limit: int) -> list[dict[str, Any]]:
+        """Records stored without deferred details (``raw_json.details`` is null) and no contact data."""
+        rows = self.conn.execute(
+            """
+            SELECT external_id, raw_json
+            FROM source_records
+            WHERE source = ?
+              AND website IS NULL
+              AND phone IS NULL
+              AND json_extract(raw_json, '$.details') IS NULL
+            ORDER BY last_seen_at DESC
+            LIMIT ?
+            """,
+            (source, limit),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def update_source_record_details(self, source: str, rows: list[dict[str, Any]]) -> int:
+        if not rows:
+            return 0
+        cursor = self.conn.executemany(
+            """
+            UPDATE source_records
+            SET url = COALESCE(?, url),
+                website = ?,
+                phone = ?,
+                raw_json = ?
+            WHERE source = ? AND external_id = ?
+            """,
+            [
+                (row.get("url"), row.get("website"), row.get("phone"), row["raw_json"], source, row["external_id"])
+                for row in rows
+            ],
+        )
+        self.conn.commit()
+        return cursor.rowcount
+
     def insert_discovery_run(self, row: dict[str, Any]) -> None:
         self.conn.execute(
             """
@@ -438,3 +1256,125 @@ class Storage:
                 (safe_limit,),
             ).fetchall()
         return [dict(row) for row in rows]
+
+    def insert_job(self, *, kind: str, target_key: str, params_json: str, now_utc: str) -> int:
+        cursor = self.conn.execute(
+            """
+            INSERT INTO jobs (kind, target_key, params_json, status, created_at, updated_at)
+            VALUES (?, ?, ?, 'queued', ?, ?)
+            """,
+            (kind, target_key, params_json, now_utc, now_utc),
+        )
+        self.conn.commit()
+        return int(cursor.lastrowid)
+
+    def find_active_job(self, *, kind: str, target_key: str, params_json: str) -> dict[str, Any] | None:
+        row = self.conn.execute(
+            f"""
+            SELECT {", ".join(JOB_COLUMNS)}
+            FROM jobs
+            WHERE kind = ? AND target_key = ? AND params_json = ? AND status IN ('queued', 'running')
+            ORDER BY id ASC
+            LIMIT 1
+            """,
+            (kind, target_key, params_json),
+        ).fetchone()
+        return dict(row) if row else None
+
+    def claim_next_job(self, *, worker_id: str, now_utc: str, stale_before: str) -> dict[str, Any] | None:
+        # IMMEDIATE takes the write lock up front so two processes cannot claim the same job.
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute(
+                """
+                UPDATE jobs
+                SET status = 'failed', error_message = 'Job heartbeat expired.', finished_at = ?, updated_at = ?
+                WHERE status = 'running' AND updated_at < ?
+                """,
+                (now_utc, now_utc, stale_before),
+            )
+            row = self.conn.execute(
+                f"""
+                SELECT {", ".join(f"queued.{column}" for column in JOB_COLUMNS)}
+                FROM jobs AS queued
+                WHERE queued.status = 'queued'
+                  AND NOT EXISTS (
+                      SELECT 1
+                      FROM jobs AS running
+                      WHERE running.status = 'running'
+                        AND (
+                            running.target_key = queued.target_key
+                            OR (
+                                running.kind = 'scrape'
+                                AND queued.kind = 'scrape'
+                                AND (running.target_key = '*' OR queued.target_key = '*')
+                            )
+                        )
+                  )
+                ORDER BY queued.id ASC
+                LIMIT 1
+                """
+            ).fetchone()
+            if row is None:
+                self.conn.commit()
+                return None
+            self.conn.execute(
+                """
+                UPDATE jobs
+                SET status = 'running', worker_id = ?, started_at = ?, updated_at = ?
+                WHERE id = ?
+                """,
+                (worker_id, now_utc, now_utc, row["id"]),
+            )
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        job = dict(row)
+        job.update(status="running", worker_id=worker_id, started_at=now_utc, updated_at=now_utc)
+        return job
+
+    def update_job_progress(self, job_id: int, progress_json: str, now_utc: str) -> None:
+        self.conn.execute(
+            "UPDATE jobs SET progress_json = ?, updated_at = ? WHERE id = ? AND status = 'running'",
+            (progress_json, now_utc, job_id),
+        )
+        self.conn.commit()
+
+    def touch_job(self, job_id: int, *, worker_id: str, now_utc: str) -> bool:
+        """Heartbeat of a running job; ``False`` once the job is no longer running on ``worker_id``."""
+        cursor = self.conn.execute(
+            "UPDATE jobs SET updated_at = ? WHERE id = ? AND status = 'running' AND worker_id = ?",
+            (now_utc, job_id, worker_id),
+        )
+        self.conn.commit()
+        return cursor.rowcount > 0
+
+    def finish_job(
+        self,
+        job_id: int,
+        *,
+        worker_id: str,
+        status: str,
+        now_utc: str,
+        result_json: str | None = None,
+        error_message: str | None = None,
+    ) -> bool:
+        """Record a job's outcome; ``False`` (nothing written) when it was already expired or reclaimed."""
+        cursor = self.conn.execute(
+            """
+            UPDATE jobs
+            SET status = ?, result_json = ?, error_message = ?, finished_at = ?, updated_at = ?
+            WHERE id = ? AND status = 'running' AND worker_id = ?
+            """,
+            (status, result_json, error_message, now_utc, now_utc, job_id, worker_id),
+        )
+        self.conn.commit()
+        return cursor.rowcount > 0
+
+    def get_job(self, job_id: int) -> dict[str, Any] | None:
+        row = self.conn.execute(
+            f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs WHERE id = ?",
+            (job_id,),
+        ).fetchone()
+        return dict(row) if row else None
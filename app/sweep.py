@@ -0,0 +1,365 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass, replace
+from typing import Any, Callable
+
+from .discovery import DiscoveryService, DiscoverySummary
+from .entity_resolution import resolve_records
+from .sources.async_http import async_http_get_json, run_sync, submit
+from .sources.capabilities import get_source_capabilities
+from .sources.models import DiscoveryFilters
+from .sources.osm_tiles import distance_m
+from .sources.registry import get_source_spec
+from .storage import Storage
+from .utils import utc_now_iso
+
+
+NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
+DEFAULT_CELL_SIZE_M = 3000.0
+DEFAULT_MAX_DEPTH = 3
+MIN_CELL_SIZE_M = 200.0
+MAX_ROOT_CELLS = 400
+# Consecutive failed cells (bad key, quota exhausted, upstream down) that abort the sweep.
+MAX_CONSECUTIVE_FAILURES = 5
+
+
+@dataclass(frozen=True)
+class GridCell:
+    """A lat/lon rectangle searched as the smallest circle that covers it.
+
+    Root cells are ``r<row>c<col>``; each subdivision appends the quadrant (``.0``-``.3``),
+    so ids are stable across runs and double as checkpoint keys.
+    """
+
+    cell_id: str
+    depth: int
+    south: float
+    west: float
+    north: float
+    east: float
+
+    def center(self) -> tuple[float, float]:
+        return (self.south + self.north) / 2, (self.west + self.east) / 2
+
+    def radius_m(self) -> float:
+        lat, lon = self.center()
+        return max(distance_m(lat, lon, self.north, self.east), distance_m(lat, lon, self.south, self.west))
+
+    def split(self) -> list["GridCell"]:
+        lat, lon = self.center()
+        quadrants = (
+            (self.south, self.west, lat, lon),
+            (self.south, lon, lat, self.east),
+            (lat, self.west, self.north, lon),
+            (lat, lon, self.north, self.east),
+        )
+        return [
+            GridCell(f"{self.cell_id}.{index}", self.depth + 1, *bounds) for index, bounds in enumerate(quadrants)
+        ]
+
+    def to_row(self) -> dict[str, Any]:
+        return {
+            "cell_id": self.cell_id,
+            "depth": self.depth,
+            "south": self.south,
+            "west": self.west,
+            "north": self.north,
+            "east": self.east,
+        }
+
+
+def grid_cells(bbox: tuple[float, float, float, float], cell_size_m: float) -> list[GridCell]:
+    """Root cells of about ``cell_size_m`` per side covering ``bbox`` (south, west, north, east)."""
+    south, west, north, east = bbox
+    mid_lat = (south + north) / 2
+    height_m = distance_m(south, west, north, west)
+    width_m = distance_m(mid_lat, west, mid_lat, east)
+    rows = max(1, math.ceil(height_m / cell_size_m))
+    cols = max(1, math.ceil(width_m / cell_size_m))
+    if rows * cols > MAX_ROOT_CELLS:
+        raise ValueError(
+            f"The area needs {rows * cols} cells of {cell_size_m:g} m (max {MAX_ROOT_CELLS}); use a larger cell_size_m."
+        )
+    lat_step = (north - south) / rows
+    lon_step = (east - west) / cols
+    return [
+        GridCell(
+            f"r{row}c{col}",
+            0,
+            south + row * lat_step,
+            west + col * lon_step,
+            south + (row + 1) * lat_step,
+            west + (col + 1) * lon_step,
+        )
+        for row in range(rows)
+        for col in range(cols)
+    ]
+
+
+def sweep_id_for(
+    source: str,
+    filters: DiscoveryFilters,
+    *,
+    cell_size_m: float,
+    max_depth: int,
+    bbox: tuple[float, float, float, float] | None = None,
+) -> str:
+    """Same source, filters and grid give the same id, so re-running a sweep resumes it."""
+    area = [float(value) for value in bbox] if bbox else None
+    key = json.dumps([source, filters.to_api_dict(), float(cell_size_m), int(max_depth), area], sort_keys=True)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
+async def geocode_bbox(location: str) -> tuple[float, float, float, float]:
+    """Bounding box (south, west, north, east) of a place name from Nominatim."""
+    payload = await async_http_get_json(
+        url=NOMINATIM_URL,
+        params={"q": location, "format": "jsonv2", "limit": 1},
+        headers={"User-Agent": os.getenv("OSM_USER_AGENT", "proyectos-sass-scraper/1.0 (contact: local-admin)")},
+        retries=4,
+    )
+    if not isinstance(payload, list) or not payload or len(payload[0].get("boundingbox") or []) != 4:
+        raise ValueError(f"Could not resolve a bounding box for location: {location}")
+    south, north, west, east = (float(value) for value in payload[0]["boundingbox"])
+    return south, west, north, east
+
+
+def run_sweep(
+    storage: Storage,
+    service: DiscoveryService,
+    *,
+    source: str,
+    filters: DiscoveryFilters,
+    credentials: dict[str, str] | None = None,
+    cell_size_m: float = DEFAULT_CELL_SIZE_M,
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    bbox: tuple[float, float, float, float] | None = None,
+    restart: bool = False,
+    use_cache: bool = True,
+    on_progress: Callable[[dict[str, Any]], None] | None = None,
+) -> dict[str, Any]:
+    """Search every cell of the location's bounding box and store the deduplicated records.
+
+    Cells run concurrently on the discovery I/O loop, at most the source's
+    ``max_concurrency`` at a time and within its QPS (``source_slot``). A cell whose
+    search left upstream candidates unseen (limit or the source's per-search cap) is
+    split into four and searched again, down to
+    ``max_depth``. Each finished cell is checkpointed with its records, so calling
+    again with the same arguments skips the cells already done.
+    """
+    capabilities = get_source_capabilities(source)
+    if not capabilities.get("supports_point_search"):
+        raise ValueError(f"{source} does not support area sweeps.")
+    if cell_size_m < MIN_CELL_SIZE_M:
+        raise ValueError(f"cell_size_m must be at least {MIN_CELL_SIZE_M:g}.")
+    if max_depth < 0:
+        raise ValueError("max_depth must be 0 or greater.")
+    if bbox is None and not filters.location:
+        raise ValueError("An area sweep requires a location or a bbox.")
+    if bbox is not None:
+        south, west, north, east = bbox
+        if not (-90 <= south < north <= 90 and -180 <= west < east <= 180):
+            raise ValueError("bbox must be south,west,north,east with south < north and west < east.")
+
+    sweep_id = sweep_id_for(source, filters, cell_size_m=cell_size_m, max_depth=max_depth, bbox=bbox)
+    if restart:
+        storage.delete_sweep(sweep_id)
+    run = storage.get_sweep_run(sweep_id)
+    if run is not None:
+        area = (float(run["south"]), float(run["west"]), float(run["north"]), float(run["east"]))
+    else:
+        area = bbox or run_sync(geocode_bbox(filters.location))
+    run_row = {
+        "sweep_id": sweep_id,
+        "source": source,
+        "location": filters.location,
+        "filters_json": json.dumps(filters.to_api_dict(), ensure_ascii=False, sort_keys=True),
+        "south": area[0],
+        "west": area[1],
+        "north": area[2],
+        "east": area[3],
+        "cell_size_m": cell_size_m,
+        "max_depth": max_depth,
+        "status": "running",
+    }
+    started_at = utc_now_iso()
+    storage.save_sweep_run(run_row, started_at)
+
+    checkpoints = storage.get_sweep_cells(sweep_id)
+    stats: dict[str, Any] = {
+        "sweep_id": sweep_id,
+        "source": source,
+        "status": "running",
+        "cells_total": 0,
+        "cells_done": 0,
+        "cells_split": 0,
+        "cells_capped": 0,
+        "cells_failed": 0,
+        "cells_resumed": 0,
+        "records": storage.count_sweep_records(sweep_id),
+        "new_records": 0,
+    }
+    pending: deque[GridCell] = deque()
+    for cell in grid_cells(area, cell_size_m):
+        _expand(cell, checkpoints, pending, stats)
+
+    max_results = capabilities.get("max_results_per_search")
+    concurrency = max(1, get_source_spec(source).max_concurrency)
+    running: dict[Future, GridCell] = {}
+    consecutive_failures = 0
+    resolved: set[str] = set()
+    service.logger.info(
+        "Sweep started",
+        extra={"event": "sweep.start", "sweep_id": sweep_id, "source": source, "pending_cells": len(pending)},
+    )
+    try:
+        while pending or running:
+            while pending and len(running) < concurrency:
+                cell = pending.popleft()
+                lat, lon = cell.center()
+                cell_filters = replace(filters, latitude=lat, longitude=lon, radius_m=round(cell.radius_m()))
+                future = submit(
+                    service.arun(source=source, filters=cell_filters, credentials=credentials, use_cache=use_cache)
+                )
+                running[future] = cell
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                cell = running.pop(future)
+                records, summary, _, _ = future.result()
+                if summary.status != "ok":
+                    stats["cells_failed"] += 1
+                    consecutive_failures += 1
+                    service.logger.error(
+                        "Sweep cell failed",
+                        extra={
+                            "event": "sweep.cell_error",
+                            "sweep_id": sweep_id,
+                            "cell_id": cell.cell_id,
+                            "error_message": summary.error_message,
+                        },
+                    )
+                    if consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
+                        raise ValueError(
+                            f"Sweep stopped after {consecutive_failures} failed cells in a row: {summary.error_message}"
+                        )
+                    continue
+                consecutive_failures = 0
+                stats["new_records"] += _store_cell(
+                    storage,
+                    sweep_id,
+                    cell,
+                    records,
+                    saturated=_is_saturated(summary.scan, records, limit=filters.limit, max_results=max_results),
+                    max_depth=max_depth,
+                    pending=pending,
+                    stats=stats,
+                    resolved=resolved,
+                )
+                stats["records"] = storage.count_sweep_records(sweep_id)
+                if on_progress is not None:
+                    on_progress({**stats, "cell_id": cell.cell_id, "cell_results": len(records)})
+    except BaseException as exc:
+        for future in running:
+            future.cancel()
+        stats["status"] = "failed" if isinstance(exc, Exception) else "interrupted"
+        storage.save_sweep_run({**run_row, "status": stats["status"], "error_message": str(exc) or None}, utc_now_iso())
+        raise
+
+    # Failed cells stay unchecked: the next run with the same arguments retries only those.
+    stats["status"] = "completed" if stats["cells_failed"] == 0 else "partial"
+    finished_at = utc_now_iso()
+    storage.save_sweep_run({**run_row, "status": stats["status"]}, finished_at)
+    summary = DiscoverySummary(
+        source=source,
+        started_at=started_at,
+        finished_at=finished_at,
+        result_count=stats["records"],
+        status="ok" if stats["status"] == "completed" else "error",
+        error_message=None if stats["status"] == "completed" else f"{stats['cells_failed']} sweep cells failed.",
+    )
+    storage.insert_discovery_run(summary.to_storage_row(filters))
+    service.logger.info("Sweep finished", extra={"event": "sweep.finished", **stats})
+    return stats
+
+
+def _expand(
+    cell: GridCell, checkpoints: dict[str, dict[str, Any]], pending: deque[GridCell], stats: dict[str, Any]
+) -> None:
+    """Queue ``cell`` unless a checkpoint already covers it (split cells queue their unfinished children)."""
+    stats["cells_total"] += 1
+    checkpoint = checkpoints.get(cell.cell_id)
+    if checkpoint is None:
+        pending.append(cell)
+        return
+    stats["cells_resumed"] += 1
+    _count_status(str(checkpoint["status"]), stats)
+    if checkpoint["status"] == "split":
+        for child in cell.split():
+            _expand(child, checkpoints, pending, stats)
+
+
+def _store_cell(
+    storage: Storage,
+    sweep_id: str,
+    cell: GridCell,
+    records: list[Any],
+    *,
+    saturated: bool,
+    max_depth: int,
+    pending: deque[GridCell],
+    stats: dict[str, Any],
+    resolved: set[str],
+) -> int:
+    now_utc = utc_now_iso()
+    storage.upsert_source_records([record.to_storage_row() for record in records], now_utc)
+    # Overlapping cells (and a split cell's children) return the same places; resolve each once per run.
+    fresh = [record for record in records if record.external_id not in resolved]
+    resolve_records(storage, [(record.source, record.external_id) for record in fresh])
+    resolved.update(record.external_id for record in fresh)
+
+    if saturated and cell.depth < max_depth:
+        status = "split"
+    else:
+        status = "capped" if saturated else "done"
+    new_count = storage.save_sweep_cell(
+        sweep_id,
+        {**cell.to_row(), "status": status, "result_count": len(records)},
+        [record.external_id for record in records],
+        now_utc,
+    )
+    _count_status(status, stats)
+    if status == "split":
+        children = cell.split()
+        stats["cells_total"] += len(children)
+        pending.extend(children)
+    return new_count
+
+
+def _is_saturated(
+    scan: dict[str, Any] | None, records: list[Any], *, limit: int, max_results: int | None
+) -> bool:
+    """Whether upstream had more for this cell than one search returned.
+
+    Decided from upstream candidates, not kept records: a dense cell whose results were
+    thinned by local filters (has_website, min_rating, ...) must still be split.
+    """
+    if scan is None:
+        return len(records) >= min(limit, max_results or limit)
+    if scan.get("truncated"):
+        return True
+    # Sources that stop at a hard cap without saying so (Google's 60 results, no further page token).
+    return max_results is not None and int(scan.get("scanned") or 0) >= max_results
+
+
+def _count_status(status: str, stats: dict[str, Any]) -> None:
+    stats["cells_done"] += 1
+    if status == "split":
+        stats["cells_split"] += 1
+    elif status == "capped":
+        stats["cells_capped"] += 1
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import asyncio
+import atexit
+import logging
+import threading
 from dataclasses import dataclass
-from typing import Any
-
-from telethon import TelegramClient
-from telethon.sessions import StringSession
+from typing import Any, Awaitable, Callable, TypeVar
 
 from .config import TelegramSettings, normalize_target
+from .utils import utc_now_iso
+
+
+T = TypeVar("T")
 
 
 @dataclass
@@ -20,6 +25,10 @@ class ResolvedTarget:
 
 class TelegramClientManager:
     def __init__(self, settings: TelegramSettings):
+        # Telethon is imported here so the web process only pays for it when a scrape runs.
+        from telethon import TelegramClient
+        from telethon.sessions import StringSession
+
         self.settings = settings
         session = (
             StringSession(settings.string_session)
@@ -65,3 +74,153 @@ class TelegramClientManager:
             title=title,
             entity=entity,
         )
+
+
+class PersistentTelegramClient:
+    """Long-lived Telethon client owned by a dedicated asyncio loop thread.
+
+    Other threads hand work to the loop through :meth:`submit`, so the MTProto
+    connection, authorization and Telethon's entity cache survive across scrapes.
+    """
+
+    def __init__(
+        self,
+        settings_loader: Callable[[], TelegramSettings],
+        logger: logging.Logger,
+        *,
+        health_interval_seconds: float = 60.0,
+        health_timeout_seconds: float = 15.0,
+    ):
+        self._settings_loader = settings_loader
+        self.logger = logger
+        self.health_interval_seconds = health_interval_seconds
+        self.health_timeout_seconds = health_timeout_seconds
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._connect_lock: asyncio.Lock | None = None
+        self._health_task: asyncio.Task | None = None
+        self._manager: TelegramClientManager | None = None
+        self._authorized = False
+        self._state: dict[str, Any] = {
+            "connected": False,
+            "authorized": False,
+            "connects": 0,
+            "last_connected_at": None,
+            "last_health_check_at": None,
+            "last_error": None,
+        }
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run() -> None:
+                asyncio.set_event_loop(loop)
+                self._connect_lock = asyncio.Lock()
+                self._health_task = loop.create_task(self._health_loop())
+                ready.set()
+                loop.run_forever()
+                loop.close()
+
+            thread = threading.Thread(target=run, name="telegram-client-loop", daemon=True)
+            thread.start()
+            ready.wait()
+            self._loop = loop
+            self._thread = thread
+            atexit.register(self.shutdown)
+
+    def submit(
+        self,
+        work: Callable[[TelegramClientManager], Awaitable[T]],
+        *,
+        timeout_seconds: float | None = None,
+    ) -> T:
+        self.start()
+
+        async def runner() -> T:
+            manager = await self._ensure_connected()
+            return await work(manager)
+
+        future = asyncio.run_coroutine_threadsafe(runner(), self._loop)
+        return future.result(timeout=timeout_seconds)
+
+    def status(self) -> dict[str, Any]:
+        return {"running": self._thread is not None, **self._state}
+
+    def shutdown(self, timeout_seconds: float = 10.0) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+        if loop is None or thread is None:
+            return
+
+        try:
+            asyncio.run_coroutine_threadsafe(self._close(), loop).result(timeout=timeout_seconds)
+        except Exception:
+            self.logger.exception("Telegram client shutdown failed", extra={"event": "telegram.shutdown_error"})
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=timeout_seconds)
+        self.logger.info("Telegram client stopped", extra={"event": "telegram.shutdown"})
+
+    async def _ensure_connected(self) -> TelegramClientManager:
+        async with self._connect_lock:
+            if self._manager is None:
+                self._manager = TelegramClientManager(self._settings_loader())
+            if not self._manager.client.is_connected() or not self._authorized:
+                try:
+                    await self._manager.connect(allow_interactive=False)
+                except Exception as exc:
+                    self._authorized = False
+                    self._state.update(connected=False, authorized=False, last_error=str(exc))
+                    raise
+                self._authorized = True
+                self._state.update(
+                    connected=True,
+                    authorized=True,
+                    connects=self._state["connects"] + 1,
+                    last_connected_at=utc_now_iso(),
+                    last_error=None,
+                )
+                self.logger.info(
+                    "Telegram client connected",
+                    extra={"event": "telegram.connected", "connects": self._state["connects"]},
+                )
+            return self._manager
+
+    async def _health_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_interval_seconds)
+            if self._manager is None or not self._authorized:
+                continue
+            try:
+                await asyncio.wait_for(self._manager.client.get_me(), timeout=self.health_timeout_seconds)
+                self._state.update(connected=True, last_health_check_at=utc_now_iso(), last_error=None)
+            except Exception as exc:
+                self._state.update(connected=False, last_health_check_at=utc_now_iso(), last_error=str(exc))
+                self.logger.error(
+                    "Telegram health check failed. Reconnecting.",
+                    extra={"event": "telegram.health_error", "error": str(exc)},
+                )
+                try:
+                    await self._manager.disconnect()
+                except Exception:
+                    pass
+                self._authorized = False
+                try:
+                    await self._ensure_connected()
+                except Exception:
+                    self.logger.exception("Telegram reconnect failed", extra={"event": "telegram.reconnect_error"})
+
+    async def _close(self) -> None:
+        if self._health_task is not None:
+            self._health_task.cancel()
+        if self._manager is not None:
+            await self._manager.disconnect()
+            self._manager = None
+        self._authorized = False
+        self._state.update(connected=False, authorized=False)
@@ -1,29 +1,63 @@
 from __future__ import annotations
 
-import asyncio
+import json
 import os
+import zlib
+from dataclasses import asdict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, TypeVar
 
 from flask import Flask, Response, jsonify, render_template, request, send_file
 
-from .config import load_app_config, load_dotenv, load_telegram_settings
+from .coalescing import RequestCoalescer
+from .config import (
+    load_app_config,
+    load_dotenv,
+    load_telegram_settings,
+    normalize_target,
+)
+from .contact_extraction import normalize_contact
 from .discovery import (
+    DEFAULT_SOURCE_TIMEOUT_SECONDS,
+    ENRICHABLE_SOURCES,
     DiscoveryService,
     SUPPORTED_DISCOVERY_SOURCES,
+    enrich_source_records,
     get_ui_capabilities_with_runtime,
 )
-from .exporters import export_messages
+from .entity_resolution import resolve_records
+from .events import EventBus
+from .exporters import (
+    MessageExportFilters,
+    SourceRecordExportFilters,
+    iter_export_chunks,
+    iter_filtered_messages,
+    iter_filtered_source_records,
+)
+from .jobs import JobContext, JobQueue, job_channel
 from .sources.capabilities import get_source_capabilities
 from .sources.models import DiscoveryFilters
-from .scraper import ScrapeSummary, TelegramScraper
+from .sources.osm_tiles import configure_tile_cache, get_tile_cache, tile_cache_from_env
+from .sources.registry import source_limits_stats
+from .sources.response_cache import (
+    configure_response_cache,
+    get_response_cache,
+    response_cache_from_env,
+)
 from .storage import Storage
-from .telegram_client import TelegramClientManager
+from .sweep import DEFAULT_CELL_SIZE_M, DEFAULT_MAX_DEPTH, run_sweep
+from .telegram_client import PersistentTelegramClient
 from .utils import setup_logging, utc_now_iso
 
+if TYPE_CHECKING:
+    from .scraper import ScrapeSummary
+    from .telegram_client import TelegramClientManager
+
 DISABLED_DISCOVERY_SOURCES = {"instagram", "linkedin"}
 
+T = TypeVar("T")
+
 
 def _build_paths(
     config_path: Path | None,
@@ -68,69 +102,164 @@ def create_app(
 
     logger = setup_logging(paths["log_path"])
     app.config["logger"] = logger
+    app.config["event_bus"] = EventBus()
+    app.config["stats_cache"] = {}
+    app.config["discovery_coalescer"] = RequestCoalescer(
+        grace_seconds=float(os.getenv("DISCOVERY_COALESCE_GRACE_SECONDS", "3"))
+    )
+    configure_response_cache(response_cache_from_env(paths["db_path"]))
+    configure_tile_cache(tile_cache_from_env(paths["db_path"]))
+    app.config["job_queue"] = JobQueue(
+        db_path=paths["db_path"],
+        handlers={
+            "scrape": lambda job: _run_scrape_job(app, job),
+            "enrich": lambda job: _run_enrich_job(app, job),
+            "sweep": lambda job: _run_sweep_job(app, job),
+        },
+        logger=logger,
+        workers=int(os.getenv("SCRAPER_JOB_WORKERS", "1")),
+        event_bus=app.config["event_bus"],
+    )
+    app.config["telegram_client"] = PersistentTelegramClient(
+        settings_loader=lambda: load_telegram_settings(
+            paths["env_path"] if paths["env_path"].exists() else None
+        ),
+        logger=logger,
+    )
 
     @app.get("/")
     def dashboard():
+        scrape_job = None
+        job_id = request.args.get("job", type=int)
+        if job_id:
+            scrape_job = app.config["job_queue"].get(job_id)
+
+        scrape_summary = None
+        scrape_error = None
+        if scrape_job and scrape_job["status"] == "succeeded":
+            scrape_summary = scrape_job["result"]
+        elif scrape_job and scrape_job["status"] == "failed":
+            scrape_error = scrape_job["error_message"]
+
         return render_template(
             "dashboard.html",
             **_build_dashboard_view(app),
-            scrape_summary=None,
-            scrape_error=None,
+            scrape_job=scrape_job,
+            scrape_job_deduplicated=False,
+            scrape_summary=scrape_summary,
+            scrape_error=scrape_error,
         )
 
     @app.post("/scrape")
     def run_scrape():
-        target = (request.form.get("target") or "").strip() or None
-        backfill = bool(request.form.get("backfill"))
-        dry_run = bool(request.form.get("dry_run"))
-        dashboard_data = _build_dashboard_view(app)
+        payload = request.get_json(silent=True) or request.form
+        wants_json = request.is_json or request.accept_mimetypes.best == "application/json"
+        target = (str(payload.get("target") or "")).strip() or None
+        params = {
+            "target": target,
+            "backfill": bool(payload.get("backfill")),
+            "dry_run": bool(payload.get("dry_run")),
+        }
 
         try:
-            summary = asyncio.run(
-                _execute_scrape(
-                    app=app,
-                    target=target,
-                    backfill=backfill,
-                    dry_run=dry_run,
-                )
-            )
-            return render_template(
-                "dashboard.html",
-                **dashboard_data,
-                scrape_summary=summary,
-                scrape_error=None,
-            )
-        except Exception as exc:
+            target_key = normalize_target(target) if target else "*"
+            job, deduplicated = app.config["job_queue"].enqueue("scrape", params, target_key=target_key)
+        except ValueError as exc:
+            if wants_json:
+                return jsonify({"status": "error", "message": str(exc)}), 400
             return render_template(
                 "dashboard.html",
-                **dashboard_data,
+                **_build_dashboard_view(app),
+                scrape_job=None,
+                scrape_job_deduplicated=False,
                 scrape_summary=None,
                 scrape_error=str(exc),
             )
 
-    @app.post("/export")
+        if wants_json:
+            return jsonify({"status": "queued", "deduplicated": deduplicated, "job": job}), 202
+        return render_template(
+            "dashboard.html",
+            **_build_dashboard_view(app),
+            scrape_job=job,
+            scrape_job_deduplicated=deduplicated,
+            scrape_summary=None,
+            scrape_error=None,
+        )
+
+    @app.get("/api/telegram/status")
+    def api_telegram_status():
+        return jsonify(app.config["telegram_client"].status())
+
+    @app.get("/api/jobs/<int:job_id>")
+    def api_job(job_id: int):
+        job = app.config["job_queue"].get(job_id)
+        if job is None:
+            return jsonify({"status": "error", "message": f"Job not found: {job_id}"}), 404
+        return jsonify(job)
+
+    @app.get("/api/jobs/<int:job_id>/events")
+    def api_job_events(job_id: int):
+        if app.config["job_queue"].get(job_id) is None:
+            return jsonify({"status": "error", "message": f"Job not found: {job_id}"}), 404
+        return Response(
+            _stream_job_events(app, job_id),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    @app.route("/export", methods=["GET", "POST"])
     def run_export():
-        output_format = (request.form.get("format") or "csv").strip().lower()
+        output_format = (request.values.get("format") or "csv").strip().lower()
         if output_format not in {"csv", "json"}:
             output_format = "csv"
 
-        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-        output_path = app.config["exports_dir"] / f"messages_{timestamp}.{output_format}"
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            filters = MessageExportFilters.from_payload(request.values)
+        except ValueError as exc:
+            return Response(str(exc), status=400)
+
+        return _export_response(
+            app=app,
+            prefix="messages",
+            output_format=output_format,
+            columns=list(filters.columns),
+            rows_factory=lambda storage: iter_filtered_messages(storage, filters),
+            log_extra={
+                "target": filters.target,
+                "date_from": filters.date_from,
+                "date_to": filters.date_to,
+                "has_media": filters.has_media,
+            },
+        )
 
-        with _open_storage(app) as storage:
-            count = export_messages(storage, output_format, output_path)
+    @app.get("/export/records")
+    def run_records_export():
+        output_format = (request.values.get("format") or "csv").strip().lower()
+        if output_format not in {"csv", "ndjson"}:
+            output_format = "csv"
 
-        logger.info(
-            "Web export complete",
-            extra={
-                "event": "web.export.complete",
-                "format": output_format,
-                "rows": count,
-                "path": str(output_path),
+        try:
+            filters = SourceRecordExportFilters.from_payload(request.values)
+        except ValueError as exc:
+            return Response(str(exc), status=400)
+
+        return _export_response(
+            app=app,
+            prefix="source_records",
+            output_format=output_format,
+            columns=list(filters.columns),
+            rows_factory=lambda storage: iter_filtered_source_records(storage, filters),
+            log_extra={
+                "source": filters.source,
+                "niche": filters.niche,
+                "location": filters.location,
+                "min_rating": filters.min_rating,
+                "has_website": filters.has_website,
+                "has_phone": filters.has_phone,
+                "include_raw": filters.include_raw,
             },
         )
-        return send_file(output_path, as_attachment=True, download_name=output_path.name)
 
     @app.get("/health")
     def health():
@@ -149,48 +278,134 @@ def create_app(
 
     @app.get("/api/stats")
     def api_stats():
+        token = _read_change_token(app)
+        etag = f"stats-{token}"
+        if token is not None and request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            def build() -> bytes:
+                with _open_storage(app) as storage:
+                    target_rows = storage.get_target_stats()
+                    runs = storage.get_recent_runs(limit=10)
+                    discovery_runs = storage.get_recent_discovery_runs(limit=10)
+                payload = {"targets": target_rows, "runs": runs, "discovery_runs": discovery_runs}
+                return (app.json.dumps(payload) + "\n").encode("utf-8")
+
+            body = _cached(app, "api_stats", token, build)
+            response = Response(body, mimetype="application/json")
+        if token is not None:
+            response.set_etag(etag)
+            response.headers["Cache-Control"] = "no-cache"
+        return response
+
+    @app.get("/api/contacts")
+    def api_contacts():
+        kind = str(request.args.get("kind") or "").strip().lower()
+        raw_value = str(request.args.get("value") or "").strip()
+        try:
+            value = normalize_contact(kind, raw_value)
+        except ValueError as exc:
+            return jsonify({"status": "error", "message": str(exc)}), 400
+        if not value:
+            return jsonify({"status": "error", "message": f"Invalid {kind} value: {raw_value!r}"}), 400
         with _open_storage(app) as storage:
-            target_rows = storage.get_target_stats()
-            runs = storage.get_recent_runs(limit=10)
-            discovery_runs = storage.get_recent_discovery_runs(limit=10)
-        return jsonify({"targets": target_rows, "runs": runs, "discovery_runs": discovery_runs})
+            targets = storage.find_contact_targets(kind, value)
+        return jsonify({"kind": kind, "value": value, "targets": targets})
 
     @app.get("/api/capabilities")
     def api_capabilities():
         return jsonify({"platforms": get_ui_capabilities_with_runtime()})
 
-    @app.post("/api/discover")
-    def api_discover():
-        payload = request.get_json(silent=True) or {}
-        source = str(payload.get("platform", "")).strip().lower()
+    @app.get("/api/discover/stats")
+    def api_discover_stats():
+        response_cache = get_response_cache()
+        tile_cache = get_tile_cache()
+        with _open_storage(app) as storage:
+            entities = storage.get_entity_summary()
+        return jsonify(
+            {
+                "coalescing": app.config["discovery_coalescer"].stats(),
+                "entities": entities,
+                "response_cache": response_cache.stats() if response_cache is not None else None,
+                "osm_tiles": tile_cache.stats() if tile_cache is not None else None,
+                "source_limits": source_limits_stats(),
+            }
+        )
 
-        if source == "telegram":
-            return (
-                jsonify(
-                    {
-                        "status": "error",
-                        "source": source,
-                        "message": "Telegram discovery is not exposed in /api/discover. Use /scrape workflow.",
-                    }
-                ),
-                400,
-            )
-        if source in DISABLED_DISCOVERY_SOURCES:
+    @app.post("/api/discover/enrich")
+    def api_discover_enrich():
+        payload = request.get_json(silent=True) or {}
+        source = str(payload.get("platform") or "google_maps").strip().lower()
+        if source not in ENRICHABLE_SOURCES:
             return (
                 jsonify(
                     {
                         "status": "error",
                         "source": source,
-                        "message": (
-                            f"{source.capitalize()} connector is disabled due platform restrictions on automated "
-                            "data collection without explicit authorization."
-                        ),
+                        "message": f"Enrichment is not supported for source: {source}",
                     }
                 ),
                 400,
             )
-        if source not in SUPPORTED_DISCOVERY_SOURCES:
-            return jsonify({"status": "error", "message": f"Unsupported source: {source}"}), 400
+        try:
+            limit = int(payload.get("limit", 100))
+        except (TypeError, ValueError):
+            return jsonify({"status": "error", "message": "limit must be a valid integer."}), 400
+
+        job, deduplicated = app.config["job_queue"].enqueue(
+            "enrich",
+            {"source": source, "limit": min(max(limit, 1), 1000)},
+            target_key=f"enrich:{source}",
+        )
+        return jsonify({"status": "queued", "deduplicated": deduplicated, "job": job}), 202
+
+    @app.post("/api/discover/sweep")
+    def api_discover_sweep():
+        payload = request.get_json(silent=True) or {}
+        source = str(payload.get("platform") or "").strip().lower()
+        source_error = _discovery_source_error(source)
+        if not source_error and not get_source_capabilities(source).get("supports_point_search"):
+            source_error = f"Area sweeps are not supported for source: {source}"
+        if source_error:
+            return jsonify({"status": "error", "source": source, "message": source_error}), 400
+        try:
+            filters = DiscoveryFilters.from_payload({"limit": 100, **payload})
+            cell_size_m = float(payload.get("cell_size_m") or DEFAULT_CELL_SIZE_M)
+            max_depth = int(payload.get("max_depth", DEFAULT_MAX_DEPTH))
+            bbox = payload.get("bbox")
+            if bbox is not None and (not isinstance(bbox, list) or len(bbox) != 4):
+                raise ValueError("bbox must be [south, west, north, east].")
+            if bbox is None and not filters.location:
+                raise ValueError("An area sweep requires a location or a bbox.")
+        except (TypeError, ValueError) as exc:
+            return jsonify({"status": "error", "source": source, "message": str(exc)}), 400
+
+        # Credentials come from the environment only: job params are persisted in SQLite.
+        job, deduplicated = app.config["job_queue"].enqueue(
+            "sweep",
+            {
+                "source": source,
+                "filters": filters.to_api_dict(),
+                "cell_size_m": cell_size_m,
+                "max_depth": max_depth,
+                "bbox": [float(value) for value in bbox] if bbox is not None else None,
+                "restart": bool(payload.get("restart")),
+                "no_cache": bool(payload.get("no_cache")),
+            },
+            target_key=f"sweep:{source}",
+        )
+        return jsonify({"status": "queued", "deduplicated": deduplicated, "job": job}), 202
+
+    @app.post("/api/discover")
+    def api_discover():
+        payload = request.get_json(silent=True) or {}
+        if "platforms" in payload:
+            return _discover_many(app, payload)
+
+        source = str(payload.get("platform", "")).strip().lower()
+        source_error = _discovery_source_error(source)
+        if source_error:
+            return jsonify({"status": "error", "source": source, "message": source_error}), 400
 
         try:
             filters = DiscoveryFilters.from_payload(payload)
@@ -199,15 +414,17 @@ def create_app(
 
         credentials = _extract_credentials(payload)
 
-        service = DiscoveryService(logger=app.config["logger"])
+        service = DiscoveryService(logger=app.config["logger"], coalescer=app.config["discovery_coalescer"])
         records, summary, warnings, effective_filters = service.run(
             source=source,
             filters=filters,
             credentials=credentials,
+            use_cache=not bool(payload.get("no_cache")),
         )
 
         with _open_storage(app) as storage:
             storage.upsert_source_records([item.to_storage_row() for item in records], utc_now_iso())
+            _resolve_entities(app, storage, records)
             storage.insert_discovery_run(summary.to_storage_row(effective_filters))
             latest = storage.get_source_records(source=source, limit=20)
             recent_runs = storage.get_recent_discovery_runs(source=source, limit=6)
@@ -242,6 +459,7 @@ def create_app(
                 "warnings": warnings,
                 "applied_filters": effective_filters.to_api_dict(),
                 "capabilities": get_source_capabilities(source),
+                "scan": summary.scan,
                 "message": "Discovery completed.",
             }
         )
@@ -258,9 +476,11 @@ def _build_dashboard_view(app: Flask) -> dict[str, Any]:
     except Exception as exc:
         config_error = str(exc)
 
-    with _open_storage(app) as storage:
-        target_rows = storage.get_target_stats()
-        runs = storage.get_recent_runs(limit=8)
+    def build() -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        with _open_storage(app) as storage:
+            return storage.get_target_stats(), storage.get_recent_runs(limit=8)
+
+    target_rows, runs = _cached(app, "dashboard_stats", _read_change_token(app), build)
 
     total_messages = sum(int(item.get("total_messages") or 0) for item in target_rows)
     return {
@@ -282,38 +502,269 @@ def _open_storage(app: Flask) -> Storage:
     return storage
 
 
+def _read_change_token(app: Flask) -> str | None:
+    # Single-row lookup without init_db: this runs before deciding whether any stats SQL is needed.
+    if not Path(app.config["db_path"]).exists():
+        return None
+    with Storage(app.config["db_path"]) as storage:
+        return storage.get_change_token()
+
+
+def _cached(app: Flask, key: str, token: str | None, build: Callable[[], T]) -> T:
+    """Return ``build()`` memoised per change token; ``None`` tokens are never cached."""
+    cache: dict[str, tuple[str, Any]] = app.config["stats_cache"]
+    entry = cache.get(key)
+    if token is not None and entry is not None and entry[0] == token:
+        return entry[1]
+    value = build()
+    if token is not None:
+        cache[key] = (token, value)
+    return value
+
+
+def _run_scrape_job(app: Flask, job: JobContext) -> dict[str, Any]:
+    progress: dict[str, Any] = {"targets_done": 0, "targets_total": 0, "messages_new": 0}
+
+    def on_event(event: str, payload: dict[str, Any]) -> None:
+        job.publish(event, payload)
+        # Only target-level transitions are persisted; batch events stay on the live bus.
+        if event == "target.start":
+            progress["current_target"] = payload.get("target")
+            progress["targets_total"] = payload.get("total", 0)
+        elif event in TARGET_DONE_EVENTS:
+            progress["targets_done"] += 1
+            progress["messages_new"] += int(payload.get("new_messages") or 0)
+        else:
+            return
+        progress["last_event"] = event
+        job.report_progress(progress)
+
+    telegram_client: PersistentTelegramClient = app.config["telegram_client"]
+    summary = telegram_client.submit(
+        lambda client_manager: _execute_scrape(
+            app=app,
+            client_manager=client_manager,
+            target=job.params.get("target"),
+            backfill=bool(job.params.get("backfill")),
+            dry_run=bool(job.params.get("dry_run")),
+            on_event=on_event,
+        )
+    )
+    return asdict(summary)
+
+
+TARGET_DONE_EVENTS = {"target.complete", "target.dry_run", "target.error"}
+
+
+def _stream_job_events(app: Flask, job_id: int, keepalive_seconds: float = 15.0) -> Iterator[str]:
+    job_queue: JobQueue = app.config["job_queue"]
+    event_bus: EventBus = app.config["event_bus"]
+    # Subscribe before reading the snapshot so no event falls between the two.
+    subscription = event_bus.subscribe(job_channel(job_id))
+    try:
+        job = job_queue.get(job_id)
+        yield _format_sse("job", job)
+        if job is None or job["done"]:
+            return
+
+        while True:
+            message = subscription.get(keepalive_seconds)
+            dropped = subscription.take_dropped()
+            if dropped:
+                yield _format_sse("stream.dropped", {"dropped": dropped})
+            if message is None:
+                # Idle: also covers a job.finished event dropped for this subscriber.
+                job = job_queue.get(job_id)
+                if job is None or job["done"]:
+                    yield _format_sse("job", job)
+                    return
+                yield ": keepalive\n\n"
+                continue
+
+            yield _format_sse(message["event"], message["data"], event_id=message["id"])
+            if message["event"] == "job.finished":
+                yield _format_sse("job", job_queue.get(job_id))
+                return
+    finally:
+        event_bus.unsubscribe(subscription)
+
+
+def _format_sse(event: str, data: Any, *, event_id: int | None = None) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _resolve_entities(app: Flask, storage: Storage, records: list[Any]) -> None:
+    if not records:
+        return
+    stats = resolve_records(storage, [(item.source, item.external_id) for item in records])
+    app.config["logger"].info("Entities resolved", extra={"event": "entities.resolved", **stats})
+
+
+def _run_enrich_job(app: Flask, job: JobContext) -> dict[str, Any]:
+    # Credentials come from the environment only: job params are persisted in SQLite.
+    with _open_storage(app) as storage:
+        return enrich_source_records(
+            storage=storage,
+            source=str(job.params["source"]),
+            limit=int(job.params.get("limit") or 100),
+            on_progress=job.report_progress,
+        )
+
+
+def _run_sweep_job(app: Flask, job: JobContext) -> dict[str, Any]:
+    params = job.params
+
+    def on_progress(progress: dict[str, Any]) -> None:
+        job.report_progress(progress)
+        job.publish("sweep.cell", progress)
+
+    with _open_storage(app) as storage:
+        return run_sweep(
+            storage,
+            DiscoveryService(logger=app.config["logger"], coalescer=app.config["discovery_coalescer"]),
+            source=str(params["source"]),
+            filters=DiscoveryFilters.from_payload(params["filters"]),
+            cell_size_m=float(params["cell_size_m"]),
+            max_depth=int(params["max_depth"]),
+            bbox=tuple(params["bbox"]) if params.get("bbox") else None,
+            restart=bool(params.get("restart")),
+            use_cache=not params.get("no_cache"),
+            on_progress=on_progress,
+        )
+
+
 async def _execute_scrape(
     *,
     app: Flask,
+    client_manager: TelegramClientManager,
     target: str | None,
     backfill: bool,
     dry_run: bool,
+    on_event: Callable[[str, dict[str, Any]], None] | None = None,
 ) -> ScrapeSummary:
+    from .scraper import TelegramScraper
+
     config_path: Path = app.config["config_path"]
-    env_path: Path = app.config["env_path"]
     logger = app.config["logger"]
 
     app_config = load_app_config(config_path)
-    telegram_settings = load_telegram_settings(env_path if env_path.exists() else None)
 
+    # Opened on the client loop thread: SQLite connections are bound to their creating thread.
     storage = _open_storage(app)
-    client_manager = TelegramClientManager(telegram_settings)
     try:
-        await client_manager.connect(allow_interactive=False)
         scraper = TelegramScraper(
             client_manager=client_manager,
             storage=storage,
             app_config=app_config,
             logger=logger,
+            on_event=on_event,
         )
         summary = await scraper.run(target_filter=target, backfill=backfill, dry_run=dry_run)
         storage.insert_scrape_run(summary.to_record())
         return summary
     finally:
-        await client_manager.disconnect()
         storage.close()
 
 
+EXPORT_MIMETYPES = {
+    "csv": "text/csv",
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _export_response(
+    *,
+    app: Flask,
+    prefix: str,
+    output_format: str,
+    columns: list[str],
+    rows_factory: Callable[[Storage], Iterable[dict[str, Any]]],
+    log_extra: dict[str, Any],
+) -> Response:
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+    download_name = f"{prefix}_{timestamp}.{output_format}"
+    use_gzip = _wants_gzip(request.values.get("gzip")) and "gzip" in (
+        request.headers.get("Accept-Encoding") or ""
+    ).lower()
+
+    headers = {"Content-Disposition": f'attachment; filename="{download_name}"'}
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+
+    return Response(
+        _stream_export(
+            app=app,
+            output_format=output_format,
+            columns=columns,
+            rows_factory=rows_factory,
+            use_gzip=use_gzip,
+            log_extra={"export": prefix, **log_extra},
+        ),
+        mimetype=EXPORT_MIMETYPES[output_format],
+        headers=headers,
+        direct_passthrough=True,
+    )
+
+
+def _stream_export(
+    *,
+    app: Flask,
+    output_format: str,
+    columns: list[str],
+    rows_factory: Callable[[Storage], Iterable[dict[str, Any]]],
+    use_gzip: bool,
+    log_extra: dict[str, Any],
+) -> Iterator[bytes]:
+    logger = app.config["logger"]
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16) if use_gzip else None
+    rows_sent = 0
+
+    def counted(rows):
+        nonlocal rows_sent
+        for row in rows:
+            rows_sent += 1
+            yield row
+
+    # The connection lives inside the generator so a client disconnect (generator close)
+    # finalizes the cursor and stops the query instead of finishing the export.
+    storage = _open_storage(app)
+    completed = False
+    try:
+        rows = counted(rows_factory(storage))
+        for chunk in iter_export_chunks(rows, output_format, columns):
+            payload = chunk.encode("utf-8")
+            if compressor is not None:
+                payload = compressor.compress(payload) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if payload:
+                yield payload
+        if compressor is not None:
+            yield compressor.flush()
+        completed = True
+    finally:
+        storage.close()
+        logger.info(
+            "Web export complete" if completed else "Web export aborted",
+            extra={
+                "event": "web.export.complete" if completed else "web.export.aborted",
+                "format": output_format,
+                "rows": rows_sent,
+                "gzip": use_gzip,
+                **log_extra,
+            },
+        )
+
+
+def _wants_gzip(raw: str | None) -> bool:
+    return (raw or "").strip().lower() in {"1", "true", "yes", "gzip"}
+
+
 def _is_client_error(message: str) -> bool:
     normalized = message.strip().lower()
     if not normalized:
@@ -335,13 +786,114 @@ def _is_client_error(message: str) -> bool:
     return any(fragment in normalized for fragment in fragments)
 
 
-def _extract_credentials(payload: dict[str, Any]) -> dict[str, str]:
+def _discovery_source_error(source: str) -> str | None:
+    if source == "telegram":
+        return "Telegram discovery is not exposed in /api/discover. Use /scrape workflow."
+    if source in DISABLED_DISCOVERY_SOURCES:
+        return (
+            f"{source.capitalize()} connector is disabled due platform restrictions on automated "
+            "data collection without explicit authorization."
+        )
+    if source not in SUPPORTED_DISCOVERY_SOURCES:
+        return f"Unsupported source: {source}"
+    return None
+
+
+def _discover_many(app: Flask, payload: dict[str, Any]):
+    raw_platforms = payload.get("platforms")
+    if not isinstance(raw_platforms, list) or not raw_platforms:
+        return jsonify({"status": "error", "message": "platforms must be a non-empty list."}), 400
+    sources = list(dict.fromkeys(str(item).strip().lower() for item in raw_platforms))
+    for source in sources:
+        source_error = _discovery_source_error(source)
+        if source_error:
+            return jsonify({"status": "error", "source": source, "message": source_error}), 400
+
+    try:
+        filters = DiscoveryFilters.from_payload(payload)
+        timeout_seconds = _parse_source_timeout(payload.get("timeout_seconds"))
+    except ValueError as exc:
+        return jsonify({"status": "error", "message": str(exc)}), 400
+
+    service = DiscoveryService(logger=app.config["logger"], coalescer=app.config["discovery_coalescer"])
+    outcomes = service.run_many(
+        sources=sources,
+        filters=filters,
+        credentials={source: _extract_credentials(payload, source) for source in sources},
+        timeout_seconds=timeout_seconds,
+        use_cache=not bool(payload.get("no_cache")),
+    )
+
+    with _open_storage(app) as storage:
+        for outcome in outcomes:
+            storage.upsert_source_records([item.to_storage_row() for item in outcome.records], utc_now_iso())
+            _resolve_entities(app, storage, outcome.records)
+            storage.insert_discovery_run(outcome.summary.to_storage_row(outcome.effective_filters))
+        recent_runs = storage.get_recent_discovery_runs(limit=max(6, 2 * len(sources)))
+
+    per_source = {
+        outcome.source: {
+            "status": outcome.summary.status,
+            "count": outcome.summary.result_count,
+            "started_at": outcome.summary.started_at,
+            "finished_at": outcome.summary.finished_at,
+            "warnings": outcome.warnings,
+            "applied_filters": outcome.effective_filters.to_api_dict(),
+            "capabilities": get_source_capabilities(outcome.source),
+            "scan": outcome.summary.scan,
+            "message": outcome.summary.error_message or "Discovery completed.",
+        }
+        for outcome in outcomes
+    }
+    items = [item.to_api_dict() for outcome in outcomes for item in outcome.records]
+    failed = [outcome for outcome in outcomes if outcome.summary.status != "ok"]
+    if not failed:
+        status, status_code, message = "ok", 200, "Discovery completed."
+    elif len(failed) < len(outcomes):
+        status, status_code, message = "partial", 200, "Discovery completed with errors in some sources."
+    else:
+        status, message = "error", "Discovery failed in every source."
+        if all(outcome.summary.status == "timeout" for outcome in failed):
+            status_code = 504
+        elif all(_is_client_error(outcome.summary.error_message or "") for outcome in failed):
+            status_code = 400
+        else:
+            status_code = 502
+
+    return (
+        jsonify(
+            {
+                "status": status,
+                "sources": per_source,
+                "count": len(items),
+                "items": items,
+                "recent_runs": recent_runs,
+                "message": message,
+            }
+        ),
+        status_code,
+    )
+
+
+def _parse_source_timeout(raw: Any) -> float:
+    if raw in (None, ""):
+        return DEFAULT_SOURCE_TIMEOUT_SECONDS
+    try:
+        value = float(raw)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("timeout_seconds must be a number.") from exc
+    return min(max(value, 1.0), 60.0)
+
+
+def _extract_credentials(payload: dict[str, Any], source: str | None = None) -> dict[str, str]:
     raw = payload.get("credentials")
     if not isinstance(raw, dict):
         return {}
+    if source and isinstance(raw.get(source), dict):
+        raw = raw[source]
     clean_map: dict[str, str] = {}
     for key, value in raw.items():
-        if value is None:
+        if value is None or isinstance(value, dict):
             continue
         text = str(value).strip()
         if not text:
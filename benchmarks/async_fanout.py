@@ -0,0 +1,98 @@
+"""Threads vs. one event loop for many slow upstream calls, against a local stub JSON server.
+
+Every stub response is delayed by ``--latency-ms`` (an upstream that is slow to answer,
+or a retry backoff). The same ``--requests`` GETs run through the blocking
+``http_get_json`` on a thread pool of ``--threads`` workers (the previous way a
+discovery search fanned out) and through ``async_http_get_json``, all in flight on
+the shared discovery I/O loop thread.
+
+    python benchmarks/async_fanout.py [--requests 300] [--latency-ms 200] [--threads 8]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.sources.async_http import async_http_get_json, get_async_pool, run_sync
+from app.sources.http_utils import get_connection_pool, http_get_json
+
+
+def build_handler(latency_seconds: float) -> type[BaseHTTPRequestHandler]:
+    body = json.dumps({"status": "OK", "result": {"website": "https://example.com"}}).encode()
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self) -> None:
+            time.sleep(latency_seconds)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:
+            return
+
+    return StubHandler
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    # The default backlog of 5 would make the stub, not the client, the bottleneck.
+    ThreadingHTTPServer.request_queue_size = max(128, args.requests)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), build_handler(args.latency_ms / 1000))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/place/details/json"
+
+    def blocking(index: int) -> None:
+        http_get_json(url=url, params={"place_id": index}, timeout_seconds=30)
+
+    async def fan_out() -> dict[str, int]:
+        await asyncio.gather(
+            *(
+                async_http_get_json(url=url, params={"place_id": index}, timeout_seconds=30)
+                for index in range(args.requests)
+            )
+        )
+        return get_async_pool().stats()
+
+    try:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            list(pool.map(blocking, range(args.requests)))
+        threaded_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        async_stats = run_sync(fan_out())
+        async_ms = (time.perf_counter() - started) * 1000
+    finally:
+        server.shutdown()
+        get_connection_pool().close()
+
+    print(f"{args.requests} GETs against {url} (upstream latency {args.latency_ms:g} ms)")
+    print(f"  http_get_json on {args.threads:3d} threads        total {threaded_ms:9.1f} ms")
+    print(f"  async_http_get_json on 1 loop thread  total {async_ms:9.1f} ms")
+    print(f"  async pool: {async_stats}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,103 @@
+"""Keep-alive pool vs. one connection per call, against a local stub JSON server.
+
+Starts an HTTP/1.1 stub on 127.0.0.1, then issues the same GETs through a fresh
+``urllib.request.urlopen`` per call (the previous behaviour) and through the pooled
+``http_get_json``. ``--handshake-ms`` delays every new connection on the server side to
+emulate the TCP+TLS setup round trips a real upstream (Google, Reddit) costs.
+
+    python benchmarks/http_pool.py [--requests 200] [--handshake-ms 0]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.sources.http_utils import get_connection_pool, http_get_json
+
+
+def build_handler(handshake_seconds: float) -> type[BaseHTTPRequestHandler]:
+    body = json.dumps({"status": "OK", "results": [{"place_id": str(index)} for index in range(20)]}).encode()
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body are separate writes; without TCP_NODELAY delayed ACKs add ~40 ms.
+        disable_nagle_algorithm = True
+
+        def setup(self) -> None:
+            if handshake_seconds:
+                time.sleep(handshake_seconds)
+            super().setup()
+
+        def do_GET(self) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:
+            return
+
+    return StubHandler
+
+
+def time_calls(call, count: int) -> list[float]:
+    samples = []
+    for index in range(count):
+        started = time.perf_counter()
+        call(index)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--handshake-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), build_handler(args.handshake_ms / 1000))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/place/details/json"
+
+    def per_call_connection(index: int) -> None:
+        with urllib.request.urlopen(f"{url}?place_id={index}", timeout=10) as response:
+            json.loads(response.read().decode("utf-8"))
+
+    def pooled(index: int) -> None:
+        http_get_json(url=url, params={"place_id": index}, timeout_seconds=10)
+
+    try:
+        results = {
+            "urlopen (new connection per call)": time_calls(per_call_connection, args.requests),
+            "http_get_json (keep-alive pool)": time_calls(pooled, args.requests),
+        }
+    finally:
+        server.shutdown()
+        get_connection_pool().close()
+
+    print(f"{args.requests} GETs against {url} (emulated handshake {args.handshake_ms:g} ms)")
+    for label, samples in results.items():
+        ordered = sorted(samples)
+        p95 = ordered[int(len(ordered) * 0.95) - 1]
+        print(
+            f"  {label:38s} total {sum(samples):8.1f} ms  "
+            f"median {statistics.median(samples):6.2f} ms  p95 {p95:6.2f} ms"
+        )
+    print(f"  pool: {get_connection_pool().stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
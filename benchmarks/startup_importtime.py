@@ -0,0 +1,104 @@
+"""Cold-start import benchmark for the Vercel entry point (`api/index.py`).
+
+Runs `python -X importtime -c "import api.index"` in fresh interpreters, reports the
+median cumulative time and the slowest modules, and exits non-zero when the budget is
+exceeded or a module that must stay lazy (Telethon, scraper, discovery sources) is
+imported at startup.
+
+    python benchmarks/startup_importtime.py [--runs 5] [--budget-ms 500]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+ENTRY_MODULE = "api.index"
+LAZY_MODULE_PATTERNS = [
+    re.compile(r"^telethon(\.|$)"),
+    re.compile(r"^app\.scraper$"),
+    re.compile(r"^app\.sources\.\w+_source$"),
+]
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def parse_importtime(stderr: str) -> dict[str, tuple[int, int]]:
+    modules: dict[str, tuple[int, int]] = {}
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            modules[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return modules
+
+
+def run_once(env: dict[str, str]) -> dict[str, tuple[int, int]]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {ENTRY_MODULE}"],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {ENTRY_MODULE} failed:\n{completed.stderr[-2000:]}")
+    return parse_importtime(completed.stderr)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=float(os.getenv("STARTUP_IMPORT_BUDGET_MS", "500")),
+        help="Maximum median cumulative import time in ms (env STARTUP_IMPORT_BUDGET_MS).",
+    )
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        env = {
+            **os.environ,
+            "PYTHONDONTWRITEBYTECODE": "",
+            "SCRAPER_DB_PATH": str(Path(tmp_dir) / "bench.db"),
+            "SCRAPER_LOG_FILE": str(Path(tmp_dir) / "bench.log"),
+            "SCRAPER_EXPORTS_PATH": str(Path(tmp_dir) / "exports"),
+        }
+        # First run warms the bytecode cache so the measurement reflects a deployed bundle.
+        run_once(env)
+        samples = [run_once(env) for _ in range(max(1, args.runs))]
+
+    totals_ms = [sample[ENTRY_MODULE][1] / 1000 for sample in samples]
+    median_ms = statistics.median(totals_ms)
+    last = samples[-1]
+
+    print(f"{ENTRY_MODULE}: median {median_ms:.1f} ms over {len(samples)} runs (budget {args.budget_ms:.0f} ms)")
+    print("slowest modules (self time):")
+    for name, (self_us, cumulative_us) in sorted(last.items(), key=lambda item: item[1][0], reverse=True)[: args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  {cumulative_us / 1000:8.1f} ms cumulative  {name}")
+
+    failures = []
+    eager = sorted(name for name in last if any(pattern.match(name) for pattern in LAZY_MODULE_PATTERNS))
+    # Report package roots only ("telethon", not its hundreds of submodules).
+    eager = [name for name in eager if name.rpartition(".")[0] not in eager]
+    if eager:
+        failures.append(f"modules that must load lazily were imported: {', '.join(eager)}")
+    if median_ms > args.budget_ms:
+        failures.append(f"median import time {median_ms:.1f} ms exceeds budget {args.budget_ms:.0f} ms")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())